@@ -0,0 +1,71 @@
+"""
+Accuracy and throughput of the precision tiers.
+
+Errors are measured against the "standard" tier (astral) over every 5th day
+of a year at latitudes up to --max-latitude, in the whole-hour zone of each
+longitude; throughput is single-threaded sun_times() calls per second.
+
+    python benchmarks/bench_precision.py [--max-latitude 60]
+"""
+import argparse
+import datetime
+import time
+
+# Add src to sys.path to allow running from a checkout
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from daylight_py.calculations import Site
+from daylight_py.precision import PRECISION_TIERS
+
+
+def zone_of(longitude):
+    hours = round(longitude / 15)
+    return "UTC" if hours == 0 else f"Etc/GMT{-hours:+d}" # Etc/GMT signs are inverted
+
+
+def sample(max_latitude, year):
+    dates = [datetime.date(year, 1, 1) + datetime.timedelta(days=d) for d in range(0, 365, 5)]
+    latitudes = range(-int(max_latitude), int(max_latitude) + 1, 5)
+    return [(lat, lon, day) for lat in latitudes for lon in (-120.0, 0.0, 135.0) for day in dates]
+
+
+def max_error_seconds(tier, points):
+    worst = 0.0
+    for lat, lon, day in points:
+        reference = Site(lat, lon, zone_of(lon)).sun_times(day)
+        result = Site(lat, lon, zone_of(lon), precision=tier).sun_times(day)
+        for name in ("rises", "sets"):
+            a, b = getattr(reference, name), getattr(result, name)
+            if a is not None and b is not None:
+                worst = max(worst, abs((a - b).total_seconds()))
+    return worst
+
+
+def throughput(tier, points, seconds=1.0):
+    sites = {(lat, lon): Site(lat, lon, zone_of(lon), precision=tier) for lat, lon, _ in points}
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for lat, lon, day in points[:200]:
+            sites[(lat, lon)].sun_times(day)
+        calls += min(200, len(points))
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-latitude", type=float, default=60.0)
+    parser.add_argument("--year", type=int, default=2024)
+    args = parser.parse_args()
+
+    points = sample(args.max_latitude, args.year)
+    print(f"{'tier':<10}{'max error vs standard':>24}{'calls/s':>12}")
+    for tier in PRECISION_TIERS:
+        error = max_error_seconds(tier, points)
+        print(f"{tier:<10}{error:>22.1f} s{throughput(tier, points):>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
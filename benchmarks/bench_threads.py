@@ -0,0 +1,100 @@
+"""
+Throughput of get_sun_times plus the output views as threads are added.
+
+Each thread renders the full, short and JSON views for its own stream of
+(location, date) cases through the shared caches, the way a threaded web
+server would. Throughput is reported per thread count with the speed-up over
+one thread; with the GIL the curve stays flat, on free-threaded CPython
+(e.g. python3.13t) it should climb with the number of cores.
+
+    python benchmarks/bench_threads.py [--threads 1 2 4 8] [--seconds 2]
+"""
+import argparse
+import datetime
+import threading
+import time
+
+# Add src to sys.path to allow running from a checkout
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pytz
+
+from daylight_py.calculations import get_sun_times
+from daylight_py.condensed_view import create_condensed_output
+from daylight_py.full_view import create_full_output
+from daylight_py.json_view import create_json_output
+from daylight_py.yearly import get_yearly_index
+
+PLACES = [
+    (51.5074, -0.1278, "Europe/London"),
+    (37.5665, 126.978, "Asia/Seoul"),
+    (40.7128, -74.006, "America/New_York"),
+    (-33.8688, 151.2093, "Australia/Sydney"),
+    (69.6492, 18.9553, "Europe/Oslo"),
+]
+
+
+def gil_enabled():
+    """False on a free-threaded build with the GIL off, True otherwise."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return check() if check is not None else True
+
+
+def render(latitude, longitude, tz, day):
+    today = get_sun_times(latitude, longitude, day, tz)
+    yesterday = get_sun_times(latitude, longitude, day - datetime.timedelta(days=1), tz)
+    year_index = get_yearly_index(latitude, day.year)
+    now = tz.localize(datetime.datetime.combine(day, datetime.time(12, 0)))
+    create_full_output(day, today, yesterday, [], now=now, year_index=year_index)
+    create_condensed_output(today, yesterday)
+    create_json_output(day, today, yesterday, year_index=year_index, now=now)
+
+
+def throughput(threads, seconds):
+    """Renders per second from `threads` threads running for about `seconds`."""
+    zones = {zone: pytz.timezone(zone) for _, _, zone in PLACES}
+    barrier = threading.Barrier(threads + 1)
+    counts = [0] * threads
+    deadline = [0.0]
+
+    def work(number):
+        start = datetime.date(2024, 1, 1) + datetime.timedelta(days=number)
+        barrier.wait()
+        done = 0
+        while time.perf_counter() < deadline[0]:
+            latitude, longitude, zone = PLACES[done % len(PLACES)]
+            render(latitude, longitude, zones[zone], start + datetime.timedelta(days=done % 365))
+            done += 1
+        counts[number] = done
+
+    workers = [threading.Thread(target=work, args=(number,)) for number in range(threads)]
+    for worker in workers:
+        worker.start()
+    deadline[0] = time.perf_counter() + seconds
+    started = time.perf_counter()
+    barrier.wait()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Run time per thread count")
+    args = parser.parse_args()
+
+    render(*PLACES[0][:2], pytz.timezone(PLACES[0][2]), datetime.date(2024, 1, 1)) # Warm imports and caches
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}")
+    print(f"{'threads':>7}{'renders/s':>12}{'speed-up':>10}")
+    baseline = None
+    for threads in args.threads:
+        rate = throughput(threads, args.seconds)
+        baseline = baseline or rate
+        print(f"{threads:>7}{rate:>12.0f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
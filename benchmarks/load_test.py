@@ -0,0 +1,165 @@
+"""
+Load test of `daylight` against a local stand-in for ipinfo.io.
+
+A fake ipinfo HTTP server answers on 127.0.0.1 with configurable latency
+and error rate, and ipinfo.IPINFO_URL is pointed at it (DAYLIGHT_IPINFO_URL
+for subprocesses). Each output mode (full, short, json) is then run many
+times from --concurrency threads, either in process through app.main
+("library", the default) or as separate `python -m daylight_py.app`
+processes ("cli", which includes interpreter start-up and imports). The
+report gives p50/p95/p99 latency, throughput and failures per mode.
+
+    python benchmarks/load_test.py [--runner library|cli] [--requests 200]
+        [--concurrency 16] [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.05]
+
+Failed lookups make the CLI exit with status 1; they are counted as errors,
+not left out of the latency figures.
+"""
+import argparse
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to sys.path to allow running from a checkout
+import sys
+from pathlib import Path
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from daylight_py import ipinfo
+from daylight_py.app import main as app_main
+from daylight_py.testing import FakeIPInfoServer
+
+MODES = {
+    "full": [],
+    "short": ["--short"],
+    "json": ["--json"],
+}
+
+class _Discard:
+    """Thread-safe stand-in for stdout/stderr while app.main runs in many threads."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def run_library(argv):
+    """Runs app.main(argv) in process. Returns True on success."""
+    try:
+        app_main(argv)
+    except SystemExit as e:
+        return not e.code
+    return True
+
+
+def run_cli(argv, url):
+    """Runs the CLI in a new interpreter. Returns True on success."""
+    env = dict(os.environ, DAYLIGHT_IPINFO_URL=url, PYTHONPATH=str(SRC))
+    result = subprocess.run([sys.executable, "-m", "daylight_py.app"] + argv, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list (fraction in 0..1)."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, int(-(-fraction * len(sorted_values) // 1)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class ModeResult:
+    """Latencies (seconds) and failures of one output mode."""
+
+    def __init__(self, mode, latencies, errors, wall_seconds):
+        self.mode = mode
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.wall_seconds = wall_seconds
+
+    def __repr__(self):
+        return f"ModeResult(mode={self.mode}, requests={len(self.latencies)}, errors={self.errors})"
+
+    @property
+    def throughput(self):
+        """Completed invocations (successful or not) per second of wall time."""
+        return len(self.latencies) / self.wall_seconds if self.wall_seconds else float("nan")
+
+    def format(self):
+        p50, p95, p99 = (percentile(self.latencies, q) * 1000 for q in (0.50, 0.95, 0.99))
+        return (f"{self.mode:<6} {len(self.latencies):>6} {self.errors:>6} {p50:>9.1f} {p95:>9.1f} "
+                f"{p99:>9.1f} {self.throughput:>9.1f}")
+
+
+def run_mode(mode, invoke, requests, concurrency, extra_argv=()):
+    """Runs `requests` invocations of one mode from `concurrency` threads."""
+    argv = MODES[mode] + list(extra_argv)
+
+    def one(_):
+        start = time.perf_counter()
+        ok = invoke(argv)
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - start
+    return ModeResult(mode, [latency for latency, _ in outcomes], sum(1 for _, ok in outcomes if not ok), wall)
+
+
+def load_test(modes, runner="library", requests=200, concurrency=16, latency=0.05, jitter=0.02, error_rate=0.05,
+              seed=None, extra_argv=()):
+    """
+    Starts a FakeIPInfoServer, runs every mode against it and returns (server, [ModeResult]).
+
+    The library runner swaps sys.stdout/sys.stderr for a discarding writer and
+    ipinfo.IPINFO_URL for the fake server's URL while it runs.
+    """
+    with FakeIPInfoServer(latency, jitter, error_rate, seed) as server:
+        if runner == "cli":
+            invoke = lambda argv: run_cli(argv, server.url)
+        else:
+            invoke = run_library
+        saved = ipinfo.IPINFO_URL, sys.stdout, sys.stderr
+        ipinfo.IPINFO_URL = server.url
+        if runner == "library":
+            sys.stdout = sys.stderr = _Discard()
+        try:
+            results = [run_mode(mode, invoke, requests, concurrency, extra_argv) for mode in modes]
+        finally:
+            ipinfo.IPINFO_URL, sys.stdout, sys.stderr = saved
+    return server, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runner", choices=["library", "cli"], default="library")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--requests", type=int, default=200, help="Invocations per mode")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake ipinfo response time")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Uniform ± variation of the response time")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of lookups answered with HTTP 503")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--offline", action="store_true", help="Pass a location so no lookup is made (baseline)")
+    args = parser.parse_args()
+
+    extra = ["--latitude=51.5074", "--longitude=-0.1278", "--timezone=Europe/London"] if args.offline else []
+    server, results = load_test(args.modes, args.runner, args.requests, args.concurrency, args.latency_ms / 1000,
+                                args.jitter_ms / 1000, args.error_rate, args.seed, extra)
+
+    print(f"runner={args.runner} requests/mode={args.requests} concurrency={args.concurrency} "
+          f"latency={args.latency_ms:.0f}±{args.jitter_ms:.0f} ms error_rate={args.error_rate}"
+          f"{' (offline)' if args.offline else ''}")
+    print(f"{'mode':<6} {'runs':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'runs/s':>9}")
+    for result in results:
+        print(result.format())
+    print(f"fake ipinfo: {server.served} answered, {server.failed} failed on purpose")
+
+
+if __name__ == "__main__":
+    main()
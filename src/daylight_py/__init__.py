@@ -0,0 +1,12 @@
+"""
+Sunrise, sunset and day length for the `daylight` command.
+
+Thread safety: the process-wide in-memory caches behind get_sun_times,
+Site, SunTimesGrid and the create_*_output functions are lock-striped (see
+daylight_py.striped), and the default clock and timezone dataset are created
+under a lock, so those calls may run from several threads. That is all this
+covers. A store.SunTimesStore may be shared between threads, which use its
+one connection in turn. DiskCache instances are not meant to be shared,
+though separate instances (and processes) may update the manifest at the
+same time. Free-threaded CPython builds are not tested.
+"""
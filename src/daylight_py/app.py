@@ -1,15 +1,29 @@
 import argparse
 import datetime
-import sys  # <--- MOVE THIS HERE
-import pytz  # <--- MOVE THIS HERE
-from daylight_py.ipinfo import fetch_ip_info, IPInfoError  # <--- MOVE THIS HERE
-from daylight_py.calculations import get_sun_times  # <--- MOVE THIS HERE
-from daylight_py.json_view import create_json_output  # <--- MOVE THIS HERE
-from daylight_py.condensed_view import create_condensed_output  # <--- MOVE THIS HERE
-from daylight_py.full_view import create_full_output  # <--- MOVE THIS HERE
+import json
+import os
+import sys
+import pytz
+from daylight_py.ipinfo import fetch_ip_info, IPInfoError
+from daylight_py.ipinfo import REFRESH_WAIT_SECONDS, LocationRefresh, load_last_location, same_location, save_last_location
+from daylight_py.calculations import Site
+from daylight_py.json_view import create_json_output
+from daylight_py.condensed_view import create_condensed_output
+from daylight_py.full_view import create_full_output
+from daylight_py.yearly import get_yearly_index
+from daylight_py.precision import PRECISION_TIERS
+from daylight_py.clock import ClockError, FrozenClock, default_clock
+# The subcommands, the offline timezone lookup, --watch and the sun times store
+# import their modules where they are used, so a plain run does not load them
+# (or NumPy, which the query engine and the boundary index need).
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        SUBCOMMANDS[argv[0]](argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Displays sunrise, sunset, and daylight information."
     )
@@ -24,10 +38,35 @@ def main():
         "--timezone", type=str, help="Timezone in IANA format (e.g., 'Europe/London')"
     )
     parser.add_argument("--date", type=str, help="Date in YYYY-MM-DD format")
+    parser.add_argument(
+        "--precision",
+        choices=PRECISION_TIERS,
+        default="standard",
+        help="Accuracy/speed tier: fast (approximate), standard (astral) or precise (iterated, with refraction)",
+    )
+    parser.add_argument(
+        "--elevation", type=float, default=0.0, help="Observer elevation in metres (not used by --precision fast)"
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=os.environ.get("DAYLIGHT_STORE") or None, # As store.default_store_path(), without importing sqlite3
+        help="SQLite file to read computed sun times from, and add new ones to (default: DAYLIGHT_STORE)",
+    )
     parser.add_argument("--short", action="store_true", help="Show in condensed format")
     parser.add_argument("--json", action="store_true", help="Short JSON output")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and print an updated line at each sunrise, sunset, midnight and DST change (condensed, or JSON with --json)",
+    )
+    parser.add_argument(
+        "--cached-location",
+        action="store_true",
+        help="Answer at once from the last known IP location and refresh it in the background for the next run",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Validation similar to the Go version's Config() method
     if (args.latitude is None) != (args.longitude is None):
@@ -46,9 +85,16 @@ def main():
         except ValueError:
             parser.error("--date was not a valid date in YYYY-MM-DD format")
 
-    # Determine target date
-    target_date = parsed_date if parsed_date else datetime.datetime.now().date()
-    yesterday_date = target_date - datetime.timedelta(days=1)
+    if args.watch and parsed_date:
+        parser.error("--watch always follows the current date and cannot be combined with --date")
+
+    # One clock reading for the whole run, so the date and the "now" marker agree
+    try:
+        clock = default_clock().snapshot()
+    except ClockError as e:
+        parser.error(f"DAYLIGHT_NOW: {e}")
+    if args.watch and isinstance(default_clock(), FrozenClock):
+        parser.error("--watch follows the real time and cannot be used while the clock is frozen (DAYLIGHT_NOW)")
 
     # Determine location and timezone
     latitude = args.latitude
@@ -56,6 +102,7 @@ def main():
     timezone_pytz = None
     ip_address_val = None
     offline_mode = False
+    refresh = None
 
     if args.timezone:
         try:
@@ -66,14 +113,33 @@ def main():
     if latitude is not None and longitude is not None and timezone_pytz is not None:
         offline_mode = True  # All required info provided
     elif latitude is not None and longitude is not None and timezone_pytz is None:
-        # If lat/long are given but no TZ, this is an issue.
-        # Let's try to fetch IP info if timezone is missing, even if lat/long are present.
-        pass  # Will fall through to IPInfo fetch if tz is still None
+        # Resolve the zone of the given coordinates from local boundary data.
+        # Without a dataset (or for uncovered points) fall through to the IPInfo fetch.
+        from daylight_py.tzlookup import find_timezone, TimezoneLookupError
+        try:
+            tz_name = find_timezone(latitude, longitude)
+        except TimezoneLookupError as e:
+            print(f"Error looking up timezone offline: {e}", file=sys.stderr)
+            tz_name = None
+        if tz_name:
+            try:
+                timezone_pytz = pytz.timezone(tz_name)
+                offline_mode = True
+            except pytz.exceptions.UnknownTimeZoneError:
+                # The dataset can be newer than pytz's tz database
+                print(f"Boundary data gave a timezone unknown to pytz: {tz_name}", file=sys.stderr)
 
     if not offline_mode:
         try:
-            print("Fetching IP information...", file=sys.stderr)
-            ip_data = fetch_ip_info()
+            ip_data = load_last_location() if args.cached_location else None
+            if ip_data is not None:
+                # Stale-while-revalidate: use the last location now, fetch the current one meanwhile
+                refresh = LocationRefresh()
+            else:
+                print("Fetching IP information...", file=sys.stderr)
+                ip_data = fetch_ip_info()
+                if args.cached_location:
+                    save_last_location(ip_data)
             ip_address_val = ip_data["ip"]
             if latitude is None:  # Prioritize CLI args for lat/long
                 latitude = ip_data["latitude"]
@@ -114,24 +180,46 @@ def main():
         )
         sys.exit(1)
 
+    if args.watch:
+        run_watch(latitude, longitude, timezone_pytz, args.json, ip_address_val)
+        return
+
+    # Determine target date: today in the location's timezone, not the machine's
+    target_date = parsed_date if parsed_date else clock.today(timezone_pytz)
+
     # Apply the determined timezone to the date (making it aware for calculations if needed by astral, though date itself is naive)
-    # The get_sun_times function expects a naive date object and a pytz timezone object.
-    # Get sun times for today (or target_date) and yesterday
+    # The calculations expect a naive date object and a pytz timezone object.
+    # Yesterday, today and the full view's ten day projection are one series, so every day has its change.
+    projection_days = 0 if (args.json or args.short) else 10
+    store = None
+    if args.store:
+        from daylight_py.store import StoreError, SunTimesStore
+        try:
+            store = SunTimesStore(args.store)
+        except StoreError as e:
+            print(f"Error opening sun times store, computing without it: {e}", file=sys.stderr)
     try:
-        sun_times_today = get_sun_times(latitude, longitude, target_date, timezone_pytz)
-        sun_times_yesterday = get_sun_times(
-            latitude, longitude, yesterday_date, timezone_pytz
-        )
+        site = Site(latitude, longitude, timezone_pytz, args.elevation, args.precision)
+        series = None
+        if store is not None:
+            try:
+                series = compute_series(site, target_date, projection_days, store)
+            except StoreError as e:
+                print(f"Error reading sun times store, computing without it: {e}", file=sys.stderr)
+        if series is None:
+            series = compute_series(site, target_date, projection_days)
     except Exception as e:
         print(f"Error calculating sun times: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
+    sun_times_today = series.sun_times[0]
+    sun_times_yesterday = series.previous
+    ten_day_projection_data = list(zip(series.dates[1:], series.sun_times[1:]))
 
     # --- Output ---
     if args.json:
-        ip_info_for_json = {"latitude": latitude, "longitude": longitude}
-        if ip_address_val:
-            ip_info_for_json["ip"] = ip_address_val
-
         print(
             create_json_output(
                 target_date,
@@ -139,24 +227,13 @@ def main():
                 sun_times_yesterday,
                 ip_address=ip_address_val,
                 location={"latitude": latitude, "longitude": longitude},
+                year_index=get_yearly_index(latitude, target_date.year),
+                now=clock.now(timezone_pytz),
             )
         )
     elif args.short:
         print(create_condensed_output(sun_times_today, sun_times_yesterday))
     else:  # Full output
-        ten_day_projection_data = []
-        for i in range(1, 11):
-            proj_date = target_date + datetime.timedelta(days=i)
-            try:
-                proj_st = get_sun_times(latitude, longitude, proj_date, timezone_pytz)
-                ten_day_projection_data.append((proj_date, proj_st))
-            except Exception as e:
-                print(
-                    f"Warning: Could not calculate sun times for {proj_date}: {e}",
-                    file=sys.stderr,
-                )
-                # Add a placeholder or skip? For now, skip.
-
         ip_info_for_full = None
         if ip_address_val:  # Only show IP if it was fetched
             ip_info_for_full = {
@@ -181,9 +258,292 @@ def main():
                 ip_info=ip_info_for_full,
                 offline_mode=offline_mode
                 and not ip_address_val,  # Truly offline if no IP was fetched
+                now=clock.now(timezone_pytz),
+                year_index=get_yearly_index(latitude, target_date.year),
+                changes=series.changes,
             )
         )
 
+    if refresh is not None:
+        sys.stdout.flush() # The output is complete; only the refresh is left
+        finish_location_refresh(refresh, ip_data)
+
+
+def compute_series(site, target_date, projection_days, store=None):
+    """
+    Returns the DayLengthSeries from target_date through `projection_days` more
+    days, with yesterday as its `previous`, from a single Site.range call.
+
+    If the projection cannot be calculated (e.g. it runs past the last date
+    Python can represent), it is left out with a warning and the series covers
+    today only; errors for yesterday and today propagate.
+    """
+    if projection_days:
+        try:
+            end_date = target_date + datetime.timedelta(days=projection_days)
+            return site.day_length_series(target_date, end_date, store=store)
+        except (ValueError, OverflowError) as e:
+            print(f"Warning: Could not calculate the {projection_days} day projection: {e}", file=sys.stderr)
+    return site.day_length_series(target_date, target_date, store=store)
+
+
+def finish_location_refresh(refresh, used, timeout=REFRESH_WAIT_SECONDS):
+    """
+    Gives a background location refresh up to `timeout` seconds to finish and says
+    if the next run will use another location.
+
+    A slower refresh is left to be abandoned when the process exits, without a notice:
+    the next run answers from the same location and refreshes again.
+    """
+    location = refresh.wait(timeout)
+    if location is None and refresh.error is None:
+        return # Still waiting on the network
+    if location is None:
+        print(f"Could not refresh the IP location, keeping the last one: {refresh.error}", file=sys.stderr)
+    elif not same_location(location, used):
+        print(
+            f"Location changed to Lat={location['latitude']:.2f}, Lon={location['longitude']:.2f}, "
+            f"TZ={location['timezone'].zone}; the next run will use it",
+            file=sys.stderr,
+        )
+
+
+def run_watch(latitude, longitude, timezone_pytz, as_json, ip_address_val):
+    """Runs the --watch loop, printing one condensed or JSON line per transition."""
+    def render(date_obj, sun_times_today, sun_times_yesterday):
+        if as_json:
+            return create_json_output(
+                date_obj,
+                sun_times_today,
+                sun_times_yesterday,
+                ip_address=ip_address_val,
+                location={"latitude": latitude, "longitude": longitude},
+                indent=None,
+            )
+        return create_condensed_output(sun_times_today, sun_times_yesterday, separator=" | ")
+
+    from daylight_py.watch import Watcher
+    try:
+        Watcher(latitude, longitude, timezone_pytz, render).run()
+    except KeyboardInterrupt:
+        pass
+    except ClockError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error calculating sun times: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_cache(argv):
+    """`daylight cache stats|prune|clear`: inspects or empties the result cache and the sun times store."""
+    from daylight_py.cache import cache_stats, clear_cache, default_cache_dir, format_stats, prune_cache
+    from daylight_py.store import StoreError, clear_store, default_store_path, prune_store, store_stats
+
+    parser = argparse.ArgumentParser(prog="daylight cache", description="Manage the result cache and the sun times store.")
+    parser.add_argument("action", choices=["stats", "prune", "clear"])
+    parser.add_argument(
+        "--max-age", type=float, default=30, help="prune: remove cache entries older than this many days (default 30)"
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=default_store_path(),
+        help="SQLite sun times store to include; prune only empties it if stale (default: DAYLIGHT_STORE)",
+    )
+    args = parser.parse_args(argv)
+
+    directory = default_cache_dir()
+    locations = f"{directory} and {args.store}" if args.store else str(directory)
+    try:
+        if args.action == "stats":
+            stats = cache_stats(directory)
+            store = store_stats(args.store) if args.store else None
+            if store is not None:
+                stats.append(store)
+            print(format_stats(stats, directory, store_path=args.store))
+        elif args.action == "prune":
+            removed = prune_cache(datetime.timedelta(days=args.max_age), directory)
+            if args.store:
+                removed += prune_store(args.store)
+            print(f"Removed {removed} entries from {locations}")
+        else:
+            removed = clear_cache(directory)
+            if args.store:
+                removed += clear_store(args.store)
+            print(f"Removed {removed} entries from {locations}")
+    except StoreError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_query(argv):
+    """`daylight query`: streams the dates and sites matching daylight conditions."""
+    from daylight_py.query import QueryError, find_matches, format_match, match_to_dict, parse_predicate, read_sites
+
+    parser = argparse.ArgumentParser(
+        prog="daylight query",
+        description="Find dates and sites matching daylight conditions, e.g. --where 'day_length>16h' --where 'sunset>=21:00'.",
+    )
+    parser.add_argument("--sites", type=str, help="CSV file of name,latitude,longitude,timezone[,elevation] ('-' for stdin)")
+    parser.add_argument("--latitude", type=float, help="Latitude of a single site (with --longitude and --timezone)")
+    parser.add_argument("--longitude", type=float, help="Longitude of a single site")
+    parser.add_argument("--timezone", type=str, help="Timezone of a single site in IANA format")
+    parser.add_argument("--from", dest="start", type=str, help="First date, YYYY-MM-DD (default: January 1 this year)")
+    parser.add_argument("--to", dest="end", type=str, help="Last date, YYYY-MM-DD (default: December 31 of the first date's year)")
+    parser.add_argument(
+        "--where",
+        action="append",
+        required=True,
+        help="Condition on day_length (e.g. 16h, 90m, 16:30), sunrise, sunset or noon (HH:MM); repeat to combine",
+    )
+    parser.add_argument("--json", action="store_true", help="One JSON object per line")
+    args = parser.parse_args(argv)
+
+    try:
+        predicates = [parse_predicate(condition) for condition in args.where]
+        if args.sites:
+            if args.sites == "-":
+                sites = read_sites(sys.stdin)
+            else:
+                with open(args.sites, encoding="utf-8") as f:
+                    sites = read_sites(f)
+        elif args.latitude is not None and args.longitude is not None and args.timezone:
+            sites = [(f"{args.latitude:.4f},{args.longitude:.4f}", Site(args.latitude, args.longitude, args.timezone))]
+        else:
+            parser.error("give --sites, or --latitude, --longitude and --timezone")
+    except (QueryError, OSError) as e:
+        parser.error(str(e))
+    except pytz.exceptions.UnknownTimeZoneError:
+        parser.error(f"Unknown timezone: {args.timezone}")
+
+    try:
+        start = (datetime.datetime.strptime(args.start, "%Y-%m-%d").date() if args.start
+                 else datetime.date(default_clock().today().year, 1, 1))
+        end = datetime.datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else datetime.date(start.year, 12, 31)
+    except ValueError:
+        parser.error("--from and --to must be valid dates in YYYY-MM-DD format")
+
+    names = [name for name, _ in sites]
+    for match in find_matches([site for _, site in sites], start, end, predicates):
+        name = names[match.site_index]
+        if args.json:
+            print(json.dumps(match_to_dict(name, match)), flush=True)
+        else:
+            print(format_match(name, match), flush=True)
+
+
+def run_daemon(argv):
+    """`daylight daemon`: serves daylight-prompt clients from warm state over a Unix socket."""
+    from daylight_py.daemon import DaemonError, serve
+
+    parser = argparse.ArgumentParser(
+        prog="daylight daemon",
+        description="Keep daylight state warm and answer daylight-prompt over a Unix socket.",
+    )
+    parser.add_argument("--socket", type=str, help="Socket path (default: DAYLIGHT_SOCKET or $XDG_RUNTIME_DIR/daylight.sock)")
+    args = parser.parse_args(argv)
+
+    try:
+        serve(args.socket)
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_sites(argv):
+    """`daylight sites list|add|remove`: manages the registry of sites kept warm by `daylight warmup`."""
+    from daylight_py.warmup import SiteRegistry, WarmupError
+
+    parser = argparse.ArgumentParser(prog="daylight sites", description="Manage the registered sites.")
+    parser.add_argument("--registry", type=str, help="Registry CSV file (default: DAYLIGHT_SITES or ~/.config/daylight/sites.csv)")
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("list", help="Show the registered sites")
+    add = actions.add_parser("add", help="Register a site (replacing one of the same name)")
+    add.add_argument("name")
+    add.add_argument("latitude", type=float)
+    add.add_argument("longitude", type=float)
+    add.add_argument("timezone", help="Timezone in IANA format (e.g., 'Europe/London')")
+    add.add_argument("--elevation", type=float, default=0.0, help="Observer elevation in metres")
+    remove = actions.add_parser("remove", help="Unregister a site")
+    remove.add_argument("name")
+    args = parser.parse_args(argv)
+
+    try:
+        registry = SiteRegistry(args.registry)
+        if args.action == "list":
+            for name, site in registry.sites:
+                print(f"{name}  {site.latitude:.4f}, {site.longitude:.4f}  {site.timezone.zone}")
+            return
+        if args.action == "add":
+            if not (-90 <= args.latitude <= 90) or not (-180 <= args.longitude <= 180):
+                parser.error("latitude must be between -90 and 90, longitude between -180 and 180")
+            try:
+                site = Site(args.latitude, args.longitude, args.timezone, args.elevation)
+            except pytz.exceptions.UnknownTimeZoneError:
+                parser.error(f"Unknown timezone: {args.timezone}")
+            registry.add(args.name, site)
+        elif not registry.remove(args.name):
+            parser.error(f"No registered site named {args.name}")
+        registry.save()
+    except (WarmupError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_warmup(argv):
+    """`daylight warmup`: precomputes the registered sites into the store ahead of each local midnight."""
+    from daylight_py.store import StoreError, SunTimesStore, default_store_path
+    from daylight_py.warmup import DEFAULT_DAYS, DEFAULT_LEAD, SiteRegistry, WarmupError, WarmupScheduler
+
+    parser = argparse.ArgumentParser(
+        prog="daylight warmup",
+        description="Precompute the coming days of the registered sites into the sun times store, "
+        "shortly before each site's local midnight. Only the store is filled, not the daemon's outputs.",
+    )
+    parser.add_argument("--registry", type=str, help="Registry CSV file (default: DAYLIGHT_SITES or ~/.config/daylight/sites.csv)")
+    parser.add_argument("--store", type=str, default=default_store_path(), help="SQLite store to fill (default: DAYLIGHT_STORE)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help=f"Days to compute per site (default {DEFAULT_DAYS})")
+    parser.add_argument(
+        "--lead",
+        type=float,
+        default=DEFAULT_LEAD.total_seconds() / 60,
+        help=f"Start this many minutes before local midnight (default {DEFAULT_LEAD.total_seconds() / 60:.0f})",
+    )
+    parser.add_argument("--once", action="store_true", help="Compute from today on for every site now and exit (e.g. from cron)")
+    args = parser.parse_args(argv)
+
+    if not args.store:
+        parser.error("give --store or set DAYLIGHT_STORE")
+    if args.days < 1 or args.lead <= 0:
+        parser.error("--days and --lead must be positive")
+
+    try:
+        registry = SiteRegistry(args.registry)
+        if not registry.sites:
+            parser.error(f"No sites registered in {registry.path} (see `daylight sites add`)")
+        with SunTimesStore(args.store) as store:
+            scheduler = WarmupScheduler(registry.sites, store, args.days, datetime.timedelta(minutes=args.lead))
+            if args.once:
+                added = scheduler.warm_now()
+                print(f"Warmed {len(registry.sites)} sites ({added} new rows) in {args.store}", file=sys.stderr)
+            else:
+                scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    except (WarmupError, StoreError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+SUBCOMMANDS = {
+    "cache": run_cache,
+    "daemon": run_daemon,
+    "query": run_query,
+    "sites": run_sites,
+    "warmup": run_warmup,
+}
+
 
 if __name__ == "__main__":
     # The sys.path manipulation below is usually for development/testing
@@ -0,0 +1,393 @@
+"""
+Versioned on-disk result cache.
+
+Cached results go stale silently when astral, pytz or its tz database are
+upgraded (new DST rules, algorithm fixes), so every cache namespace records
+the versions its entries were computed with in a manifest. When a namespace
+is opened with different versions it is emptied, while namespaces that do
+not depend on the changed library are kept. The versions are also part of
+every entry key, so a lost or edited manifest can never serve stale entries.
+
+The cache lives at DAYLIGHT_CACHE_DIR, or at daylight/ under $XDG_CACHE_HOME
+(default ~/.cache). Entries are pickles, one file per key. Sun times are not
+cached here: they go to the SQLite store (daylight_py.store), which is
+listed with the namespaces.
+
+Processes and threads update the manifest one at a time, under an exclusive
+lock on manifest.lock (flock; where fcntl is missing, only threads of one
+process are serialized), so concurrent flushes do not lose counts.
+"""
+import contextlib
+import datetime
+import hashlib
+import importlib.metadata
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytz
+
+try:
+    import fcntl
+except ImportError: # Not on Windows
+    fcntl = None
+
+# Bump when the on-disk layout changes
+CACHE_FORMAT = 1
+
+# Bump when a change in daylight_py alters computed results without a version bump
+ALGORITHM_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+ENTRY_SUFFIX = ".pickle"
+
+# Which versions the entries of each namespace depend on
+NAMESPACE_DEPENDENCIES = {
+    "location": ("format", "daylight_py"),
+    "tzindex": ("format", "daylight_py"),
+    "store": ("format", "algorithm", "daylight_py", "astral", "pytz", "tzdata"), # The SQLite sun times store
+}
+
+
+class CacheError(Exception):
+    """Custom exception for cache errors."""
+    pass
+
+
+def default_cache_dir():
+    """Returns the cache directory, honouring DAYLIGHT_CACHE_DIR."""
+    configured = os.environ.get("DAYLIGHT_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "daylight"
+
+
+def _distribution_version(name):
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def library_versions():
+    """Versions that cached results may depend on."""
+    return {
+        "format": str(CACHE_FORMAT),
+        "algorithm": str(ALGORITHM_VERSION),
+        "daylight_py": _distribution_version("daylight-kr"),
+        "astral": _distribution_version("astral"),
+        "pytz": pytz.__version__,
+        "tzdata": pytz.OLSON_VERSION,
+    }
+
+
+def namespace_versions(namespace, versions=None):
+    """The subset of `versions` (default: the installed ones) that a namespace depends on."""
+    if namespace not in NAMESPACE_DEPENDENCIES:
+        raise CacheError(f"Unknown cache namespace: {namespace}")
+    versions = versions if versions is not None else library_versions()
+    return {name: versions[name] for name in NAMESPACE_DEPENDENCIES[namespace]}
+
+
+def cache_key(namespace, versions, *parts):
+    """Hex digest identifying a result by namespace, dependency versions and arguments."""
+    material = repr((namespace, sorted(versions.items()), parts))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(directory):
+    try:
+        with open(directory / MANIFEST_NAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"namespaces": {}}
+    if not isinstance(manifest.get("namespaces"), dict):
+        return {"namespaces": {}}
+    return manifest
+
+
+_manifest_thread_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _manifest_lock(directory):
+    """Holds the manifest for a read-modify-write, against other threads and processes."""
+    directory.mkdir(parents=True, exist_ok=True)
+    with _manifest_thread_lock:
+        with open(directory / LOCK_NAME, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX) # Released when the file is closed
+            yield
+
+
+def _save_manifest(directory, manifest):
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, directory / MANIFEST_NAME)
+
+
+def _entries(path):
+    if not path.is_dir():
+        return []
+    return [p for p in path.iterdir() if p.suffix == ENTRY_SUFFIX]
+
+
+class DiskCache:
+    """
+    One namespace of the on-disk cache.
+
+    Hit and miss counts are kept in memory and added to the manifest by
+    flush(), which also runs when the cache is used as a context manager.
+    """
+
+    def __init__(self, namespace, directory=None, versions=None):
+        self.namespace = namespace
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.path = self.directory / namespace
+        self.versions = namespace_versions(namespace, versions)
+        self.hits = 0
+        self.misses = 0
+        self._validate()
+
+    def __repr__(self):
+        return f"DiskCache(namespace={self.namespace}, path={self.path}, hits={self.hits}, misses={self.misses})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def _validate(self):
+        """Empties the namespace if it was filled by other library versions."""
+        if self._is_current(_load_manifest(self.directory)):
+            return
+        with _manifest_lock(self.directory):
+            manifest = _load_manifest(self.directory)
+            if self._is_current(manifest):
+                return # Another process got there first
+            shutil.rmtree(self.path, ignore_errors=True)
+            manifest["namespaces"][self.namespace] = {
+                "versions": self.versions,
+                "created": time.time(),
+                "hits": 0,
+                "misses": 0,
+            }
+            _save_manifest(self.directory, manifest)
+
+    def _is_current(self, manifest):
+        recorded = manifest["namespaces"].get(self.namespace)
+        return recorded is not None and recorded.get("versions") == self.versions
+
+    def _entry_path(self, parts):
+        return self.path / (cache_key(self.namespace, self.versions, *parts) + ENTRY_SUFFIX)
+
+    def get(self, *parts, default=None):
+        """Returns the value stored for the key parts, or `default`."""
+        entry = self._entry_path(parts)
+        try:
+            with open(entry, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except Exception:
+            # Truncated or unreadable entry: drop it and recompute
+            entry.unlink(missing_ok=True)
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, value, *parts):
+        """Stores a picklable value under the key parts (atomically)."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._entry_path(parts))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def get_or_compute(self, compute, *parts):
+        """Returns the cached value for the key parts, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(*parts, default=missing)
+        if value is missing:
+            value = compute()
+            self.set(value, *parts)
+        return value
+
+    def flush(self):
+        """Adds the hit/miss counts since the last flush to the manifest."""
+        if not (self.hits or self.misses):
+            return
+        with _manifest_lock(self.directory):
+            manifest = _load_manifest(self.directory)
+            if self._is_current(manifest):
+                record = manifest["namespaces"][self.namespace]
+                record["hits"] = record.get("hits", 0) + self.hits
+                record["misses"] = record.get("misses", 0) + self.misses
+                _save_manifest(self.directory, manifest)
+        self.hits = self.misses = 0
+
+
+class NamespaceStats:
+    """Size, hit rate and age of one cache namespace."""
+
+    def __init__(self, namespace, entries, size_bytes, hits, misses, oldest, newest, current):
+        self.namespace = namespace
+        self.entries = entries
+        self.size_bytes = size_bytes
+        self.hits = hits
+        self.misses = misses
+        self.oldest = oldest # Modification time of the oldest entry (epoch seconds), or None
+        self.newest = newest
+        self.current = current # False if computed with other library versions
+
+    def __repr__(self):
+        return (f"NamespaceStats(namespace={self.namespace}, entries={self.entries}, size_bytes={self.size_bytes}, "
+                f"hits={self.hits}, misses={self.misses}, current={self.current})")
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups served from the cache, or None before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+def cache_stats(directory=None, versions=None):
+    """Returns NamespaceStats for every namespace present in the cache directory."""
+    directory = Path(directory) if directory is not None else default_cache_dir()
+    manifest = _load_manifest(directory)
+    names = set(manifest["namespaces"])
+    if directory.is_dir():
+        names.update(p.name for p in directory.iterdir() if p.is_dir())
+
+    stats = []
+    for name in sorted(names):
+        record = manifest["namespaces"].get(name, {})
+        files = _entries(directory / name)
+        mtimes = [p.stat().st_mtime for p in files]
+        current = name in NAMESPACE_DEPENDENCIES and record.get("versions") == namespace_versions(name, versions)
+        stats.append(NamespaceStats(
+            name,
+            len(files),
+            sum(p.stat().st_size for p in files),
+            record.get("hits", 0),
+            record.get("misses", 0),
+            min(mtimes) if mtimes else None,
+            max(mtimes) if mtimes else None,
+            current,
+        ))
+    return stats
+
+
+def prune_cache(max_age=datetime.timedelta(days=30), directory=None, versions=None, now=None):
+    """
+    Removes entries older than max_age, and whole namespaces that are unknown
+    or were filled by other library versions.
+
+    Returns:
+        int: The number of entries removed.
+    """
+    directory = Path(directory) if directory is not None else default_cache_dir()
+    cutoff = (now if now is not None else time.time()) - max_age.total_seconds()
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    with _manifest_lock(directory):
+        manifest = _load_manifest(directory)
+        for stats in cache_stats(directory, versions):
+            path = directory / stats.namespace
+            if not stats.current:
+                removed += stats.entries
+                shutil.rmtree(path, ignore_errors=True)
+                manifest["namespaces"].pop(stats.namespace, None)
+                continue
+            for entry in _entries(path):
+                if entry.stat().st_mtime < cutoff:
+                    entry.unlink(missing_ok=True)
+                    removed += 1
+        _save_manifest(directory, manifest)
+    return removed
+
+
+def clear_cache(directory=None):
+    """
+    Removes every entry and the manifest.
+
+    Returns:
+        int: The number of entries removed.
+    """
+    directory = Path(directory) if directory is not None else default_cache_dir()
+    if not directory.is_dir():
+        return 0
+    with _manifest_lock(directory):
+        removed = sum(stats.entries for stats in cache_stats(directory))
+        for path in directory.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            elif path.name == MANIFEST_NAME or path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+    return removed
+
+
+def format_size(size_bytes):
+    """Human readable byte count, e.g. 12.3 KiB."""
+    size = float(size_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_age(seconds):
+    """Human readable age, e.g. 3 days, 5 hours, 12 minutes."""
+    if seconds >= 86400:
+        value, unit = int(seconds // 86400), "day"
+    elif seconds >= 3600:
+        value, unit = int(seconds // 3600), "hour"
+    else:
+        value, unit = int(seconds // 60), "minute"
+    return f"{value} {unit}{'' if value == 1 else 's'}"
+
+
+def format_stats(stats, directory, now=None, store_path=None):
+    """Renders cache_stats() output as the text printed by `daylight cache stats`."""
+    now = now if now is not None else time.time()
+    lines = [f"Cache directory: {directory}"]
+    if store_path:
+        lines.append(f"Sun times store: {store_path}")
+    if not stats:
+        lines.append("(empty)")
+    for entry in stats:
+        hit_rate = "n/a" if entry.hit_rate is None else f"{entry.hit_rate * 100:.1f}%"
+        line = (f"{entry.namespace}: {entry.entries} entries, {format_size(entry.size_bytes)}, "
+                f"hit rate {hit_rate} ({entry.hits}/{entry.hits + entry.misses})")
+        if entry.oldest is not None:
+            line += f", oldest {format_age(now - entry.oldest)}, newest {format_age(now - entry.newest)}"
+        if not entry.current:
+            line += " [stale: other library versions]"
+        lines.append(line)
+    versions = library_versions()
+    lines.append("Versions: " + ", ".join(f"{name} {value}" for name, value in versions.items()))
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    # Example Usage
+    with DiskCache("location") as example_cache:
+        example_cache.get_or_compute(lambda: "computed", "example")
+    print(format_stats(cache_stats(), default_cache_dir()))
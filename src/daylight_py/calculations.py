@@ -1,7 +1,27 @@
 import datetime
-from astral import LocationInfo
-from astral.sun import sun # SunIsNotVisibleError is not directly exposed in v3 as such for sun()
+import math
+import sys
+import threading
+from astral import Observer
+from astral.sun import elevation, minutes_to_timedelta, noon, sunrise, sunset
 import pytz
+from .clock import default_clock
+from .precision import (
+    STANDARD_PRESSURE_HPA,
+    STANDARD_TEMPERATURE_C,
+    fast_events,
+    refine_event,
+    validate_precision,
+)
+from .striped import StripedCache
+from . import yearly
+from .yearly import local_date
+
+# Days computed at a time by iter_sun_times
+ITER_CHUNK_DAYS = 32
+
+# Ranges at least this long go through the NOAA array kernel even before NumPy is loaded (see Site.range)
+BATCH_MIN_DAYS = ITER_CHUNK_DAYS
 
 class SunTimes:
     def __init__(self, rises, sets, noon, length, polar_night=False, polar_day=False, timezone=pytz.utc):
@@ -17,7 +37,7 @@ class SunTimes:
         return (f"SunTimes(rises={self.rises}, sets={self.sets}, noon={self.noon}, length={self.length}, "
                 f"polar_night={self.polar_night}, polar_day={self.polar_day}, timezone={self.timezone})")
 
-def get_sun_times(latitude, longitude, date_obj, timezone_pytz):
+def get_sun_times(latitude, longitude, date_obj, timezone_pytz, grid=None, precision="standard", elevation=0.0):
     """
     Calculates sunrise, sunset, solar noon, and day length for a given location and date.
 
@@ -26,46 +46,52 @@ def get_sun_times(latitude, longitude, date_obj, timezone_pytz):
         longitude (float): Longitude of the location.
         date_obj (datetime.date): The date for which to calculate sun times.
         timezone_pytz (pytz.timezone): The timezone for the location.
+        grid (SunTimesGrid, optional): Serve the result from an interpolated lattice
+            instead of computing it exactly (see SunTimesGrid for the error bound).
+        precision (str): "fast", "standard" (astral) or "precise"; see the
+            precision module for the error bound and cost of each tier.
+        elevation (float): Observer elevation in metres (ignored by "fast").
 
     Returns:
         SunTimes: An object containing sunrise, sunset, noon, day length, and polar day/night status.
-                  Times are timezone-aware (UTC by default from astral, then localized).
+                  Times are timezone-aware and localized to timezone_pytz.
     """
-    city = LocationInfo(timezone=timezone_pytz.zone, latitude=latitude, longitude=longitude)
+    if grid is not None:
+        return grid.sun_times(latitude, longitude, date_obj, timezone_pytz)
+
+    return Site(latitude, longitude, timezone_pytz, elevation, precision).sun_times(date_obj)
+
 
-    s = {} # Initialize in case sun() fails to return anything
+def _compute_sun_times(observer, date_obj, timezone_pytz):
+    """Computes SunTimes for an astral Observer; see get_sun_times."""
+    # Query each event on its own rather than through astral's sun(): sun() raises
+    # as soon as *any* event is missing (e.g. civil dawn on a white night), which
+    # would throw away a perfectly valid sunrise/sunset.
+    # Passing the local timezone makes astral pick the events of the *local* date.
+    noon_local = noon(observer, date=date_obj, tzinfo=timezone_pytz)
     try:
-        # Get sun events. Astral's sun() function returns a dictionary.
-        # If an event like sunrise/sunset does not occur for the entire day,
-        # its key might be absent from the dictionary.
-        s = sun(city.observer, date=date_obj, tzinfo=pytz.utc)
+        rises_local = sunrise(observer, date=date_obj, tzinfo=timezone_pytz)
     except ValueError:
-        # A ValueError from sun() typically indicates that no sun events (not even twilight)
-        # occurred for the entire day, signifying a clear polar day or polar night.
-        pass # `s` will remain an empty dictionary, which our logic below handles.
+        rises_local = None
+    try:
+        sets_local = sunset(observer, date=date_obj, tzinfo=timezone_pytz)
+    except ValueError:
+        sets_local = None
+    return _assemble_sun_times(observer, rises_local, sets_local, noon_local, timezone_pytz)
 
-    # Extract sun times from the dictionary; use .get() to safely handle missing keys
-    sunrise_utc = s.get("sunrise")
-    sunset_utc = s.get("sunset")
-    noon_utc = s.get("noon")
 
+def _assemble_sun_times(observer, rises_local, sets_local, noon_local, timezone_pytz):
+    """SunTimes from the local events of one date (None where an event is missing)."""
     # Initialize flags for polar conditions
     polar_day = False
     polar_night = False
-    
-    # Initialize return values
-    rises_local = None
-    sets_local = None
-    noon_local = None
     length_td = None
 
     # Determine polar day/night status based on the presence of sunrise and sunset
-    if sunrise_utc is None and sunset_utc is None:
-        # If both sunrise and sunset are absent, it's a polar condition.
-        # We then check if 'dawn' or 'dusk' (twilight) events are present, or if solar noon exists.
-        # If any form of light event is present, it suggests polar day.
-        # Otherwise, it's polar night.
-        if s.get("dawn") is not None or s.get("dusk") is not None or noon_utc is not None:
+    if rises_local is None and sets_local is None:
+        # Neither event happens, so the sun stays on one side of the horizon all day.
+        # Its elevation at solar noon tells us which side.
+        if elevation(observer, noon_local) > 0:
             polar_day = True
         else:
             polar_night = True
@@ -73,32 +99,15 @@ def get_sun_times(latitude, longitude, date_obj, timezone_pytz):
     if polar_day:
         # For polar day, the sun is up for 24 hours.
         length_td = datetime.timedelta(days=1) # 24 hours
-        # Sunrise and sunset are non-existent.
-        rises_local = None
-        sets_local = None
         # Solar noon is still a valid concept (the sun's highest point)
-        # If astral provided it, localize it. Otherwise, approximate local midday.
-        noon_local = noon_utc.astimezone(timezone_pytz) if noon_utc else timezone_pytz.localize(datetime.datetime.combine(date_obj, datetime.time(12,0,0)))
     elif polar_night:
         # For polar night, the sun is down for 24 hours.
         length_td = datetime.timedelta(0) # 0 hours
-        # Sunrise, sunset, and solar noon are non-existent.
-        rises_local = None
-        sets_local = None
+        # Solar noon is non-existent.
         noon_local = None
-    else:
-        # Normal day: Both sunrise and sunset occurred.
-        # Localize the UTC times to the target timezone.
-        if sunrise_utc:
-            rises_local = sunrise_utc.astimezone(timezone_pytz)
-        if sunset_utc:
-            sets_local = sunset_utc.astimezone(timezone_pytz)
-        if noon_utc:
-            noon_local = noon_utc.astimezone(timezone_pytz)
-        
-        # Calculate day length from the UTC sunrise and sunset for accuracy.
-        if sunrise_utc and sunset_utc:
-            length_td = sunset_utc - sunrise_utc
+    elif rises_local and sets_local:
+        # Aware datetimes subtract in UTC, so DST changes are accounted for.
+        length_td = sets_local - rises_local
 
     # Return a SunTimes object with all calculated/determined values.
     return SunTimes(
@@ -109,4 +118,477 @@ def get_sun_times(latitude, longitude, date_obj, timezone_pytz):
         polar_day=polar_day,
         polar_night=polar_night,
         timezone=timezone_pytz
-    )
\ No newline at end of file
+    )
+
+def _compute_sun_times_fast(latitude, longitude, date_obj, timezone_pytz):
+    """SunTimes from the low-order approximation of the "fast" tier."""
+    rises, sets, noon_utc, polar = fast_events(latitude, longitude, date_obj)
+    rises_local = rises.astimezone(timezone_pytz) if rises is not None else None
+    sets_local = sets.astimezone(timezone_pytz) if sets is not None else None
+    # Like astral, take each event from the neighbouring solar day if that is where the local date has it
+    for index, local in ((0, rises_local), (1, sets_local)):
+        if local is not None and local.date() != date_obj:
+            shift = datetime.timedelta(days=1 if local.date() < date_obj else -1)
+            event = fast_events(latitude, longitude, date_obj + shift)[index]
+            local = event.astimezone(timezone_pytz) if event is not None else None
+            if index == 0:
+                rises_local = local
+            else:
+                sets_local = local
+    if polar == "day":
+        length_td = datetime.timedelta(days=1)
+    elif polar == "night":
+        length_td = datetime.timedelta(0)
+    else:
+        length_td = sets_local - rises_local
+    return SunTimes(
+        rises=rises_local,
+        sets=sets_local,
+        noon=noon_utc.astimezone(timezone_pytz) if noon_utc is not None else None,
+        length=length_td,
+        polar_day=polar == "day",
+        polar_night=polar == "night",
+        timezone=timezone_pytz
+    )
+
+
+def _compute_sun_times_precise(site, date_obj):
+    """Standard SunTimes with sunrise/sunset refined by the "precise" tier."""
+    return _refine_sun_times(site, _compute_sun_times(site.observer, date_obj, site.timezone))
+
+
+def _refine_sun_times(site, sun_times):
+    """Refines the sunrise/sunset of standard SunTimes in place for the "precise" tier."""
+    refined = {}
+    for name in ("rises", "sets"):
+        guess = getattr(sun_times, name)
+        event = None
+        if guess is not None:
+            event = refine_event(site.latitude, site.longitude, guess, site.elevation,
+                                 site.pressure_hpa, site.temperature_c)
+        # Keep astral's value where the iteration cannot settle (the sun grazing the horizon)
+        refined[name] = event.astimezone(site.timezone) if event is not None else guess
+    if refined["rises"] is not None and refined["sets"] is not None:
+        sun_times.rises = refined["rises"]
+        sun_times.sets = refined["sets"]
+        sun_times.length = refined["sets"] - refined["rises"]
+    return sun_times
+
+
+def _transit_datetime(date_obj, minutes):
+    """Aware UTC datetime `minutes` after midnight UTC of date_obj, as astral builds it (None for NaN)."""
+    if math.isnan(minutes):
+        return None
+    midnight = datetime.datetime(date_obj.year, date_obj.month, date_obj.day, tzinfo=datetime.timezone.utc)
+    return midnight + minutes_to_timedelta(minutes)
+
+
+def _noon_datetime(date_obj, minutes):
+    """Aware UTC datetime of solar noon, truncated to the second the way astral.sun.noon does."""
+    time_utc = minutes / 60.0
+    hour = int(time_utc)
+    minute = int((time_utc - hour) * 60)
+    second = int((((time_utc - hour) * 60) - minute) * 60)
+    if second > 59:
+        second -= 60
+        minute += 1
+    elif second < 0:
+        second += 60
+        minute -= 1
+    if minute > 59:
+        minute -= 60
+        hour += 1
+    elif minute < 0:
+        minute += 60
+        hour -= 1
+    if hour > 23:
+        hour -= 24
+        date_obj += datetime.timedelta(days=1)
+    elif hour < 0:
+        hour += 24
+        date_obj -= datetime.timedelta(days=1)
+    return datetime.datetime(date_obj.year, date_obj.month, date_obj.day, hour, minute, second,
+                             tzinfo=datetime.timezone.utc)
+
+
+def _compute_range_batched(site, start_date, end_date):
+    """
+    Standard (or precise) SunTimes for every date of a range from one call of the
+    NOAA array kernel.
+
+    noaa.sun_events repeats astral's floating-point steps, so the UTC events are
+    the ones astral computes. They are then picked like astral.sun.sunrise does:
+    an event whose local date is not the requested one is taken from the
+    neighbouring UTC date, and dropped if that does not match either.
+    """
+    from . import noaa # NumPy is only imported once a range is batched
+
+    observer = site.observer
+    timezone_pytz = site.timezone
+    count = (end_date - start_date).days + 1
+    utc_dates = [start_date + datetime.timedelta(days=i) for i in range(-1, count + 1)]
+    events = noaa.sun_events(observer.latitude, observer.longitude, noaa.julian_days(utc_dates), observer.elevation)
+    rises_minutes = events.sunrise.tolist()
+    sets_minutes = events.sunset.tolist()
+    noon_minutes = events.noon.tolist()
+
+    def local_event(minutes, i, day):
+        event = _transit_datetime(utc_dates[i], minutes[i])
+        if event is None:
+            return None
+        event = event.astimezone(timezone_pytz)
+        if event.date() != day:
+            i += 1 if event.date() < day else -1
+            event = _transit_datetime(utc_dates[i], minutes[i])
+            if event is None or event.astimezone(timezone_pytz).date() != day:
+                return None
+            event = event.astimezone(timezone_pytz)
+        return event
+
+    days = []
+    for i in range(1, count + 1):
+        day = utc_dates[i]
+        sun_times = _assemble_sun_times(
+            observer,
+            local_event(rises_minutes, i, day),
+            local_event(sets_minutes, i, day),
+            _noon_datetime(day, noon_minutes[i]).astimezone(timezone_pytz),
+            timezone_pytz,
+        )
+        if site.precision == "precise":
+            sun_times = _refine_sun_times(site, sun_times)
+        days.append((day, sun_times))
+    return days
+
+
+def get_sun_times_range(latitude, longitude, start_date, end_date, timezone_pytz, precision="standard", elevation=0.0):
+    """
+    Calculates SunTimes for every date from start_date to end_date (inclusive),
+    at the given precision tier and elevation (see get_sun_times).
+
+    Returns:
+        list: (date, SunTimes) tuples in date order.
+    """
+    return Site(latitude, longitude, timezone_pytz, elevation, precision).range(start_date, end_date)
+
+
+def _length_seconds(sun_times):
+    return int(sun_times.length.total_seconds()) if sun_times.length is not None else None
+
+
+def _difference_seconds(length, other):
+    return int((length - other).total_seconds()) if length is not None and other is not None else None
+
+
+def last_solstice(date_obj, timezone_pytz=pytz.utc):
+    """
+    Returns the local date in timezone_pytz of the most recent solstice on or before date_obj.
+
+    The solstices are those of the yearly index (yearly.last_solstice), so this
+    agrees with the "next solstice" of the views.
+    """
+    return local_date(yearly.last_solstice(date_obj, timezone_pytz), timezone_pytz)
+
+
+class DayLengthSeries:
+    """
+    Day lengths for consecutive dates, together with their day-to-day changes.
+
+    Rows are (date, sun_times, length_seconds, change_seconds, since_solstice_seconds).
+    change_seconds compares each day with the one before it; the first row uses
+    `previous`, the SunTimes of the day before start_date, so "versus yesterday"
+    needs no separate calculation. Changes are the exact differences truncated
+    to whole seconds, as the views format them. Values are None where a length
+    is unknown, and since_solstice_seconds is None unless it was requested.
+    Solstices are dated in timezone_pytz (see last_solstice).
+    """
+
+    def __init__(self, previous, days, since_solstice_lengths=None, timezone_pytz=pytz.utc):
+        self.previous = previous # SunTimes for the day before the first date
+        self.timezone = timezone_pytz
+        self.rows = []
+
+        prev_length = previous.length
+        for day, sun_times in days:
+            length = sun_times.length
+            change = _difference_seconds(length, prev_length)
+            since_solstice = None
+            if since_solstice_lengths is not None:
+                since_solstice = _difference_seconds(length, since_solstice_lengths.get(last_solstice(day, timezone_pytz)))
+            self.rows.append((day, sun_times, _length_seconds(sun_times), change, since_solstice))
+            prev_length = length
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    @property
+    def dates(self):
+        return [row[0] for row in self.rows]
+
+    @property
+    def sun_times(self):
+        return [row[1] for row in self.rows]
+
+    @property
+    def lengths(self):
+        return [row[2] for row in self.rows]
+
+    @property
+    def changes(self):
+        return [row[3] for row in self.rows]
+
+    def as_array(self):
+        """
+        The series as one float64 NumPy array of shape (len(self), 3): length,
+        change and change since the solstice in seconds, NaN where unknown.
+        """
+        import numpy as np # Only for callers that want arrays
+        return np.array([row[2:] for row in self.rows], dtype=np.float64).reshape(len(self.rows), 3)
+
+
+def get_day_length_series(latitude, longitude, start_date, end_date, timezone_pytz, since_solstice=False,
+                          precision="standard", elevation=0.0, store=None):
+    """
+    Calculates day lengths from start_date to end_date (inclusive) with first differences.
+
+    The day before start_date is computed in the same Site.range call as the
+    rest (batched through the NOAA array kernel where Site.range batches), so
+    the first row also has its change versus yesterday. With since_solstice=True
+    each row also carries the cumulative change since the most recent solstice. precision and
+    elevation are as for get_sun_times. With a store.SunTimesStore, stored
+    dates are read from it and only the missing ones are computed (and stored).
+
+    Returns:
+        DayLengthSeries
+    """
+    return Site(latitude, longitude, timezone_pytz, elevation, precision).day_length_series(
+        start_date, end_date, since_solstice, store
+    )
+
+
+def iter_sun_times(latitude, longitude, timezone_pytz, start_date, precision="standard", elevation=0.0, store=None,
+                   chunk_days=None):
+    """
+    Lazily yields SunTimes for start_date, the day after, and so on without end.
+
+    The n-th item is for start_date + n days; stop with itertools.islice or a
+    break. Days are computed chunk by chunk (see Site.iter_sun_times), so memory
+    stays constant however far the walk goes.
+    """
+    site = Site(latitude, longitude, timezone_pytz, elevation, precision)
+    return site.iter_sun_times(start_date, store, chunk_days or ITER_CHUNK_DAYS)
+
+
+class Site:
+    """
+    A location whose astral Observer and timezone are resolved once.
+
+    Use it when computing several dates for the same place (yesterday, today,
+    projections, long ranges): the per-call LocationInfo/Observer construction
+    of get_sun_times is skipped. Pickles as its constructor arguments (with the
+    zone name), so it is cheap to send to worker processes.
+
+    `precision` selects the tier ("fast", "standard" or "precise"); pressure
+    and temperature only affect the refraction of the "precise" tier.
+    """
+
+    def __init__(self, latitude, longitude, timezone_pytz, elevation=0.0, precision="standard",
+                 pressure_hpa=STANDARD_PRESSURE_HPA, temperature_c=STANDARD_TEMPERATURE_C):
+        if isinstance(timezone_pytz, str):
+            timezone_pytz = pytz.timezone(timezone_pytz)
+        self.latitude = latitude
+        self.longitude = longitude
+        self.timezone = timezone_pytz
+        self.elevation = elevation
+        self.precision = validate_precision(precision)
+        self.pressure_hpa = pressure_hpa
+        self.temperature_c = temperature_c
+        self.observer = Observer(latitude=latitude, longitude=longitude, elevation=elevation)
+
+    def __repr__(self):
+        return (f"Site(latitude={self.latitude}, longitude={self.longitude}, timezone={self.timezone}, "
+                f"elevation={self.elevation}, precision={self.precision})")
+
+    def __reduce__(self):
+        return (Site, (self.latitude, self.longitude, self.timezone.zone, self.elevation, self.precision,
+                       self.pressure_hpa, self.temperature_c))
+
+    def today(self, clock=None):
+        """Returns the current date at the site, from `clock` (default: the process-wide clock)."""
+        return (clock if clock is not None else default_clock()).today(self.timezone)
+
+    def sun_times(self, date_obj):
+        """Returns SunTimes for one date, like get_sun_times."""
+        if self.precision == "fast":
+            return _compute_sun_times_fast(self.latitude, self.longitude, date_obj, self.timezone)
+        if self.precision == "precise":
+            return _compute_sun_times_precise(self, date_obj)
+        return _compute_sun_times(self.observer, date_obj, self.timezone)
+
+    def range(self, start_date, end_date, store=None, batched=None):
+        """
+        Returns (date, SunTimes) tuples for every date from start_date to end_date (inclusive),
+        read through `store` (a store.SunTimesStore) if given, and computed by compute_range().
+        """
+        if store is not None:
+            return store.get_or_compute_range(self, start_date, end_date, batched)
+        return self.compute_range(start_date, end_date, batched)
+
+    def batches(self, start_date, end_date, batched=None):
+        """
+        Whether compute_range() runs this range through the NOAA array kernel.
+
+        batched=True asks for the kernel whatever the length of the range, and
+        batched=False for one day at a time; the fast tier and ranges touching
+        date.min or date.max are never batched.
+        """
+        if self.precision == "fast":
+            return False
+        if start_date <= datetime.date.min or end_date >= datetime.date.max:
+            return False # The kernel also needs the neighbouring dates
+        if batched is not None:
+            return batched
+        return (end_date - start_date).days + 1 >= BATCH_MIN_DAYS or "numpy" in sys.modules
+
+    def compute_range(self, start_date, end_date, batched=None):
+        """
+        Computes (date, SunTimes) for every date from start_date to end_date (inclusive).
+
+        The standard and precise tiers compute the whole range in one call of the
+        NOAA array kernel, with the same results as sun_times() date by date,
+        once it spans BATCH_MIN_DAYS days or NumPy is already loaded (or when
+        batched is True). Shorter ranges in a process without NumPy, where
+        importing it (~70 ms) would cost more than the days themselves, and the
+        fast tier (already a closed-form approximation) are computed one day at a time.
+        """
+        if self.batches(start_date, end_date, batched):
+            return _compute_range_batched(self, start_date, end_date)
+        days = (end_date - start_date).days
+        return [
+            (day, self.sun_times(day))
+            for day in (start_date + datetime.timedelta(days=i) for i in range(days + 1))
+        ]
+
+    def iter_sun_times(self, start_date, store=None, chunk_days=None):
+        """
+        Generator of SunTimes for start_date and every following day (see iter_sun_times).
+
+        Each chunk of chunk_days days is one range() call through the NOAA array
+        kernel, whatever its size; with a store that is a single indexed read,
+        one kernel call for the missing days and one batched write.
+        """
+        chunk_days = chunk_days or ITER_CHUNK_DAYS
+        chunk_start = start_date
+        while True:
+            try:
+                chunk_end = chunk_start + datetime.timedelta(days=chunk_days - 1)
+            except OverflowError:
+                chunk_end = datetime.date.max
+            for _, sun_times in self.range(chunk_start, chunk_end, store, batched=True):
+                yield sun_times
+            if chunk_end == datetime.date.max:
+                return
+            chunk_start = chunk_end + datetime.timedelta(days=1)
+
+    def day_length_series(self, start_date, end_date, since_solstice=False, store=None):
+        """Returns a DayLengthSeries, like get_day_length_series."""
+        days = self.range(start_date - datetime.timedelta(days=1), end_date, store)
+        previous = days[0][1]
+        days = days[1:]
+
+        solstice_lengths = None
+        if since_solstice:
+            known = {day: st.length for day, st in days}
+            solstice_lengths = {}
+            for solstice in {last_solstice(day, self.timezone) for day, _ in days}:
+                if solstice not in known:
+                    known[solstice] = self.sun_times(solstice).length
+                solstice_lengths[solstice] = known[solstice]
+
+        return DayLengthSeries(previous, days, solstice_lengths, self.timezone)
+
+
+class SunTimesGrid:
+    """
+    Serves sun times for nearby coordinates from a lattice of exact results.
+
+    Sunrise, sunset and noon are computed exactly at the four lattice corners
+    around a point (every `resolution` degrees) and bilinearly interpolated.
+    Corners are computed on first use and kept (up to about `max_corners`, least
+    recently used dropped first), so many users within the same cells share the
+    work. One grid can be shared by any number of threads: the corners live in a
+    lock-striped cache.
+
+    Interpolation error grows with latitude as the sunrise curve bends. Measured
+    against exact results at 0.1 degree resolution it stays within 2 seconds up
+    to 60 degrees, but reaches minutes approaching the polar circles. Beyond
+    `max_abs_latitude`, near polar day/night (any corner without a sunrise or
+    sunset) and where corners disagree by more than `max_corner_spread` (e.g. an
+    event crossing local midnight), the exact calculation is used instead.
+    """
+
+    def __init__(self, resolution=0.1, max_abs_latitude=60.0, max_corner_spread=datetime.timedelta(minutes=30), max_corners=100_000):
+        self.resolution = resolution
+        self.max_abs_latitude = max_abs_latitude
+        self.max_corner_spread = max_corner_spread
+        self.max_corners = max_corners
+        self._corners = StripedCache(max_corners)
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    @property
+    def hits(self):
+        return self._corners.hits
+
+    @property
+    def misses(self):
+        return self._corners.misses
+
+    def _fallback(self, latitude, longitude, date_obj, timezone_pytz):
+        with self._lock:
+            self.fallbacks += 1
+        return get_sun_times(latitude, longitude, date_obj, timezone_pytz)
+
+    def _corner(self, i, j, date_obj, timezone_pytz):
+        return self._corners.get_or_compute(
+            (timezone_pytz, date_obj, i, j),
+            lambda: get_sun_times(i * self.resolution, j * self.resolution, date_obj, timezone_pytz),
+        )
+
+    def sun_times(self, latitude, longitude, date_obj, timezone_pytz):
+        """Returns SunTimes for a point, interpolated where that is safe and exact otherwise."""
+        if abs(latitude) + self.resolution > self.max_abs_latitude:
+            return self._fallback(latitude, longitude, date_obj, timezone_pytz)
+
+        i0 = math.floor(latitude / self.resolution)
+        j0 = math.floor(longitude / self.resolution)
+        fy = latitude / self.resolution - i0
+        fx = longitude / self.resolution - j0
+        corners = [
+            self._corner(i0 + di, j0 + dj, date_obj, timezone_pytz)
+            for di, dj in ((0, 0), (0, 1), (1, 0), (1, 1))
+        ]
+        weights = ((1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx)
+
+        events = {}
+        for name in ("rises", "sets", "noon"):
+            values = [getattr(corner, name) for corner in corners]
+            if any(value is None for value in values) or max(values) - min(values) > self.max_corner_spread:
+                return self._fallback(latitude, longitude, date_obj, timezone_pytz)
+            base = values[0]
+            offset = sum(w * (value - base).total_seconds() for w, value in zip(weights, values))
+            events[name] = (base + datetime.timedelta(seconds=offset)).astimezone(timezone_pytz)
+
+        return SunTimes(
+            rises=events["rises"],
+            sets=events["sets"],
+            noon=events["noon"],
+            length=events["sets"] - events["rises"],
+            timezone=timezone_pytz,
+        )
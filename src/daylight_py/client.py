@@ -0,0 +1,121 @@
+"""
+Featherweight client of the daylight daemon, for shell prompts and status bars.
+
+Only the standard library is imported here, so a call costs little more than
+interpreter startup: the request goes over the daemon's Unix socket and the
+reply is printed as is. When no daemon is listening, the full CLI runs in
+process instead (and pays the usual import cost).
+
+Start the daemon with `daylight daemon`; the socket is at DAYLIGHT_SOCKET, or
+daylight.sock under $XDG_RUNTIME_DIR (default /tmp/daylight-<uid>.sock).
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+# How long a prompt may wait for the daemon before computing in process
+TIMEOUT_SECONDS = 2.0
+
+MAX_REPLY_BYTES = 1 << 20
+
+
+class DaemonUnavailable(Exception):
+    """Raised when no daemon answers on the socket."""
+    pass
+
+
+def default_socket_path():
+    """Returns the daemon's socket path, honouring DAYLIGHT_SOCKET and XDG_RUNTIME_DIR."""
+    configured = os.environ.get("DAYLIGHT_SOCKET")
+    if configured:
+        return configured
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "daylight.sock")
+    return os.path.join("/tmp", f"daylight-{os.getuid()}.sock")
+
+
+def send_request(request, socket_path=None, timeout=TIMEOUT_SECONDS):
+    """
+    Sends one request (a dict) to the daemon and returns its reply (a dict).
+
+    Raises:
+        DaemonUnavailable: If nothing listens on the socket or it does not reply in time.
+    """
+    path = socket_path or default_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            chunks = []
+            received = 0
+            while not chunks or not chunks[-1].endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                received += len(chunk)
+                if received > MAX_REPLY_BYTES:
+                    raise DaemonUnavailable("Reply from daemon too large")
+    except OSError as e: # Includes connection refused, missing socket and timeouts
+        raise DaemonUnavailable(f"No daylight daemon at {path}: {e}")
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError as e:
+        raise DaemonUnavailable(f"Invalid reply from daemon at {path}: {e}")
+
+
+def build_request(args):
+    """The daemon request for the parsed client arguments."""
+    request = {"view": "json" if args.json else "short"}
+    for name in ("latitude", "longitude", "timezone", "date"):
+        value = getattr(args, name)
+        if value is not None:
+            request[name] = value
+    return request
+
+
+def fallback_argv(args):
+    """Arguments for running the full CLI in process with the same query."""
+    argv = ["--json" if args.json else "--short"]
+    for name in ("latitude", "longitude", "timezone", "date"):
+        value = getattr(args, name)
+        if value is not None:
+            argv.append(f"--{name}={value}")
+    return argv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="daylight-prompt",
+        description="Condensed daylight summary from the daylight daemon (computed in process if none runs).",
+    )
+    parser.add_argument("--latitude", type=float, help="Set latitude (requires --longitude)")
+    parser.add_argument("--longitude", type=float, help="Set longitude (requires --latitude)")
+    parser.add_argument("--timezone", type=str, help="Timezone in IANA format (e.g., 'Europe/London')")
+    parser.add_argument("--date", type=str, help="Date in YYYY-MM-DD format")
+    parser.add_argument("--json", action="store_true", help="Short JSON output")
+    parser.add_argument("--socket", type=str, help="Daemon socket path")
+    args = parser.parse_args(argv)
+
+    if (args.latitude is None) != (args.longitude is None):
+        parser.error("--latitude and --longitude must both be set, if used")
+
+    try:
+        reply = send_request(build_request(args), args.socket)
+    except DaemonUnavailable:
+        from daylight_py.app import main as app_main # Heavy imports only on this path
+        app_main(fallback_argv(args))
+        return
+
+    if not reply.get("ok"):
+        print(f"Error: {reply.get('error', 'unknown daemon error')}", file=sys.stderr)
+        sys.exit(1)
+    print(reply["output"])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Injectable clock for everything that needs "now" or "today".
+
+Code that asks a Clock for today(zone) gets the date in that zone, not in the
+machine's local time, so remote locations get the right date. Answers are
+cached per zone until the next local midnight, which keeps
+today() cheap in long-running processes.
+
+snapshot() pins one instant, so every view built while handling a request
+agrees on the time. A FrozenClock never moves, giving reproducible output and
+benchmark runs; set DAYLIGHT_NOW (ISO 8601, e.g. 2024-06-21T12:00:00+00:00)
+to freeze the default clock.
+"""
+import abc
+import datetime
+import os
+import threading
+
+import pytz
+
+
+class ClockError(Exception):
+    """Custom exception for invalid clock settings."""
+    pass
+
+
+class Clock(abc.ABC):
+    """Base class; subclasses implement _utcnow()."""
+
+    def __init__(self):
+        # zone -> (date, aware UTC instant until which it stays valid). Entries are
+        # replaced whole, so threads sharing a clock never see a torn pair.
+        self._today = {}
+
+    @abc.abstractmethod
+    def _utcnow(self):
+        """The current time as an aware UTC datetime."""
+
+    def now(self, timezone_pytz=pytz.utc):
+        """The current time as an aware datetime in timezone_pytz."""
+        return self._utcnow().astimezone(timezone_pytz)
+
+    def today(self, timezone_pytz=pytz.utc):
+        """The current date in timezone_pytz, cached until that zone's next midnight."""
+        now_utc = self._utcnow()
+        cached = self._today.get(timezone_pytz)
+        if cached is not None and now_utc < cached[1]:
+            return cached[0]
+        today = now_utc.astimezone(timezone_pytz).date()
+        self._today[timezone_pytz] = (today, next_local_midnight(now_utc, timezone_pytz))
+        return today
+
+    def snapshot(self):
+        """A FrozenClock at the current instant, e.g. for the duration of one request."""
+        return FrozenClock(self._utcnow())
+
+
+class SystemClock(Clock):
+    """The real time."""
+
+    def __repr__(self):
+        return "SystemClock()"
+
+    def _utcnow(self):
+        return datetime.datetime.now(datetime.timezone.utc)
+
+
+class FrozenClock(Clock):
+    """A clock stopped at `moment` (an aware datetime) until advance() is called."""
+
+    def __init__(self, moment):
+        super().__init__()
+        if moment.tzinfo is None:
+            raise ClockError("FrozenClock needs an aware datetime")
+        self.moment = moment.astimezone(datetime.timezone.utc)
+
+    def __repr__(self):
+        return f"FrozenClock(moment={self.moment.isoformat()})"
+
+    def _utcnow(self):
+        return self.moment
+
+    def advance(self, delta):
+        """Moves the clock forward by a timedelta (usable as a sleep function with seconds)."""
+        if not isinstance(delta, datetime.timedelta):
+            delta = datetime.timedelta(seconds=delta)
+        self.moment += delta
+
+    def snapshot(self):
+        return FrozenClock(self.moment)
+
+
+def next_local_midnight(now, timezone_pytz):
+    """Returns the start of the next local day after `now` as an aware datetime."""
+    tomorrow = now.astimezone(timezone_pytz).date() + datetime.timedelta(days=1)
+    return timezone_pytz.normalize(
+        timezone_pytz.localize(datetime.datetime.combine(tomorrow, datetime.time(0, 0)))
+    )
+
+
+def parse_moment(text):
+    """
+    Parses an ISO 8601 date-time for a FrozenClock (naive values are taken as UTC).
+
+    Raises:
+        ClockError: If the text is not a valid date-time.
+    """
+    try:
+        moment = datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise ClockError(f"Invalid time: {text} (expected ISO 8601, e.g. 2024-06-21T12:00:00+00:00)")
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=datetime.timezone.utc)
+
+
+_default_clock = None
+_default_clock_lock = threading.Lock()
+
+
+def default_clock():
+    """Returns the process-wide clock: frozen at DAYLIGHT_NOW if set, the system clock otherwise."""
+    global _default_clock
+    clock = _default_clock
+    if clock is None:
+        with _default_clock_lock:
+            if _default_clock is None:
+                frozen = os.environ.get("DAYLIGHT_NOW")
+                _default_clock = FrozenClock(parse_moment(frozen)) if frozen else SystemClock()
+            clock = _default_clock
+    return clock
+
+
+def set_default_clock(clock):
+    """Replaces the process-wide clock (None goes back to the environment/system default)."""
+    global _default_clock
+    with _default_clock_lock:
+        _default_clock = clock
+
+
+if __name__ == '__main__':
+    # Example Usage
+    clock = default_clock()
+    for zone in ("Pacific/Kiritimati", "Europe/London", "Pacific/Pago_Pago"):
+        print(zone, clock.today(pytz.timezone(zone)), clock.now(pytz.timezone(zone)).strftime("%H:%M"))
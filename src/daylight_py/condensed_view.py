@@ -1,62 +1,44 @@
 import datetime
 from .calculations import SunTimes # Assuming SunTimes is in calculations.py
+from .formatting import format_change, format_clock, format_duration
 
-def format_time_optional_hm(dt_obj):
-    """Formats a datetime object to HH:MM, or returns 'N/A' if dt_obj is None."""
-    if dt_obj:
-        return dt_obj.strftime("%H:%M")
-    return "N/A"
-
-def format_timedelta_to_hm_str(delta):
-    """Formats a timedelta object to 'X hrs, Y mins' string, or 'N/A' if delta is None."""
-    if delta is None:
-        return "N/A"
-
-    total_seconds = int(delta.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    return f"{hours} hrs, {minutes} mins"
-
-def create_condensed_output(sun_times_today: SunTimes, sun_times_yesterday: SunTimes):
+def create_condensed_output(sun_times_today: SunTimes, sun_times_yesterday: SunTimes, separator="\n"):
     """
     Generates a condensed string summary of daylight information.
+    Pass e.g. separator=" | " to get a single line for status bars.
     """
     lines = []
 
     if sun_times_today.polar_day:
         lines.append("Polar Day")
-        lines.append(f"Length: {format_timedelta_to_hm_str(sun_times_today.length)}")
+        lines.append(f"Length: {format_duration(sun_times_today.length, 'N/A')}")
     elif sun_times_today.polar_night:
         lines.append("Polar Night")
-        lines.append(f"Length: {format_timedelta_to_hm_str(sun_times_today.length)}")
+        lines.append(f"Length: {format_duration(sun_times_today.length, 'N/A')}")
     else:
-        lines.append(f"Rises:  {format_time_optional_hm(sun_times_today.rises)}")
-        lines.append(f"Sets:   {format_time_optional_hm(sun_times_today.sets)}")
-        lines.append(f"Length: {format_timedelta_to_hm_str(sun_times_today.length)}")
+        lines.append(f"Rises:  {format_clock(sun_times_today.rises, 'N/A')}")
+        lines.append(f"Sets:   {format_clock(sun_times_today.sets, 'N/A')}")
+        lines.append(f"Length: {format_duration(sun_times_today.length, 'N/A')}")
 
     # Calculate change in day length
     if sun_times_today.length is not None and sun_times_yesterday.length is not None:
-        change_in_length = sun_times_today.length - sun_times_yesterday.length
-        total_seconds = int(change_in_length.total_seconds())
-        sign = "+" if total_seconds >= 0 else "-"
-        total_seconds = abs(total_seconds)
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60 # Original Go app shows minutes and seconds for change
-        lines.append(f"Change: {sign}{minutes}m {seconds}s")
+        # Original Go app shows minutes and seconds for change
+        lines.append(f"Change: {format_change(sun_times_today.length - sun_times_yesterday.length)}")
     else:
         lines.append("Change: N/A")
 
-    return "\n".join(lines)
+    return separator.join(lines)
 
 if __name__ == '__main__':
     # Example Usage
     import pytz
+    from .clock import default_clock
     from .calculations import get_sun_times # Make sure this import works based on your structure
 
     # London example
     tz_london_str = "Europe/London"
     tz_london = pytz.timezone(tz_london_str)
-    today_date = datetime.datetime.now(tz_london).date()
+    today_date = default_clock().today(tz_london)
     yesterday_date = today_date - datetime.timedelta(days=1)
 
     st_today_london = get_sun_times(51.5074, 0.1278, today_date, tz_london)
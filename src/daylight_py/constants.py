@@ -0,0 +1,7 @@
+"""
+Constants shared by the solar models (astral's standard tier, the fast and
+precise tiers, and the yearly index).
+"""
+
+# Altitude of the sun's centre at sunrise/sunset: refraction plus solar radius, as astral uses.
+SUNRISE_ALTITUDE = -0.833
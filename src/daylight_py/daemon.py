@@ -0,0 +1,269 @@
+"""
+Background daemon that keeps daylight state warm for shell prompts.
+
+Running `daylight` from a prompt pays for importing astral, pytz and the
+views, and for an IP lookup, on every redraw. The daemon pays that once and
+answers requests from daylight_py.client over a Unix domain socket. It keeps
+the resolved Site objects, the last IP location (refreshed hourly) and the
+rendered output of each site, date and view, so a repeated request is a dict
+lookup.
+
+Protocol: one JSON object per line each way. A request may carry latitude,
+longitude, timezone, date (YYYY-MM-DD) and view ("short" or "json"); the
+reply is {"ok": true, "output": "..."} or {"ok": false, "error": "..."}.
+"""
+import datetime
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import pytz
+
+from .calculations import Site
+from .client import default_socket_path
+from .clock import default_clock
+from .condensed_view import create_condensed_output
+from .ipinfo import fetch_ip_info, IPInfoError
+from .json_view import create_json_output
+from .tzlookup import find_timezone, TimezoneLookupError
+from .yearly import get_yearly_index
+
+VIEWS = ("short", "json")
+
+# How long an IP-based location is trusted before it is fetched again
+LOCATION_TTL_SECONDS = 3600
+
+# Rendered outputs kept before the oldest are dropped
+MAX_OUTPUTS = 1024
+
+MAX_REQUEST_BYTES = 65536
+
+
+class DaemonError(Exception):
+    """Custom exception for invalid daemon requests."""
+    pass
+
+
+class DaylightState:
+    """
+    Warm state shared by all connections: sites, the IP location and rendered outputs.
+
+    `clock` defaults to the process-wide clock; `fetch_location` to the IPInfo lookup.
+    """
+
+    def __init__(self, clock=None, fetch_location=fetch_ip_info):
+        self.clock = clock if clock is not None else default_clock()
+        self.fetch_location = fetch_location
+        self._lock = threading.Lock()
+        self._sites = {} # (latitude, longitude, zone) -> Site
+        self._outputs = {} # (latitude, longitude, zone, date, is today, view, ip) -> rendered text
+        self._location = None # (ip info dict, monotonic time fetched)
+
+    def __repr__(self):
+        return f"DaylightState(sites={len(self._sites)}, outputs={len(self._outputs)}, clock={self.clock!r})"
+
+    def _ip_location(self):
+        with self._lock:
+            cached = self._location
+        if cached is not None and time.monotonic() - cached[1] < LOCATION_TTL_SECONDS:
+            return cached[0]
+        try:
+            location = self.fetch_location()
+        except IPInfoError:
+            if cached is not None:
+                return cached[0] # Keep serving the last known location while offline
+            raise
+        with self._lock:
+            self._location = (location, time.monotonic())
+        return location
+
+    def _resolve(self, request):
+        """Returns (latitude, longitude, timezone_pytz, ip_address) for a request."""
+        latitude = request.get("latitude")
+        longitude = request.get("longitude")
+        if (latitude is None) != (longitude is None):
+            raise DaemonError("latitude and longitude must both be set, if used")
+        if latitude is not None and not (-90 <= latitude <= 90):
+            raise DaemonError("latitude must be between -90 and 90")
+        if longitude is not None and not (-180 <= longitude <= 180):
+            raise DaemonError("longitude must be between -180 and 180")
+
+        timezone_pytz = None
+        if request.get("timezone"):
+            try:
+                timezone_pytz = pytz.timezone(request["timezone"])
+            except pytz.exceptions.UnknownTimeZoneError:
+                raise DaemonError(f"Unknown timezone: {request['timezone']}")
+        if latitude is not None and timezone_pytz is None:
+            try:
+                tz_name = find_timezone(latitude, longitude)
+            except TimezoneLookupError:
+                tz_name = None
+            if tz_name:
+                try:
+                    timezone_pytz = pytz.timezone(tz_name)
+                except pytz.exceptions.UnknownTimeZoneError:
+                    pass # Newer dataset than pytz: use the IP location's zone
+
+        ip_address = None
+        if latitude is None or timezone_pytz is None:
+            try:
+                ip_data = self._ip_location()
+            except IPInfoError as e:
+                raise DaemonError(f"Could not determine location: {e}")
+            ip_address = ip_data["ip"]
+            if latitude is None:
+                latitude, longitude = ip_data["latitude"], ip_data["longitude"]
+            if timezone_pytz is None:
+                timezone_pytz = ip_data["timezone"]
+        return latitude, longitude, timezone_pytz, ip_address
+
+    def _site(self, latitude, longitude, timezone_pytz):
+        key = (latitude, longitude, timezone_pytz.zone)
+        with self._lock:
+            site = self._sites.get(key)
+        if site is None:
+            site = Site(latitude, longitude, timezone_pytz)
+            with self._lock:
+                self._sites[key] = site
+        return site
+
+    def render(self, request):
+        """
+        Returns the output text for a request.
+
+        Raises:
+            DaemonError: If the request is invalid or no location can be determined.
+        """
+        view = request.get("view", "short")
+        if view not in VIEWS:
+            raise DaemonError(f"Unknown view: {view} (expected one of {', '.join(VIEWS)})")
+        latitude, longitude, timezone_pytz, ip_address = self._resolve(request)
+
+        if request.get("date"):
+            try:
+                target_date = datetime.datetime.strptime(request["date"], "%Y-%m-%d").date()
+            except (TypeError, ValueError):
+                raise DaemonError("date was not a valid date in YYYY-MM-DD format")
+        else:
+            target_date = self.clock.today(timezone_pytz)
+
+        # Whether the date is today changes the JSON "valid_until"
+        is_today = target_date == self.clock.today(timezone_pytz)
+        key = (latitude, longitude, timezone_pytz.zone, target_date, is_today, view, ip_address)
+        with self._lock:
+            output = self._outputs.get(key)
+        if output is not None:
+            return output
+
+        site = self._site(latitude, longitude, timezone_pytz)
+        sun_times_today = site.sun_times(target_date)
+        sun_times_yesterday = site.sun_times(target_date - datetime.timedelta(days=1))
+        if view == "json":
+            output = create_json_output(
+                target_date,
+                sun_times_today,
+                sun_times_yesterday,
+                ip_address=ip_address,
+                location={"latitude": latitude, "longitude": longitude},
+                year_index=get_yearly_index(latitude, target_date.year),
+                now=self.clock.now(timezone_pytz),
+            )
+        else:
+            output = create_condensed_output(sun_times_today, sun_times_yesterday)
+
+        with self._lock:
+            if len(self._outputs) >= MAX_OUTPUTS:
+                self._outputs.pop(next(iter(self._outputs))) # Oldest first (insertion order)
+            self._outputs[key] = output
+        return output
+
+    def handle(self, line):
+        """Answers one request line with a reply dict."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise DaemonError("request must be a JSON object")
+            return {"ok": True, "output": self.render(request)}
+        except ValueError as e: # Includes json.JSONDecodeError
+            return {"ok": False, "error": f"Invalid request: {e}"}
+        except DaemonError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            return {"ok": False, "error": f"Error calculating sun times: {e}"}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            return
+        reply = self.server.state.handle(line)
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class DaylightServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server answering client requests from a DaylightState."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, state=None):
+        self.socket_path = str(socket_path)
+        self.state = state if state is not None else DaylightState()
+        _remove_stale_socket(self.socket_path)
+        old_umask = os.umask(0o177) # Socket readable and writable by the owner only
+        try:
+            super().__init__(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def __repr__(self):
+        return f"DaylightServer(socket_path={self.socket_path}, state={self.state!r})"
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(path):
+    """Removes a socket file left by a daemon that died; refuses to replace a live one."""
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise DaemonError(f"A daylight daemon is already listening on {path}")
+
+
+def serve(socket_path=None, state=None):
+    """Runs the daemon in the foreground until SIGTERM or Ctrl-C."""
+    socket_path = socket_path or default_socket_path()
+    server = DaylightServer(socket_path, state)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"daylight daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    # Example Usage
+    serve()
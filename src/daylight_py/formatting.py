@@ -0,0 +1,112 @@
+"""
+Text formatting shared by the JSON, condensed and full views.
+
+Everything is formatted from integer seconds through precomputed tables, so
+rendering a value is an index lookup instead of strftime or divmod calls.
+Each function takes a `default` returned for missing (None) values, which is
+how the views keep their own placeholders ("N/A", "--:--", null).
+"""
+import datetime
+
+SECONDS_IN_DAY = 24 * 60 * 60
+MINUTES_IN_DAY = 24 * 60
+
+# "HH:MM" for every minute of the day
+CLOCK_HM = tuple(f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(MINUTES_IN_DAY))
+
+# "X hrs, Y mins" for every whole-minute duration from 0 to 24 hours
+_DURATION_HM = tuple(f"{minutes // 60} hrs, {minutes % 60} mins" for minutes in range(MINUTES_IN_DAY + 1))
+
+# Same, but "Y mins" when the hour part is 0
+_DURATION_HM_SHORT = tuple(
+    f"{minutes // 60} hrs, {minutes % 60} mins" if minutes >= 60 else f"{minutes} mins"
+    for minutes in range(MINUTES_IN_DAY + 1)
+)
+
+# "Xm Ys" for every magnitude of change below one hour
+_CHANGE_MS = tuple(f"{seconds // 60}m {seconds % 60}s" for seconds in range(60 * 60))
+
+
+def to_seconds(delta):
+    """Converts a timedelta to whole seconds (truncating), or None if delta is None."""
+    if delta is None:
+        return None
+    return int(delta.total_seconds())
+
+
+def seconds_of_day(dt_obj):
+    """Returns the local wall-clock second of the day for a datetime, or None if dt_obj is None."""
+    if dt_obj is None:
+        return None
+    return dt_obj.hour * 3600 + dt_obj.minute * 60 + dt_obj.second
+
+
+def format_clock_seconds(seconds, default=None):
+    """Formats a second of the day (0-86399) as 'HH:MM'."""
+    if seconds is None:
+        return default
+    return CLOCK_HM[seconds // 60]
+
+
+def format_clock(dt_obj, default=None):
+    """Formats a datetime as 'HH:MM' (same as strftime("%H:%M"))."""
+    if dt_obj is None:
+        return default
+    return CLOCK_HM[dt_obj.hour * 60 + dt_obj.minute]
+
+
+def format_duration_seconds(total_seconds, default=None, drop_zero_hours=False):
+    """
+    Formats a duration in seconds as 'X hrs, Y mins'.
+    With drop_zero_hours, durations under an hour are shown as 'Y mins'.
+    """
+    if total_seconds is None:
+        return default
+    minutes = total_seconds // 60
+    if 0 <= minutes <= MINUTES_IN_DAY:
+        return _DURATION_HM_SHORT[minutes] if drop_zero_hours else _DURATION_HM[minutes]
+    if drop_zero_hours and minutes // 60 <= 0:
+        return f"{minutes % 60} mins"
+    return f"{minutes // 60} hrs, {minutes % 60} mins"
+
+
+def format_duration(delta, default=None, drop_zero_hours=False, within_day=False):
+    """
+    Formats a timedelta as 'X hrs, Y mins'.
+    With within_day, whole days are ignored (timedelta.seconds), as the full view has always done.
+    """
+    if not isinstance(delta, datetime.timedelta):
+        return default
+    total_seconds = delta.seconds if within_day else int(delta.total_seconds())
+    return format_duration_seconds(total_seconds, default, drop_zero_hours)
+
+
+def format_change_seconds(total_seconds, default=None):
+    """Formats a signed change in seconds as '+Xm Ys' or '-Xm Ys'."""
+    if total_seconds is None:
+        return default
+    sign = "+" if total_seconds >= 0 else "-"
+    total_seconds = abs(total_seconds)
+    if total_seconds < len(_CHANGE_MS):
+        return sign + _CHANGE_MS[total_seconds]
+    return f"{sign}{total_seconds // 60}m {total_seconds % 60}s"
+
+
+def format_change(delta, default=None):
+    """Formats a timedelta change as '+Xm Ys' or '-Xm Ys'."""
+    return format_change_seconds(to_seconds(delta), default)
+
+
+def format_clock_batch(seconds_seq, default=None):
+    """Formats a sequence of seconds of the day (ints or None) as a list of 'HH:MM' strings."""
+    return [default if seconds is None else CLOCK_HM[seconds // 60] for seconds in seconds_seq]
+
+
+def format_duration_batch(seconds_seq, default=None, drop_zero_hours=False):
+    """Formats a sequence of durations in seconds as a list of 'X hrs, Y mins' strings."""
+    return [format_duration_seconds(seconds, default, drop_zero_hours) for seconds in seconds_seq]
+
+
+def format_change_batch(seconds_seq, default=None):
+    """Formats a sequence of signed changes in seconds as a list of '+Xm Ys' strings."""
+    return [format_change_seconds(seconds, default) for seconds in seconds_seq]
@@ -1,67 +1,78 @@
 import datetime
 from .calculations import SunTimes # Assuming SunTimes is in calculations.py
+from .formatting import MINUTES_IN_DAY, format_change, format_change_seconds, format_clock, format_duration
+from .striped import striped_lru_cache
+from .yearly import YearlyIndex, local_date, next_solstice
 
 # Width for formatting, can be adjusted
 TERMINAL_WIDTH = 80
 
-def format_time_optional_hm(dt_obj, default_val="--:--"):
-    """Formats a datetime object to HH:MM, or returns default_val if dt_obj is None."""
-    if dt_obj:
-        return dt_obj.strftime("%H:%M")
-    return default_val
-
-def format_timedelta_hm(delta, default_val="N/A"):
-    """Formats a timedelta to 'X hrs, Y mins' or 'Y mins' if hours is 0, or default_val."""
-    if delta is None:
-        return default_val
-
-    # Ensure delta is a datetime.timedelta object
-    if not isinstance(delta, datetime.timedelta):
-        return default_val
-    
-    total_seconds_time_part = delta.seconds
-    hours = total_seconds_time_part // 3600
-    minutes = (total_seconds_time_part % 3600) // 60
-
-    if hours > 0:
-        return f"{hours} hrs, {minutes} mins"
-    else:
-        return f"{minutes} mins"
+def minute_of_day(dt_obj):
+    """Returns the local wall-clock minute (0-1439) of a datetime, or None if dt_obj is None."""
+    if dt_obj is None:
+        return None
+    return dt_obj.hour * 60 + dt_obj.minute
 
 
-def format_timedelta_change(delta, default_val="N/A"):
-    """Formats a timedelta to '+Xm Ys' or '-Xm Ys'."""
-    if delta is None:
-        return default_val
+def day_offsets(sun_times: SunTimes):
+    """
+    Returns (rise_minute, set_minute) for a SunTimes object.
 
-    total_seconds = int(delta.total_seconds())
-    sign = "+" if total_seconds >= 0 else "-"
-    total_seconds = abs(total_seconds)
+    These are computed once per day; everything the timeline needs afterwards
+    is a table lookup and string slicing.
+    """
+    return minute_of_day(sun_times.rises), minute_of_day(sun_times.sets)
 
-    minutes = total_seconds // 60
-    seconds = total_seconds % 60
-    return f"{sign}{minutes}m {seconds}s"
 
-def render_progress_bar(day_length_seconds, total_seconds_in_day=24*60*60, bar_width=60):
-    """Renders a simple text progress bar for daylight."""
-    if day_length_seconds is None or day_length_seconds < 0:
-        return "." * bar_width
+@striped_lru_cache(maxsize=8)
+def _timeline_parts(bar_width):
+    """Precomputed building blocks for a timeline of a given width."""
+    dark = "." * bar_width
+    light = "-" * bar_width
+    blank = " " * bar_width
+    # Column of the bar covering each minute of the day
+    columns = tuple(minute * bar_width // MINUTES_IN_DAY for minute in range(MINUTES_IN_DAY))
+    return dark, light, blank, columns
 
-    filled_proportion = day_length_seconds / total_seconds_in_day
-    filled_length = int(filled_proportion * bar_width)
 
-    # Simplified representation: R for rise, S for set, - for light, . for dark
-    # This is a very rough approximation and doesn't show actual sun position.
-    if filled_length == 0: # Polar night
-        return "." * bar_width
-    if filled_length >= bar_width: # Polar day
-        return "R" + ("-" * (bar_width - 2)) + "S" if bar_width > 1 else "-" * bar_width
+def render_progress_bar(rise_minute, set_minute, polar_day=False, bar_width=60):
+    """
+    Renders a 24-hour timeline starting at local midnight.
+
+    'R' and 'S' sit at the columns of the actual sunrise and sunset minutes,
+    '-' marks daylight and '.' darkness. Sunsets after local midnight wrap around.
+    """
+    dark, light, _, columns = _timeline_parts(bar_width)
+
+    if polar_day:
+        return light
+    if rise_minute is None and set_minute is None: # Polar night
+        return dark
+    if rise_minute is None: # Sun was already up at midnight
+        s = columns[set_minute]
+        return light[:s] + "S" + dark[s + 1:]
+    if set_minute is None: # Sun stays up past midnight
+        r = columns[rise_minute]
+        return dark[:r] + "R" + light[r + 1:]
+
+    r = columns[rise_minute]
+    s = columns[set_minute]
+    if r == s: # Very short day, keep both markers visible
+        if s < bar_width - 1:
+            s += 1
+        else:
+            r -= 1
+    if r < s:
+        return dark[:r] + "R" + light[r + 1:s] + "S" + dark[s + 1:]
+    # Sunset falls on the early side of the timeline (after local midnight)
+    return light[:s] + "S" + dark[s + 1:r] + "R" + light[r + 1:]
 
-    bar = "R"
-    bar += "-" * (filled_length - 2 if filled_length > 1 else 0)
-    bar += "S"
-    bar += "." * (bar_width - filled_length -1) # -1 for the S
-    return bar[:bar_width]
+
+def render_time_marker(now_minute, bar_width=60):
+    """Renders a '^' under the timeline column for now_minute."""
+    _, _, blank, columns = _timeline_parts(bar_width)
+    c = columns[now_minute]
+    return blank[:c] + "^" + blank[c + 1:]
 
 
 def create_full_output(
@@ -70,10 +81,17 @@ def create_full_output(
     sun_times_yesterday: SunTimes,
     ten_day_projection: list, # List of (date, SunTimes) tuples
     ip_info: dict = None, # {'ip': '...', 'latitude': ..., 'longitude': ...}
-    offline_mode: bool = False
+    offline_mode: bool = False,
+    now: datetime.datetime = None, # Aware datetime; marks the current time on the timeline
+    year_index: YearlyIndex = None, # Adds a "This year" section when given
+    changes: list = None # Change in seconds versus the day before, for today and each projection day
 ):
     """
     Generates the full text output for daylight information.
+
+    `changes` is DayLengthSeries.changes of a series starting today; with it,
+    "versus yesterday" is read from the series and the projection table gets
+    a CHANGE column.
     """
     lines = []
     separator = "═" * TERMINAL_WIDTH
@@ -91,9 +109,9 @@ def create_full_output(
     elif sun_times_today.polar_night:
         lines.append("POLAR NIGHT (Sun is down all day)".center(TERMINAL_WIDTH))
     else:
-        rises_str = format_time_optional_hm(sun_times_today.rises)
-        noon_str = format_time_optional_hm(sun_times_today.noon)
-        sets_str = format_time_optional_hm(sun_times_today.sets)
+        rises_str = format_clock(sun_times_today.rises, "--:--")
+        noon_str = format_clock(sun_times_today.noon, "--:--")
+        sets_str = format_clock(sun_times_today.sets, "--:--")
 
         # Try to somewhat align these: Rises, Noon, Sets
         # Max label length is "Rises: " = 7. Max time length is "00:00" = 5
@@ -121,8 +139,11 @@ def create_full_output(
     lines.append(separator)
     lines.append("")
 
-    length_today_str = format_timedelta_hm(sun_times_today.length)
-    change_str = format_timedelta_change(sun_times_today.length - sun_times_yesterday.length if sun_times_today.length is not None and sun_times_yesterday.length is not None else None)
+    length_today_str = format_duration(sun_times_today.length, "N/A", drop_zero_hours=True, within_day=True)
+    if changes is not None:
+        change_str = format_change_seconds(changes[0], "N/A")
+    else:
+        change_str = format_change(sun_times_today.length - sun_times_yesterday.length if sun_times_today.length is not None and sun_times_yesterday.length is not None else None, "N/A")
 
     line_len1 = f"Daylight for: {length_today_str}"
     line_len2 = f"versus yesterday: {change_str}"
@@ -136,16 +157,16 @@ def create_full_output(
 
     # Progress bar
     progress_bar_width = 60 # Match example
-    if sun_times_today.length is not None:
-        day_seconds = sun_times_today.length.total_seconds()
-        bar_str = render_progress_bar(day_seconds, bar_width=progress_bar_width)
-    elif sun_times_today.polar_day:
-        bar_str = "R" + ("-" * (progress_bar_width - 2)) + "S" if progress_bar_width > 1 else "-" * progress_bar_width
-    elif sun_times_today.polar_night:
-        bar_str = "." * progress_bar_width
+    known = sun_times_today.rises is not None or sun_times_today.sets is not None # A white night has one of them
+    if sun_times_today.polar_day or sun_times_today.polar_night or known:
+        rise_minute, set_minute = day_offsets(sun_times_today)
+        bar_str = render_progress_bar(rise_minute, set_minute, polar_day=sun_times_today.polar_day, bar_width=progress_bar_width)
     else:
         bar_str = "?" * progress_bar_width # Unknown state
     lines.append(bar_str.center(TERMINAL_WIDTH))
+    if now is not None and now.astimezone(sun_times_today.timezone).date() == query_date:
+        now_minute = minute_of_day(now.astimezone(sun_times_today.timezone))
+        lines.append(render_time_marker(now_minute, bar_width=progress_bar_width).center(TERMINAL_WIDTH).rstrip())
     lines.append("")
 
     # Ten day projection
@@ -162,29 +183,61 @@ def create_full_output(
     col_set_w = 9   # "20:21"
     col_len_w = 20  # "14 hrs, 47 mins"
 
+    col_change_w = 9 # "+2m 14s"
+
     header_fmt = f"│ {{:<{col_date_w}}} │ {{:^{col_rise_w}}} │ {{:^{col_set_w}}} │ {{:^{col_len_w}}} │"
+    header_titles = ["DATE", "SUNRISE", "SUNSET", "LENGTH"]
+    if changes is not None:
+        header_fmt += f" {{:^{col_change_w}}} │"
+        header_titles.append("CHANGE")
 
     # Calculate the total table width to center it properly
     table_width = col_date_w + col_rise_w + col_set_w + col_len_w + (3 * 3) + 2 # Columns + pipes + spaces + outer borders
 
-    lines.append(header_fmt.format("DATE", "SUNRISE", "SUNSET", "LENGTH").center(TERMINAL_WIDTH)) # Center the whole header
+    lines.append(header_fmt.format(*header_titles).center(TERMINAL_WIDTH)) # Center the whole header
 
-    for proj_date, proj_st in ten_day_projection:
+    for row, (proj_date, proj_st) in enumerate(ten_day_projection, start=1):
         date_str = proj_date.strftime("%a %b %d") # e.g., Sun Apr 27
 
         if proj_st.polar_day:
-            rise_str, set_str, len_str = "POLAR", "DAY", format_timedelta_hm(proj_st.length)
+            rise_str, set_str, len_str = "POLAR", "DAY", format_duration(proj_st.length, "N/A", drop_zero_hours=True, within_day=True)
         elif proj_st.polar_night:
-            rise_str, set_str, len_str = "POLAR", "NIGHT", format_timedelta_hm(proj_st.length)
+            rise_str, set_str, len_str = "POLAR", "NIGHT", format_duration(proj_st.length, "N/A", drop_zero_hours=True, within_day=True)
         else:
-            rise_str = format_time_optional_hm(proj_st.rises)
-            set_str = format_time_optional_hm(proj_st.sets)
-            len_str = format_timedelta_hm(proj_st.length)
+            rise_str = format_clock(proj_st.rises, "--:--")
+            set_str = format_clock(proj_st.sets, "--:--")
+            len_str = format_duration(proj_st.length, "N/A", drop_zero_hours=True, within_day=True)
 
-        lines.append(header_fmt.format(date_str, rise_str, set_str, len_str).center(TERMINAL_WIDTH)) # Center the whole row
+        cells = [date_str, rise_str, set_str, len_str]
+        if changes is not None:
+            cells.append(format_change_seconds(changes[row], "N/A"))
+        lines.append(header_fmt.format(*cells).center(TERMINAL_WIDTH)) # Center the whole row
 
     lines.append("")
 
+    # This year
+    if year_index:
+        lines.append("This year".center(TERMINAL_WIDTH))
+        lines.append(separator)
+        lines.append("")
+
+        def format_day(day):
+            return day.strftime("%a %b %d") if day else "N/A"
+
+        half_width = TERMINAL_WIDTH // 2
+        longest_str = f"Longest day  {format_day(year_index.longest_day)}"
+        shortest_str = f"Shortest day  {format_day(year_index.shortest_day)}"
+        lines.append(f"{longest_str:<{half_width}}{shortest_str:>{TERMINAL_WIDTH - half_width}}")
+        earliest_str = f"Earliest sunrise  {format_day(year_index.earliest_sunrise)}"
+        latest_str = f"Latest sunset  {format_day(year_index.latest_sunset)}"
+        lines.append(f"{earliest_str:<{half_width}}{latest_str:>{TERMINAL_WIDTH - half_width}}")
+
+        solstice_date = local_date(next_solstice(query_date, sun_times_today.timezone), sun_times_today.timezone)
+        days_until = (solstice_date - query_date).days
+        when_str = "today" if days_until == 0 else f"in {days_until} days"
+        lines.append(f"Next solstice  {format_day(solstice_date)} ({when_str})".center(TERMINAL_WIDTH).rstrip())
+        lines.append("")
+
     # Your stats
     if ip_info:
         lines.append("Your stats".center(TERMINAL_WIDTH))
@@ -206,11 +259,12 @@ def create_full_output(
 if __name__ == '__main__':
     # Example Usage
     import pytz
+    from .clock import default_clock
     from .calculations import get_sun_times # Make sure this import works
 
     tz_london_str = "Europe/London"
     tz_london = pytz.timezone(tz_london_str)
-    today = datetime.datetime.now(tz_london).date()
+    today = default_clock().today(tz_london)
     yesterday = today - datetime.timedelta(days=1)
 
     st_today = get_sun_times(51.5074, 0.1278, today, tz_london)
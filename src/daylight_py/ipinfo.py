@@ -1,8 +1,19 @@
+import os
+import threading
+import time
 import requests
 import pytz
 import re
+from .cache import DiskCache
 
-IPINFO_URL = "https://ipinfo.io/json?inc=ip,loc,timezone"
+# DAYLIGHT_IPINFO_URL points the lookup elsewhere, e.g. at a local stand-in for load tests
+IPINFO_URL = os.environ.get("DAYLIGHT_IPINFO_URL") or "https://ipinfo.io/json?inc=ip,loc,timezone"
+
+# Key of the last fetched location in the "location" cache namespace
+LAST_LOCATION_KEY = "last"
+
+# How long a finished CLI run waits for a background refresh before exiting without it
+REFRESH_WAIT_SECONDS = 0.3
 
 class IPInfoError(Exception):
     """Custom exception for IPInfo errors."""
@@ -12,6 +23,9 @@ def fetch_ip_info():
     """
     Fetches IP-based location information from ipinfo.io.
 
+    Safe to call from several threads at once: each call makes its own request
+    and nothing is shared between calls.
+
     Returns:
         A dictionary containing 'ip', 'latitude', 'longitude', and 'timezone' (a pytz.timezone object).
 
@@ -69,6 +83,69 @@ def fetch_ip_info():
         "timezone": timezone,
     }
 
+def load_last_location(directory=None):
+    """
+    Returns the location last saved by save_last_location (a fetch_ip_info dict plus
+    'fetched', the epoch seconds it was fetched at), or None if there is none or the
+    cache cannot be read.
+    """
+    try:
+        location = DiskCache("location", directory).get(LAST_LOCATION_KEY)
+    except OSError:
+        return None
+    return location if isinstance(location, dict) else None
+
+
+def save_last_location(location, directory=None):
+    """Saves a fetch_ip_info result as the last known location. Returns False if the cache is not writable."""
+    try:
+        DiskCache("location", directory).set(dict(location, fetched=time.time()), LAST_LOCATION_KEY)
+    except OSError:
+        return False
+    return True
+
+
+def same_location(a, b):
+    """True if two fetch_ip_info results give the same place, zone and IP address."""
+    return all(a.get(key) == b.get(key) for key in ("ip", "latitude", "longitude", "timezone"))
+
+
+class LocationRefresh:
+    """
+    Fetches the IP location on a background thread and saves it as the last known location.
+
+    This is the revalidate half of stale-while-revalidate: the caller answers from
+    load_last_location() at once and calls wait() (if at all) after its output is out.
+    The thread is a daemon, so a process that exits first abandons the refresh and
+    the last location stays as it was.
+    """
+
+    def __init__(self, fetch_location=fetch_ip_info, directory=None):
+        self.fetch_location = fetch_location
+        self.directory = directory
+        self.location = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __repr__(self):
+        state = "running" if self._thread.is_alive() else "failed" if self.error else "done"
+        return f"LocationRefresh(state={state}, location={self.location}, error={self.error})"
+
+    def _run(self):
+        try:
+            self.location = self.fetch_location()
+        except IPInfoError as e:
+            self.error = e
+            return
+        save_last_location(self.location, self.directory)
+
+    def wait(self, timeout=None):
+        """Waits for the refresh and returns the fetched location, or None if it failed or is still running."""
+        self._thread.join(timeout)
+        return None if self._thread.is_alive() else self.location # Fetched but not saved yet counts as running
+
+
 if __name__ == '__main__':
     # Example usage:
     try:
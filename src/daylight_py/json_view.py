@@ -1,52 +1,82 @@
 import json
 import datetime
+import hashlib
 from .calculations import SunTimes # Assuming SunTimes is in calculations.py
+from .clock import default_clock, next_local_midnight
+from .formatting import format_change, format_clock, format_duration, to_seconds
+from .yearly import YearlyIndex, local_date, next_solstice
+
+def format_date_optional(date_obj):
+    """Formats a date as YYYY-MM-DD, or returns None if date_obj is None."""
+    if date_obj:
+        return date_obj.strftime("%Y-%m-%d")
+    return None
 
-def format_time_optional(dt_obj):
-    """Formats a datetime object to HH:MM, or returns None if dt_obj is None."""
+def format_utc_optional(dt_obj):
+    """Formats a naive UTC datetime as ISO 8601 with a Z suffix, or returns None."""
     if dt_obj:
-        return dt_obj.strftime("%H:%M")
+        return dt_obj.strftime("%Y-%m-%dT%H:%M:%SZ")
     return None
 
-def format_timedelta_to_hm(delta):
-    """Formats a timedelta object to 'X hrs, Y mins' string, or None if delta is None."""
-    if delta is None:
-        return None
+def year_summary(query_date, year_index: YearlyIndex, timezone_pytz):
+    """Builds the "year" object of the JSON output from a YearlyIndex."""
+    solstice_date = local_date(next_solstice(query_date, timezone_pytz), timezone_pytz)
+    return {
+        "longest_day": format_date_optional(year_index.longest_day),
+        "shortest_day": format_date_optional(year_index.shortest_day),
+        "earliest_sunrise": format_date_optional(year_index.earliest_sunrise),
+        "latest_sunset": format_date_optional(year_index.latest_sunset),
+        "march_equinox": format_utc_optional(year_index.march_equinox),
+        "june_solstice": format_utc_optional(year_index.june_solstice),
+        "september_equinox": format_utc_optional(year_index.september_equinox),
+        "december_solstice": format_utc_optional(year_index.december_solstice),
+        "next_solstice": format_date_optional(solstice_date),
+        "days_until_solstice": (solstice_date - query_date).days,
+    }
 
-    if isinstance(delta, str): # If it's already a string (e.g. "24 hrs")
-        return delta
+def output_valid_until(query_date, timezone_pytz, now):
+    """
+    When the JSON output for query_date stops being current, as an aware datetime.
 
-    total_seconds = int(delta.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    return f"{hours} hrs, {minutes} mins"
+    Every field depends on the query date only, not on the time of day, so an
+    answer for "today" changes at the next local midnight. Output for any other
+    date never changes: None. `now` defaults to the process-wide clock.
+    """
+    if now is None:
+        now = default_clock().now()
+    if now.astimezone(timezone_pytz).date() != query_date:
+        return None
+    return next_local_midnight(now, timezone_pytz)
+
+def content_hash(output_data):
+    """Stable hash of the output fields (key order and whitespace do not matter)."""
+    canonical = json.dumps(output_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-def create_json_output(query_date, sun_times_today: SunTimes, sun_times_yesterday: SunTimes, ip_address=None, location=None):
+def create_json_output(query_date, sun_times_today: SunTimes, sun_times_yesterday: SunTimes, ip_address=None, location=None, indent=2, year_index: YearlyIndex = None, now=None):
     """
     Generates a JSON string summarizing the daylight information.
     Mirrors the structure of the Go app's JSON output based on README and observed behavior.
+    Pass indent=None to get a single line, and a YearlyIndex to add a "year" object.
+
+    For downstream caches, "content_hash" identifies the content (it changes exactly
+    when another field does) and "valid_until" tells until when it stays current,
+    at the current time `now` (default: the process-wide clock; see output_valid_until,
+    null if it does not expire).
     """
 
     change_in_length_str = None
     if sun_times_today.length is not None and sun_times_yesterday.length is not None:
-        change_in_length = sun_times_today.length - sun_times_yesterday.length
-        # Format change_in_length with sign
-        total_seconds = int(change_in_length.total_seconds())
-        sign = "+" if total_seconds >= 0 else "-"
-        total_seconds = abs(total_seconds)
-        # hours = total_seconds // 3600 # Original Go app only shows minutes and seconds for change
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
-        change_in_length_str = f"{sign}{minutes}m {seconds}s"
-
+        # Original Go app only shows minutes and seconds for change
+        change_in_length_str = format_change(sun_times_today.length - sun_times_yesterday.length)
 
     output_data = {
         "date": query_date.strftime("%Y-%m-%d"),
-        "rises": format_time_optional(sun_times_today.rises),
-        "sets": format_time_optional(sun_times_today.sets),
-        "noon": format_time_optional(sun_times_today.noon),
-        "length": format_timedelta_to_hm(sun_times_today.length),
-        "length_seconds": int(sun_times_today.length.total_seconds()) if sun_times_today.length is not None else None,
+        "rises": format_clock(sun_times_today.rises),
+        "sets": format_clock(sun_times_today.sets),
+        "noon": format_clock(sun_times_today.noon),
+        "length": format_duration(sun_times_today.length),
+        "length_seconds": to_seconds(sun_times_today.length),
         "change": change_in_length_str,
         "polar_day": sun_times_today.polar_day,
         "polar_night": sun_times_today.polar_night,
@@ -59,9 +89,14 @@ def create_json_output(query_date, sun_times_today: SunTimes, sun_times_yesterda
         output_data["longitude"] = location.get("longitude")
     if sun_times_today.timezone:
          output_data["timezone"] = str(sun_times_today.timezone)
+    if year_index:
+        output_data["year"] = year_summary(query_date, year_index, sun_times_today.timezone)
 
+    valid_until = output_valid_until(query_date, sun_times_today.timezone, now)
+    output_data["content_hash"] = content_hash(output_data)
+    output_data["valid_until"] = valid_until.isoformat() if valid_until else None
 
-    return json.dumps(output_data, indent=2)
+    return json.dumps(output_data, indent=indent)
 
 if __name__ == '__main__':
     # Example Usage
@@ -71,7 +106,7 @@ if __name__ == '__main__':
     # London example
     tz_london_str = "Europe/London"
     tz_london = pytz.timezone(tz_london_str)
-    today = datetime.datetime.now(tz_london).date()
+    today = default_clock().today(tz_london)
     yesterday = today - datetime.timedelta(days=1)
 
     # Simulate fetching sun times
@@ -0,0 +1,256 @@
+"""
+Array kernel of the NOAA sunrise equation, as implemented by astral.
+
+sun_events() computes sunrise, sunset and solar noon for whole float64 arrays
+of latitudes, longitudes and dates in one call, following astral's
+time_of_transit() step for step (same series, same refraction model, same two
+passes), so results agree with astral.sun to well under a second. When numba
+is importable the per-element loop is JIT-compiled; otherwise the same code
+runs vectorized in NumPy.
+"""
+import datetime
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError: # numba is optional
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# Same as astral: the sun's upper limb touches the horizon
+SUN_APPARENT_RADIUS = 32.0 / (60.0 * 2.0)
+
+# Julian day number of 1970-01-01 00:00 UTC
+UNIX_EPOCH_JD = 2440587.5
+
+
+def refraction_at_zenith(zenith):
+    """Refraction in degrees at a zenith angle (astral's model)."""
+    elevation = 90 - zenith
+    if elevation >= 85.0:
+        return 0.0
+    te = math.tan(math.radians(elevation))
+    if elevation > 5.0:
+        correction = 58.1 / te - 0.07 / te**3 + 0.000086 / te**5
+    elif elevation > -0.575:
+        correction = 1735.0 + elevation * (-518.2 + elevation * (103.4 + elevation * (-12.79 + elevation * 0.711)))
+    else:
+        correction = -20.774 / te
+    return correction / 3600.0
+
+
+def adjust_to_horizon(elevation):
+    """Extra degrees of horizon depression seen from `elevation` metres (astral's model)."""
+    if elevation <= 0:
+        return 0.0
+    r = 6356900 # Radius of the earth
+    return math.degrees(math.acos(r / (r + elevation)))
+
+
+def sunrise_zenith(elevation=0.0):
+    """Zenith angle of the sun at sunrise/sunset, corrected for refraction and observer elevation."""
+    adjusted = 90.0 + SUN_APPARENT_RADIUS + adjust_to_horizon(elevation)
+    return adjusted + refraction_at_zenith(adjusted)
+
+
+def solar_terms(jc):
+    """
+    Declination (degrees) and equation of time (minutes) for Julian centuries since J2000.
+
+    Accepts a float or an array, as used by the kernels here, the precise tier
+    and the query engine.
+    """
+    l0 = (280.46646 + jc * (36000.76983 + 0.0003032 * jc)) % 360.0
+    m = 357.52911 + jc * (35999.05029 - 0.0001537 * jc)
+    e = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    mrad = np.radians(m)
+    c = (
+        np.sin(mrad) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+        + np.sin(2 * mrad) * (0.019993 - 0.000101 * jc)
+        + np.sin(3 * mrad) * 0.000289
+    )
+    omega = np.radians(125.04 - 1934.136 * jc)
+    apparent_long = l0 + c - 0.00569 - 0.00478 * np.sin(omega)
+    seconds = 21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))
+    obliquity = 23.0 + (26.0 + seconds / 60.0) / 60.0 + 0.00256 * np.cos(omega)
+
+    declination = np.degrees(np.arcsin(np.sin(np.radians(obliquity)) * np.sin(np.radians(apparent_long))))
+
+    y = np.tan(np.radians(obliquity) / 2.0) ** 2
+    l0rad = np.radians(l0)
+    etime = (
+        y * np.sin(2.0 * l0rad)
+        - 2.0 * e * np.sin(mrad)
+        + 4.0 * e * y * np.sin(mrad) * np.cos(2.0 * l0rad)
+        - 0.5 * y * y * np.sin(4.0 * l0rad)
+        - 1.25 * e * e * np.sin(2.0 * mrad)
+    )
+    return declination, np.degrees(etime) * 4.0
+
+
+def _transit(latitude, longitude, jd, zenith, sign):
+    """Minutes after 00:00 UTC of day `jd` at which the sun crosses `zenith`; sign=1 rising, -1 setting."""
+    latitude = np.minimum(np.maximum(latitude, -89.8), 89.8)
+    cos_zenith = np.cos(np.radians(zenith))
+    lat_rad = np.radians(latitude)
+    adjustment = 0.0
+    time_utc = 0.0
+    for _ in range(2):
+        jc = (jd + adjustment - 2451545.0) / 36525.0
+        declination, eqtime = solar_terms(jc)
+        dec_rad = np.radians(declination)
+        h = (cos_zenith - np.sin(lat_rad) * np.sin(dec_rad)) / (np.cos(lat_rad) * np.cos(dec_rad))
+        hour_angle = sign * np.arccos(h) # NaN when the sun never crosses the zenith
+        offset = (-longitude - np.degrees(hour_angle)) * 4.0 - eqtime
+        offset = offset + 1440.0 * (offset < -720.0)
+        time_utc = 720.0 + offset
+        adjustment = time_utc / 1440.0
+    return time_utc
+
+
+def _events(latitude, longitude, jd, zenith):
+    rises = _transit(latitude, longitude, jd, zenith, 1.0)
+    sets = _transit(latitude, longitude, jd, zenith, -1.0)
+    declination, eqtime = solar_terms((jd - 2451545.0) / 36525.0)
+    noon = 720.0 - 4.0 * longitude - eqtime
+    return rises, sets, noon, declination
+
+
+if NUMBA_AVAILABLE:
+    _solar_terms_jit = numba.njit(cache=True)(solar_terms)
+
+    @numba.njit(cache=True)
+    def _transit_jit(latitude, longitude, jd, zenith, sign):
+        latitude = min(max(latitude, -89.8), 89.8)
+        cos_zenith = math.cos(math.radians(zenith))
+        lat_rad = math.radians(latitude)
+        adjustment = 0.0
+        time_utc = 0.0
+        for _ in range(2):
+            jc = (jd + adjustment - 2451545.0) / 36525.0
+            declination, eqtime = _solar_terms_jit(jc)
+            dec_rad = math.radians(declination)
+            h = (cos_zenith - math.sin(lat_rad) * math.sin(dec_rad)) / (math.cos(lat_rad) * math.cos(dec_rad))
+            if h < -1.0 or h > 1.0:
+                return np.nan
+            offset = (-longitude - math.degrees(sign * math.acos(h))) * 4.0 - eqtime
+            if offset < -720.0:
+                offset += 1440.0
+            time_utc = 720.0 + offset
+            adjustment = time_utc / 1440.0
+        return time_utc
+
+    @numba.njit(cache=True)
+    def _events_loop(latitude, longitude, jd, zenith, rises, sets, noon, declination):
+        for i in range(latitude.size):
+            rises[i] = _transit_jit(latitude[i], longitude[i], jd[i], zenith, 1.0)
+            sets[i] = _transit_jit(latitude[i], longitude[i], jd[i], zenith, -1.0)
+            dec, eqtime = _solar_terms_jit((jd[i] - 2451545.0) / 36525.0)
+            noon[i] = 720.0 - 4.0 * longitude[i] - eqtime
+            declination[i] = dec
+
+
+def julian_days(dates):
+    """Julian day numbers of 00:00 UTC for a sequence of datetime.date objects (float64 array)."""
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.float64)
+    # date.toordinal() of 2000-01-01 is 730120, and JD 2451544.5 is 2000-01-01 00:00 UTC
+    return ordinals - 730120 + 2451544.5
+
+
+class SunEventArrays:
+    """
+    Result of sun_events(): arrays in the broadcast shape of the inputs.
+
+    sunrise, sunset and noon are minutes after 00:00 UTC of each date, picked
+    like astral does for the UTC date, so far from Greenwich they may belong to
+    the neighbouring local date. sunrise/sunset are NaN on polar days and
+    nights, which polar_day/polar_night tell apart.
+    """
+
+    def __init__(self, julian_days, sunrise, sunset, noon, polar_day, polar_night):
+        self.julian_days = julian_days
+        self.sunrise = sunrise
+        self.sunset = sunset
+        self.noon = noon
+        self.polar_day = polar_day
+        self.polar_night = polar_night
+
+    @property
+    def day_length(self):
+        """Day length in minutes (1440 on polar days, 0 on polar nights)."""
+        length = self.sunset - self.sunrise
+        length = length + 1440.0 * (length < 0) # Sunset of the UTC date came before its sunrise
+        return np.where(self.polar_day, 1440.0, np.where(self.polar_night, 0.0, length))
+
+    def epoch_seconds(self, minutes):
+        """Converts one of the minute arrays to UTC epoch seconds (e.g. for tzindex.ZoneIndex)."""
+        return (self.julian_days - UNIX_EPOCH_JD) * 86400.0 + minutes * 60.0
+
+
+def sun_events(latitude, longitude, jd, elevation=0.0, use_numba=None):
+    """
+    Computes sunrise, sunset and solar noon for arrays of locations and dates.
+
+    Args:
+        latitude, longitude: Degrees; floats or arrays.
+        jd: Julian day numbers of 00:00 UTC of the dates (see julian_days()).
+        elevation (float): Observer elevation in metres.
+        use_numba (bool, optional): Force or forbid the numba path; by default
+            it is used when numba is installed.
+
+    Returns:
+        SunEventArrays
+    """
+    latitude, longitude, jd = np.broadcast_arrays(
+        np.asarray(latitude, dtype=np.float64),
+        np.asarray(longitude, dtype=np.float64),
+        np.asarray(jd, dtype=np.float64),
+    )
+    zenith = sunrise_zenith(elevation)
+
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+    if use_numba and not NUMBA_AVAILABLE:
+        raise ImportError("numba is not installed")
+
+    if use_numba:
+        shape = latitude.shape
+        flat = [np.ascontiguousarray(a).ravel() for a in (latitude, longitude, jd)]
+        outputs = [np.empty(flat[0].size) for _ in range(4)]
+        _events_loop(flat[0], flat[1], flat[2], zenith, *outputs)
+        rises, sets, noon, declination = (a.reshape(shape) for a in outputs)
+    else:
+        with np.errstate(invalid="ignore"):
+            rises, sets, noon, declination = _events(latitude, longitude, jd, zenith)
+
+    # Without events, the sun's altitude at noon tells polar day from polar night
+    no_events = np.isnan(rises) | np.isnan(sets)
+    noon_altitude = 90.0 - np.abs(latitude - declination)
+    polar_day = no_events & (noon_altitude > 0)
+    polar_night = no_events & ~polar_day
+    return SunEventArrays(jd, rises, sets, noon, polar_day, polar_night)
+
+
+def sun_events_for_dates(latitude, longitude, dates, elevation=0.0, use_numba=None):
+    """Convenience wrapper of sun_events() taking datetime.date objects."""
+    return sun_events(latitude, longitude, julian_days(dates), elevation, use_numba)
+
+
+def minutes_to_datetime(date_obj, minutes):
+    """Converts minutes after 00:00 UTC of date_obj to an aware UTC datetime (None for NaN)."""
+    if math.isnan(minutes):
+        return None
+    midnight = datetime.datetime(date_obj.year, date_obj.month, date_obj.day, tzinfo=datetime.timezone.utc)
+    return midnight + datetime.timedelta(minutes=float(minutes))
+
+
+if __name__ == '__main__':
+    # Example Usage
+    example_dates = [datetime.date(2024, 1, 1) + datetime.timedelta(days=d) for d in range(0, 366, 61)]
+    example = sun_events_for_dates(51.5074, -0.1278, example_dates) # London
+    print(f"numba: {NUMBA_AVAILABLE}")
+    for example_date, rise, set_ in zip(example_dates, example.sunrise, example.sunset):
+        print(example_date, minutes_to_datetime(example_date, rise), minutes_to_datetime(example_date, set_))
@@ -0,0 +1,168 @@
+"""
+Sunrise/sunset for the "fast" and "precise" precision tiers.
+
+The "standard" tier is astral (see calculations._compute_sun_times). The
+other two trade accuracy against speed in opposite directions:
+
+  fast      One evaluation of the Astronomical Almanac's low-precision solar
+            coordinates at local noon, sea level. Error against standard is
+            within 1.5 minutes up to 60 degrees latitude and within 4 minutes
+            up to 65; it grows without bound towards the polar circles.
+  standard  astral (NOAA equations, two fixed passes, sea-level refraction
+            and observer elevation as horizon dip). Within about a second of
+            the NOAA spreadsheet.
+  precise   Starts from standard and solves altitude(t) = horizon for the
+            event time by secant iteration to 10 ms, with the sun's true
+            semidiameter, Bennett refraction scaled to the given pressure and
+            temperature, and horizon dip including terrestrial refraction.
+            Converged to 0.01 s of the model; the real atmosphere near the
+            horizon varies by a minute or more, which no model captures.
+            It differs from standard by up to 50 s at 60 degrees (4 minutes
+            at 65), mostly because astral's horizon sits 0.05 degrees higher.
+
+Measured with benchmarks/bench_precision.py (one core, Python 3.11), in
+sun_times() calls per second:
+
+  fast       ~50,000
+  standard   ~18,000
+  precise     ~4,500
+
+Run the benchmark again for numbers on other hardware.
+"""
+import datetime
+import math
+
+from .constants import SUNRISE_ALTITUDE
+
+PRECISION_TIERS = ("fast", "standard", "precise")
+
+# Standard atmosphere used by the precise tier unless told otherwise
+STANDARD_PRESSURE_HPA = 1010.0
+STANDARD_TEMPERATURE_C = 10.0
+
+_UNIX_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_J2000_DATE = datetime.date(2000, 1, 1)
+_SIN_SUNRISE_ALTITUDE = math.sin(math.radians(SUNRISE_ALTITUDE))
+
+
+def validate_precision(precision):
+    """Raises ValueError for unknown tier names."""
+    if precision not in PRECISION_TIERS:
+        raise ValueError(f"Unknown precision tier: {precision} (expected one of {', '.join(PRECISION_TIERS)})")
+    return precision
+
+
+# --- fast tier ---
+
+def fast_events(latitude, longitude, date_obj):
+    """
+    Approximate sunrise, sunset and solar noon of the local date at a longitude.
+
+    Returns:
+        tuple: (rises, sets, noon) aware UTC datetimes, and a polar flag that is
+        None normally, "day" or "night" when there is no sunrise/sunset
+        (rises/sets are then None, and noon is None on polar night).
+    """
+    # Day number of the local solar noon, counted from J2000.0 (2000-01-01 12:00 UTC).
+    # Same series as yearly._solar_coordinates.
+    n = (date_obj - _J2000_DATE).days - longitude / 360.0
+    g = math.radians((357.529 + 0.98560028 * n) % 360) # Mean anomaly
+    q = (280.459 + 0.98564736 * n) % 360 # Mean longitude
+    ecliptic_longitude = math.radians(q + 1.915 * math.sin(g) + 0.020 * math.sin(2 * g))
+    obliquity = math.radians(23.439 - 0.00000036 * n)
+    declination = math.asin(math.sin(obliquity) * math.sin(ecliptic_longitude))
+    right_ascension = math.degrees(math.atan2(math.cos(obliquity) * math.sin(ecliptic_longitude), math.cos(ecliptic_longitude)))
+    equation_of_time = ((q - right_ascension + 180) % 360 - 180) * 4 # 4 minutes per degree
+
+    phi = math.radians(latitude)
+    cos_h = (_SIN_SUNRISE_ALTITUDE - math.sin(phi) * math.sin(declination)) / (math.cos(phi) * math.cos(declination))
+
+    midnight = datetime.datetime(date_obj.year, date_obj.month, date_obj.day, tzinfo=datetime.timezone.utc)
+    noon_minutes = 720.0 - 4.0 * longitude - equation_of_time
+    noon_utc = midnight + datetime.timedelta(minutes=noon_minutes)
+    if cos_h > 1.0:
+        return None, None, None, "night"
+    if cos_h < -1.0:
+        return None, None, noon_utc, "day"
+    half_day = datetime.timedelta(minutes=4.0 * math.degrees(math.acos(cos_h)))
+    return noon_utc - half_day, noon_utc + half_day, noon_utc, None
+
+
+# --- precise tier ---
+
+def _julian_day(moment):
+    return (moment - _UNIX_EPOCH).total_seconds() / 86400.0 + 2440587.5
+
+
+def _geometric_altitude(latitude, longitude, moment):
+    """True (unrefracted) altitude of the sun's centre in degrees, and its distance in AU."""
+    from .noaa import solar_terms # Only the precise tier needs NumPy
+    jd = _julian_day(moment)
+    jc = (jd - 2451545.0) / 36525.0
+    declination, eqtime = solar_terms(jc)
+    utc_minutes = ((jd - 0.5) % 1.0) * 1440.0
+    hour_angle = math.radians((utc_minutes + eqtime + 4.0 * longitude) / 4.0 - 180.0)
+    phi = math.radians(latitude)
+    dec = math.radians(float(declination))
+    sin_altitude = math.sin(phi) * math.sin(dec) + math.cos(phi) * math.cos(dec) * math.cos(hour_angle)
+
+    # Earth-sun distance from the orbit's eccentricity and true anomaly
+    m = math.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+    e = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    c = (math.sin(m) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+         + math.sin(2 * m) * (0.019993 - 0.000101 * jc) + math.sin(3 * m) * 0.000289)
+    distance = 1.000001018 * (1 - e * e) / (1 + e * math.cos(m + math.radians(c)))
+    return math.degrees(math.asin(max(-1.0, min(1.0, sin_altitude)))), distance
+
+
+def horizon_refraction(apparent_altitude, pressure_hpa=STANDARD_PRESSURE_HPA, temperature_c=STANDARD_TEMPERATURE_C):
+    """Bennett's refraction in degrees at an apparent altitude, scaled to pressure and temperature."""
+    arcminutes = 1.0 / math.tan(math.radians(apparent_altitude + 7.31 / (apparent_altitude + 4.4)))
+    return arcminutes / 60.0 * (pressure_hpa / 1010.0) * (283.0 / (273.0 + temperature_c))
+
+
+def horizon_dip(elevation):
+    """Dip of the sea horizon in degrees seen from `elevation` metres, including terrestrial refraction."""
+    if elevation <= 0:
+        return 0.0
+    return 1.76 * math.sqrt(elevation) / 60.0
+
+
+def refine_event(latitude, longitude, guess, elevation=0.0, pressure_hpa=STANDARD_PRESSURE_HPA,
+                 temperature_c=STANDARD_TEMPERATURE_C, tolerance=0.01, max_iterations=8):
+    """
+    Refines an approximate sunrise/sunset instant so that the upper limb of the
+    refracted sun is exactly on the (dipped) horizon.
+
+    Args:
+        guess (datetime.datetime): Aware starting instant, e.g. astral's result.
+        tolerance (float): Stop when a step is below this many seconds.
+
+    Returns:
+        datetime.datetime: The refined instant in UTC, or None if the iteration
+        does not converge (the sun only grazes the horizon that day).
+    """
+    dip = horizon_dip(elevation)
+    apparent_horizon = -dip
+    refraction = horizon_refraction(apparent_horizon, pressure_hpa, temperature_c)
+
+    def error(moment):
+        altitude, distance = _geometric_altitude(latitude, longitude, moment)
+        semidiameter = 959.63 / 3600.0 / distance
+        return altitude - (apparent_horizon - refraction - semidiameter)
+
+    t0 = guess.astimezone(datetime.timezone.utc)
+    t1 = t0 + datetime.timedelta(seconds=60)
+    f0, f1 = error(t0), error(t1)
+    for _ in range(max_iterations):
+        if f1 == f0:
+            return None
+        step = -f1 * (t1 - t0).total_seconds() / (f1 - f0)
+        if abs(step) > 3600:
+            return None # Secant ran off: the sun barely reaches the horizon
+        t0, f0 = t1, f1
+        t1 = t1 + datetime.timedelta(seconds=step)
+        f1 = error(t1)
+        if abs(step) < tolerance:
+            return t1
+    return None
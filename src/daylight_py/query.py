@@ -0,0 +1,413 @@
+"""
+Reverse queries: which (site, date) pairs satisfy a daylight condition.
+
+Conditions are predicates such as "day_length>16h" or "sunset>=21:00" over
+the fields day_length, sunrise, sunset and noon (local clock times). Dates are
+processed in chunks. For every chunk, sites are grouped into latitude bands
+and the whole band is skipped when bounds on its day length and event times
+(from the chunk's range of solar declination, equation of time and UTC
+offsets) show no site in it can match. Remaining sites are evaluated as
+(site x date) float64 arrays with the noaa kernel, and matches are yielded
+one by one in (date, site) order, without building full tables.
+
+Results follow the standard tier: events of the local date, as astral picks
+them, to within about a second. Days whose sunset comes before their sunrise
+(the sunset just after midnight, near midnight sun) have no day length.
+"""
+import datetime
+import operator
+import re
+
+import numpy as np
+import pytz
+
+from .calculations import Site
+from .formatting import format_clock, format_duration, to_seconds
+from .noaa import solar_terms, UNIX_EPOCH_JD, julian_days, sun_events, sunrise_zenith
+from .tzindex import get_zone_index
+
+FIELDS = ("day_length", "sunrise", "sunset", "noon")
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# Slack on pruning bounds, in minutes, so approximations never prune a real match
+PRUNE_MARGIN_MINUTES = 2.0
+
+_PREDICATE_RE = re.compile(r"^\s*(\w+)\s*(>=|<=|>|<)\s*(.+?)\s*$")
+_CLOCK_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([hm])$")
+
+
+class QueryError(Exception):
+    """Custom exception for invalid queries."""
+    pass
+
+
+class Predicate:
+    """
+    A comparison of one field against a value.
+
+    Values are minutes: of day length for "day_length", and minutes after local
+    midnight for the clock fields.
+    """
+
+    def __init__(self, field, op, value):
+        if field not in FIELDS:
+            raise QueryError(f"Unknown field: {field} (expected one of {', '.join(FIELDS)})")
+        if op not in _OPERATORS:
+            raise QueryError(f"Unknown operator: {op}")
+        self.field = field
+        self.op = op
+        self.value = float(value)
+
+    def __repr__(self):
+        return f"Predicate(field={self.field}, op={self.op}, value={self.value})"
+
+    def evaluate(self, values):
+        """Applies the predicate to an array of minutes; NaN (no such event) never matches."""
+        with np.errstate(invalid="ignore"):
+            return _OPERATORS[self.op](values, self.value)
+
+    def possible(self, low, high):
+        """Whether any value within [low, high] (minutes, with margin) could match."""
+        if self.op in (">", ">="):
+            return high + PRUNE_MARGIN_MINUTES >= self.value
+        return low - PRUNE_MARGIN_MINUTES <= self.value
+
+
+def _parse_minutes(field, text):
+    clock = _CLOCK_RE.match(text)
+    if clock:
+        hours, minutes = int(clock.group(1)), int(clock.group(2))
+        if minutes >= 60 or (field != "day_length" and hours >= 24) or hours > 24:
+            raise QueryError(f"Invalid time: {text}")
+        return hours * 60 + minutes
+    duration = _DURATION_RE.match(text)
+    if duration and field == "day_length":
+        amount = float(duration.group(1))
+        return amount * 60 if duration.group(2) == "h" else amount
+    expected = "a duration like 16h, 90m or 16:30" if field == "day_length" else "a time like 21:00"
+    raise QueryError(f"Invalid value for {field}: {text} (expected {expected})")
+
+
+def parse_predicate(text):
+    """
+    Parses a condition such as "day_length>16h", "sunset>=21:00" or "sunrise<5:30".
+
+    Raises:
+        QueryError: If the text is not a valid condition.
+    """
+    match = _PREDICATE_RE.match(text)
+    if not match:
+        raise QueryError(f"Invalid condition: {text} (expected e.g. day_length>16h or sunset>=21:00)")
+    field, op, value = match.groups()
+    if field not in FIELDS:
+        raise QueryError(f"Unknown field: {field} (expected one of {', '.join(FIELDS)})")
+    return Predicate(field, op, _parse_minutes(field, value))
+
+
+class QueryMatch:
+    """One (site, date) pair satisfying every predicate, with its sun times."""
+
+    def __init__(self, site_index, site, date, rises, sets, noon, length):
+        self.site_index = site_index # Position of the site in the query's input
+        self.site = site
+        self.date = date
+        self.rises = rises
+        self.sets = sets
+        self.noon = noon
+        self.length = length
+
+    def __repr__(self):
+        return (f"QueryMatch(site_index={self.site_index}, date={self.date}, rises={self.rises}, "
+                f"sets={self.sets}, length={self.length})")
+
+
+def _day_length_minutes(latitude, declination, zenith):
+    """Day length in minutes from latitude and declination (degrees); 0/1440 for polar night/day."""
+    phi = np.radians(np.clip(latitude, -89.8, 89.8))
+    dec = np.radians(declination)
+    cos_h = (np.cos(np.radians(zenith)) - np.sin(phi) * np.sin(dec)) / (np.cos(phi) * np.cos(dec))
+    return 8.0 * np.degrees(np.arccos(np.clip(cos_h, -1.0, 1.0))) # 2 * 4 minutes per degree
+
+
+class _Group:
+    """Sites sharing a zone and elevation, evaluated together as one array."""
+
+    def __init__(self, timezone, elevation, indices, latitudes, longitudes, band_degrees):
+        self.timezone = timezone
+        self.elevation = elevation
+        self.zenith = sunrise_zenith(elevation)
+        self.indices = np.array(indices)
+        self.latitudes = np.array(latitudes, dtype=np.float64)
+        self.longitudes = np.array(longitudes, dtype=np.float64)
+        # Latitude band of each site, and the latitude range actually covered by its band
+        bands = np.floor(self.latitudes / band_degrees)
+        self.band_low = np.empty_like(self.latitudes)
+        self.band_high = np.empty_like(self.latitudes)
+        for band in np.unique(bands):
+            members = bands == band
+            self.band_low[members] = self.latitudes[members].min()
+            self.band_high[members] = self.latitudes[members].max()
+
+
+class Query:
+    """
+    Finds (site, date) pairs matching all predicates.
+
+    Counters evaluated_cells and pruned_cells tell how many (site, date) pairs
+    were computed and how many were skipped by the band/season bounds.
+    """
+
+    def __init__(self, sites, predicates, band_degrees=5.0, chunk_days=31):
+        self.sites = list(sites)
+        self.predicates = [parse_predicate(p) if isinstance(p, str) else p for p in predicates]
+        if not self.predicates:
+            raise QueryError("A query needs at least one condition")
+        self.band_degrees = band_degrees
+        self.chunk_days = chunk_days
+        self.evaluated_cells = 0
+        self.pruned_cells = 0
+
+        groups = {}
+        for index, site in enumerate(self.sites):
+            groups.setdefault((str(site.timezone), site.elevation), []).append(index) # FixedOffset zones have no .zone
+        self.groups = [
+            _Group(
+                self.sites[indices[0]].timezone, elevation, indices,
+                [self.sites[i].latitude for i in indices], [self.sites[i].longitude for i in indices],
+                band_degrees,
+            )
+            for (_, elevation), indices in groups.items()
+        ]
+
+    def __repr__(self):
+        return f"Query(sites={len(self.sites)}, predicates={self.predicates}, groups={len(self.groups)})"
+
+    def run(self, start_date, end_date):
+        """Yields QueryMatch objects in (date, site) order for dates start_date..end_date (inclusive)."""
+        day = start_date
+        while day <= end_date:
+            last = min(end_date, day + datetime.timedelta(days=self.chunk_days - 1))
+            dates = [day + datetime.timedelta(days=i) for i in range((last - day).days + 1)]
+            matches = []
+            for group in self.groups:
+                matches.extend(self._run_group(group, dates))
+            matches.sort(key=lambda m: (m.date, m.site_index))
+            yield from matches
+            day = last + datetime.timedelta(days=1)
+
+    # --- pruning ---
+
+    def _season(self, dates):
+        """Declination and equation of time ranges over the chunk (one day of slack on each side)."""
+        jd = julian_days([dates[0] - datetime.timedelta(days=1), dates[-1] + datetime.timedelta(days=1)])
+        jd = np.arange(jd[0], jd[1] + 0.5, 0.5)
+        declination, eqtime = solar_terms((jd - 2451545.0) / 36525.0)
+        return (declination.min(), declination.max()), (eqtime.min(), eqtime.max())
+
+    def _offset_range(self, zone_index, dates):
+        """Minimum and maximum UTC offset (minutes) of the zone during the chunk."""
+        start = (julian_days([dates[0]])[0] - UNIX_EPOCH_JD) * 86400 - 86400
+        end = min((julian_days([dates[-1]])[0] - UNIX_EPOCH_JD) * 86400 + 2 * 86400, zone_index.end - 1)
+        first, last = zone_index.segments(np.array([start, end]))
+        offsets = zone_index.offsets[first:last + 1]
+        return offsets.min() / 60.0, offsets.max() / 60.0
+
+    def _possible(self, group, zone_index, dates, season):
+        """Per-site mask of sites that could match on some date of the chunk."""
+        (dec_low, dec_high), (eot_low, eot_high) = season
+        # Day length is monotonic in latitude and in declination, so the corners of
+        # (band latitudes x season declinations) bound it for every site of the band
+        corners = np.stack([
+            _day_length_minutes(latitude, declination, group.zenith)
+            for latitude in (group.band_low, group.band_high)
+            for declination in (dec_low, dec_high)
+        ])
+        length_low, length_high = corners.min(axis=0), corners.max(axis=0)
+        offset_low, offset_high = self._offset_range(zone_index, dates)
+
+        possible = np.ones(len(group.indices), dtype=bool)
+        for predicate in self.predicates:
+            if predicate.field == "day_length":
+                possible &= predicate.possible(length_low, length_high)
+                continue
+            # Local event time = 720 - 4 * longitude - equation of time (+/- half the day) + UTC offset
+            base = 720.0 - 4.0 * group.longitudes
+            if predicate.field == "sunrise":
+                low = base - eot_high - length_high / 2 + offset_low
+                high = base - eot_low - length_low / 2 + offset_high
+            elif predicate.field == "sunset":
+                low = base - eot_high + length_low / 2 + offset_low
+                high = base - eot_low + length_high / 2 + offset_high
+            else:
+                low = base - eot_high + offset_low
+                high = base - eot_low + offset_high
+            wraps = (low < 0) | (high >= 1440) # Bounds across local midnight prove nothing
+            possible &= wraps | predicate.possible(low, high)
+        return possible
+
+    # --- evaluation ---
+
+    def _local_events(self, group, zone_index, latitudes, longitudes, jd, local_days):
+        """
+        Events of the local dates as UTC epoch seconds, taking each from the
+        neighbouring UTC day where the local date has it there (like astral).
+        """
+        events = sun_events(latitudes, longitudes, jd, group.elevation)
+        results = []
+        for name in ("sunrise", "sunset", "noon"):
+            epochs = events.epoch_seconds(getattr(events, name))
+            for _ in range(2):
+                local_day = np.floor(self._local_seconds(zone_index, epochs) / 86400)
+                shift = np.nan_to_num(local_days - local_day) # Whole days to move the query date by
+                redo = shift != 0
+                if not redo.any():
+                    break
+                again = sun_events(latitudes[redo], longitudes[redo], jd[redo] + shift[redo], group.elevation)
+                epochs[redo] = again.epoch_seconds(getattr(again, name))
+            local_day = np.floor(self._local_seconds(zone_index, epochs) / 86400)
+            epochs[local_day != local_days] = np.nan # The local date has no such event
+            results.append(epochs)
+        return results
+
+    @staticmethod
+    def _local_seconds(zone_index, epochs):
+        safe = np.where(np.isnan(epochs), zone_index.start, epochs)
+        return np.where(np.isnan(epochs), np.nan, zone_index.local_seconds(safe))
+
+    def _run_group(self, group, dates):
+        zone_index = get_zone_index(group.timezone, dates[0].year, dates[-1].year)
+        candidates = self._possible(group, zone_index, dates, self._season(dates))
+        self.pruned_cells += int((~candidates).sum()) * len(dates)
+        if not candidates.any():
+            return []
+        self.evaluated_cells += int(candidates.sum()) * len(dates)
+
+        shape = (int(candidates.sum()), len(dates))
+        latitudes = np.broadcast_to(group.latitudes[candidates][:, None], shape)
+        longitudes = np.broadcast_to(group.longitudes[candidates][:, None], shape)
+        jd = np.broadcast_to(julian_days(dates)[None, :], shape).copy()
+        local_days = jd - UNIX_EPOCH_JD # Whole days since 1970-01-01, as local day numbers
+
+        rises, sets, noon = self._local_events(group, zone_index, latitudes.copy(), longitudes.copy(), jd, local_days)
+        # Neither event on the local date: the sun's altitude at local noon tells polar day from night
+        declination, _ = solar_terms((jd + 0.5 - longitudes / 360.0 - 2451545.0) / 36525.0)
+        no_events = np.isnan(rises) & np.isnan(sets)
+        polar_day = no_events & (90.0 - np.abs(latitudes - declination) > 0)
+        polar_night = no_events & ~polar_day
+        length = np.where(polar_day, 1440.0, np.where(polar_night, 0.0, (sets - rises) / 60.0))
+        with np.errstate(invalid="ignore"):
+            # Near midnight sun the local date's sunset can be the one just after midnight, before its sunrise
+            length[length < 0] = np.nan
+        noon = np.where(polar_night, np.nan, noon)
+
+        fields = {"day_length": length}
+        for name, epochs in (("sunrise", rises), ("sunset", sets), ("noon", noon)):
+            fields[name] = (self._local_seconds(zone_index, epochs) % 86400) / 60.0
+
+        matched = np.ones(shape, dtype=bool)
+        for predicate in self.predicates:
+            matched &= predicate.evaluate(fields[predicate.field])
+
+        rows, columns = np.nonzero(matched)
+        if not rows.size:
+            return []
+        localized = [zone_index.localize(epochs[rows, columns]) for epochs in (rises, sets, noon)]
+        site_indices = group.indices[candidates]
+        return [
+            QueryMatch(
+                int(site_indices[row]),
+                self.sites[site_indices[row]],
+                dates[column],
+                localized[0][k],
+                localized[1][k],
+                localized[2][k],
+                datetime.timedelta(minutes=float(length[row, column])) if not np.isnan(length[row, column]) else None,
+            )
+            for k, (row, column) in enumerate(zip(rows.tolist(), columns.tolist()))
+        ]
+
+
+def find_matches(sites, start_date, end_date, predicates, band_degrees=5.0, chunk_days=31):
+    """
+    Streams the (site, date) pairs matching every predicate.
+
+    Args:
+        sites (iterable of Site): Sites to search.
+        start_date, end_date (datetime.date): Date range (inclusive).
+        predicates (list): Predicate objects or condition strings such as
+            "day_length>16h" or "sunset>=21:00", combined with AND.
+
+    Returns:
+        generator of QueryMatch, in (date, site) order.
+
+    Raises:
+        QueryError: For invalid conditions.
+    """
+    return Query(sites, predicates, band_degrees, chunk_days).run(start_date, end_date)
+
+
+def read_sites(lines):
+    """
+    Reads sites from CSV lines "name,latitude,longitude,timezone[,elevation]".
+    Blank lines, lines starting with # and a header line are skipped.
+
+    Returns:
+        list: (name, Site) tuples.
+    """
+    sites = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [part.strip() for part in line.split(",")]
+        if number == 1 and parts[1:2] == ["latitude"]:
+            continue
+        if len(parts) not in (4, 5):
+            raise QueryError(f"Line {number}: expected name,latitude,longitude,timezone[,elevation]")
+        try:
+            elevation = float(parts[4]) if len(parts) == 5 else 0.0
+            sites.append((parts[0], Site(float(parts[1]), float(parts[2]), parts[3], elevation)))
+        except ValueError as e:
+            raise QueryError(f"Line {number}: {e}")
+        except pytz.exceptions.UnknownTimeZoneError:
+            raise QueryError(f"Line {number}: unknown timezone {parts[3]}")
+    return sites
+
+
+def format_match(name, match: QueryMatch):
+    """One line of `daylight query` text output."""
+    return (f"{match.date.isoformat()}  {name}  rises {format_clock(match.rises, '--:--')}  "
+            f"sets {format_clock(match.sets, '--:--')}  length {format_duration(match.length, 'N/A')}")
+
+
+def match_to_dict(name, match: QueryMatch):
+    """One object of `daylight query --json` output (one per line)."""
+    return {
+        "date": match.date.isoformat(),
+        "site": name,
+        "latitude": match.site.latitude,
+        "longitude": match.site.longitude,
+        "timezone": match.site.timezone.zone,
+        "sunrise": match.rises.isoformat() if match.rises else None,
+        "sunset": match.sets.isoformat() if match.sets else None,
+        "noon": match.noon.isoformat() if match.noon else None,
+        "length": to_seconds(match.length),
+    }
+
+
+if __name__ == '__main__':
+    # Example Usage
+    example_sites = [
+        Site(51.5074, -0.1278, "Europe/London"),
+        Site(59.9139, 10.7522, "Europe/Oslo"),
+        Site(37.5665, 126.9780, "Asia/Seoul"),
+    ]
+    for example in find_matches(example_sites, datetime.date(2027, 1, 1), datetime.date(2027, 12, 31), ["day_length>18h"]):
+        print(example.date, example.site.timezone.zone, example.rises.strftime("%H:%M"), example.sets.strftime("%H:%M"))
@@ -0,0 +1,199 @@
+"""
+Batch report pipeline: full-text reports for many sites.
+
+Computation, formatting and writing run as separate stages connected by
+bounded queues, so rendering overlaps with computation and output writing.
+Each stage has its own worker count and can run its work in threads or in a
+process pool. The writer restores input order, so output is deterministic
+whatever the worker counts.
+"""
+import concurrent.futures
+import datetime
+import functools
+import queue
+import threading
+
+from .calculations import Site
+from .full_view import create_full_output
+from .yearly import get_yearly_index
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception from a worker down to the writer."""
+
+    def __init__(self, index, error):
+        self.index = index
+        self.error = error
+
+
+class ReportError(Exception):
+    """Raised when a site's report could not be produced."""
+    pass
+
+
+def compute_site(site: Site, query_date, projection_days=10):
+    """Computation stage: yesterday, today and the projection for one site."""
+    return site.day_length_series(query_date, query_date + datetime.timedelta(days=projection_days))
+
+
+def render_site_report(site: Site, query_date, series):
+    """Formatting stage: the full view for one site, as shown by the CLI in offline mode."""
+    return create_full_output(
+        query_date=query_date,
+        sun_times_today=series.sun_times[0],
+        sun_times_yesterday=series.previous,
+        ten_day_projection=list(zip(series.dates[1:], series.sun_times[1:])),
+        ip_info={"latitude": site.latitude, "longitude": site.longitude, "timezone": site.timezone.zone},
+        offline_mode=True,
+        year_index=get_yearly_index(site.latitude, query_date.year),
+        changes=series.changes,
+    )
+
+
+def _compute_item(site, query_date, projection_days):
+    return site, compute_site(site, query_date, projection_days)
+
+
+def _render_item(item, query_date):
+    site, series = item
+    return render_site_report(site, query_date, series)
+
+
+class _Stage:
+    """A pool of worker threads moving (index, value) items from inbox to outbox."""
+
+    def __init__(self, func, workers, inbox, outbox, pool=None):
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.pool = pool
+        self.threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def close(self):
+        """Tells every worker to stop once the inbox is drained, and waits for them."""
+        for _ in self.threads:
+            self.inbox.put(_DONE)
+        for thread in self.threads:
+            thread.join()
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                return
+            index, value = item
+            if not isinstance(value, _Failure):
+                try:
+                    if self.pool is not None:
+                        value = self.pool.submit(self.func, value).result()
+                    else:
+                        value = self.func(value)
+                except Exception as e:
+                    value = _Failure(index, e)
+            self.outbox.put((index, value))
+
+
+def _write_in_order(inbox, out, errors):
+    """Writer stage: buffers out-of-order results and writes them by input index."""
+    pending = {}
+    next_index = 0
+    while True:
+        item = inbox.get()
+        if item is _DONE:
+            return
+        index, value = item
+        pending[index] = value
+        while next_index in pending:
+            value = pending.pop(next_index)
+            if isinstance(value, _Failure):
+                errors.append(value)
+            elif out is not None:
+                try:
+                    out.write(value)
+                    out.write("\n")
+                except Exception as e:
+                    # Keep draining so upstream stages never block on a full queue
+                    errors.append(_Failure(next_index, e))
+                    out = None
+            next_index += 1
+
+
+def run_report(sites, query_date, out, compute_workers=4, render_workers=2, queue_size=64,
+               compute_processes=False, render_processes=False, projection_days=10):
+    """
+    Writes a full-text report for every site to `out`, in the order given.
+
+    Args:
+        sites (iterable of Site): Sites to report on.
+        query_date (datetime.date): The date of the reports.
+        out: A text stream; written only from the writer thread.
+        compute_workers, render_workers (int): Worker count of each stage.
+        queue_size (int): Capacity of each queue between stages.
+        compute_processes, render_processes (bool): Run that stage's work in a
+            process pool of the same size instead of in the worker threads.
+        projection_days (int): Length of the projection table.
+
+    Raises:
+        ReportError: After writing everything else, if any site failed.
+    """
+    to_compute = queue.Queue(maxsize=queue_size)
+    to_render = queue.Queue(maxsize=queue_size)
+    to_write = queue.Queue(maxsize=queue_size)
+    errors = []
+
+    pools = []
+
+    def make_pool(enabled, workers):
+        if not enabled:
+            return None
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        pools.append(pool)
+        return pool
+
+    try:
+        compute = _Stage(
+            functools.partial(_compute_item, query_date=query_date, projection_days=projection_days),
+            compute_workers, to_compute, to_render, make_pool(compute_processes, compute_workers),
+        )
+        render = _Stage(
+            functools.partial(_render_item, query_date=query_date),
+            render_workers, to_render, to_write, make_pool(render_processes, render_workers),
+        )
+        writer = threading.Thread(target=_write_in_order, args=(to_write, out, errors), daemon=True)
+
+        compute.start()
+        render.start()
+        writer.start()
+
+        for index, site in enumerate(sites):
+            to_compute.put((index, site)) # Blocks while the pipeline is full
+        compute.close()
+        render.close()
+        to_write.put(_DONE)
+        writer.join()
+    finally:
+        for pool in pools:
+            pool.shutdown()
+
+    if errors:
+        first = errors[0]
+        raise ReportError(f"{len(errors)} site(s) failed, first at position {first.index}: {first.error}") from first.error
+
+
+if __name__ == '__main__':
+    # Example Usage
+    import sys
+
+    example_sites = [
+        Site(51.5074, -0.1278, "Europe/London"),
+        Site(69.6492, 18.9553, "Europe/Oslo"),
+        Site(-33.92, 18.42, "Africa/Johannesburg"),
+        Site(37.5665, 126.9780, "Asia/Seoul"),
+    ]
+    run_report(example_sites, datetime.date.today(), sys.stdout)
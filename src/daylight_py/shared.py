@@ -0,0 +1,306 @@
+"""
+Sun time tables in shared memory, for consumers in other processes.
+
+publish_sun_times() computes SunTimes for every site and date of a range
+once and copies them into a multiprocessing.shared_memory block under a
+well-known name. attach_sun_times() maps that block in another process and
+exposes the tables as read-only NumPy views of the shared buffer: nothing is
+recomputed, copied or unpickled, and sun_times() rebuilds the exact SunTimes
+the views would have been given.
+
+Block layout (little-endian):
+
+  magic      8 bytes, b"DAYLSHM1", written last (a block without it is
+             still being filled)
+  length     uint32, size of the JSON header that follows
+  header     JSON: start date, number of days, the sites (their Site
+             arguments) and the byte offset of each array
+  arrays     64-byte aligned, each of shape (sites, days):
+               rises, sets, noon   int64 microseconds since the Unix epoch
+               length              int64 microseconds
+               flags               uint8, bit 0 polar day, bit 1 polar night
+             NO_VALUE marks missing times (e.g. no sunrise on a polar night).
+
+A block outlives the process that published it, like a file, until
+unlink_sun_times() or SharedSunTimes.unlink() removes it.
+"""
+import datetime
+import json
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .calculations import Site, SunTimes
+
+DEFAULT_BLOCK_NAME = "daylight_sun_times"
+
+MAGIC = b"DAYLSHM1"
+BLOCK_VERSION = 1
+NO_VALUE = np.iinfo(np.int64).min
+
+POLAR_DAY = 1
+POLAR_NIGHT = 2
+
+_PREFIX = struct.Struct("<8sI")
+_ALIGNMENT = 64
+_TIME_ARRAYS = ("rises", "sets", "noon", "length")
+_UNIX_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class SharedBlockError(Exception):
+    """Custom exception for missing, unfinished or incompatible shared blocks."""
+    pass
+
+
+def _untrack(shm):
+    # The resource tracker would unlink the block when this process exits,
+    # even though other processes still use it; its lifetime is managed explicitly.
+    if os.name == "posix":
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+
+
+def _unlink(shm):
+    # SharedMemory.unlink() also unregisters the block from the tracker, so
+    # register it again first to keep the tracker's bookkeeping balanced.
+    if os.name == "posix":
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+def _to_microseconds(dt_obj):
+    if dt_obj is None:
+        return NO_VALUE
+    return (dt_obj - _UNIX_EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _from_microseconds(value, timezone_pytz):
+    if value == NO_VALUE:
+        return None
+    return (_UNIX_EPOCH + datetime.timedelta(microseconds=int(value))).astimezone(timezone_pytz)
+
+
+def _layout(site_count, days, header_size):
+    """Byte offsets of the arrays after a header of header_size bytes, and the total size."""
+    offset = -(-(_PREFIX.size + header_size) // _ALIGNMENT) * _ALIGNMENT
+    offsets = {}
+    cells = site_count * days
+    for name in _TIME_ARRAYS:
+        offsets[name] = offset
+        offset += -(-cells * 8 // _ALIGNMENT) * _ALIGNMENT
+    offsets["flags"] = offset
+    return offsets, offset + max(cells, 1)
+
+
+class SharedSunTimes:
+    """
+    Sun time tables of a shared memory block (see the module docstring).
+
+    Attributes:
+        sites (list): Site objects, one per row.
+        start_date (datetime.date): The date of column 0.
+        days (int): Number of columns.
+        rises, sets, noon, length, flags: NumPy views of the shared arrays,
+            shape (len(sites), days); read-only when attached.
+    """
+
+    def __init__(self, shm, header, owner=False):
+        self.name = shm.name
+        self.sites = [Site(*arguments) for arguments in header["sites"]]
+        self.start_date = datetime.date.fromisoformat(header["start"])
+        self.days = header["days"]
+        self._shm = shm
+        shape = (len(self.sites), self.days)
+        offsets = header["arrays"]
+        for name in _TIME_ARRAYS:
+            setattr(self, name, np.ndarray(shape, dtype="<i8", buffer=shm.buf, offset=offsets[name]))
+        self.flags = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offsets["flags"])
+        if not owner:
+            for name in _TIME_ARRAYS + ("flags",):
+                getattr(self, name).flags.writeable = False
+        self._index = {site.__reduce__()[1]: i for i, site in enumerate(self.sites)}
+
+    def __repr__(self):
+        return (f"SharedSunTimes(name={self.name}, sites={len(self.sites)}, start_date={self.start_date}, "
+                f"days={self.days})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def dates(self):
+        """The dates of the columns."""
+        return [self.start_date + datetime.timedelta(days=i) for i in range(self.days)]
+
+    def site_index(self, site):
+        """Row of a Site with the same arguments, or None if the block does not cover it."""
+        return self._index.get(site.__reduce__()[1])
+
+    def date_index(self, date_obj):
+        """Column of a date, or None if the block does not cover it."""
+        column = (date_obj - self.start_date).days
+        return column if 0 <= column < self.days else None
+
+    def sun_times(self, site_index, date_obj):
+        """
+        Rebuilds the SunTimes of one site and date, equal to Site.sun_times().
+
+        Raises:
+            KeyError: If the date is outside the block.
+        """
+        column = self.date_index(date_obj)
+        if column is None:
+            raise KeyError(f"{date_obj} is outside {self.start_date} + {self.days} days")
+        timezone_pytz = self.sites[site_index].timezone
+        length = self.length[site_index, column]
+        flags = self.flags[site_index, column]
+        return SunTimes(
+            rises=_from_microseconds(self.rises[site_index, column], timezone_pytz),
+            sets=_from_microseconds(self.sets[site_index, column], timezone_pytz),
+            noon=_from_microseconds(self.noon[site_index, column], timezone_pytz),
+            length=None if length == NO_VALUE else datetime.timedelta(microseconds=int(length)),
+            polar_day=bool(flags & POLAR_DAY),
+            polar_night=bool(flags & POLAR_NIGHT),
+            timezone=timezone_pytz,
+        )
+
+    def close(self):
+        """Unmaps the block from this process (the arrays become unusable)."""
+        if self._shm is None:
+            return
+        for name in _TIME_ARRAYS + ("flags",):
+            setattr(self, name, None) # The buffer cannot be released while views exist
+        self._shm.close()
+        self._shm = None
+
+    def unlink(self):
+        """Removes the block by name; processes that attached keep their mapping until close()."""
+        if self._shm is not None:
+            _unlink(self._shm)
+        else:
+            unlink_sun_times(self.name)
+
+
+def publish_sun_times(sites, start_date, end_date, name=DEFAULT_BLOCK_NAME, replace=False):
+    """
+    Computes sun times of sites over start_date..end_date (inclusive) and publishes them.
+
+    Args:
+        sites (list): Site objects (any precision tier).
+        name (str): Name of the shared memory block.
+        replace (bool): Remove a block already published under the name.
+
+    Returns:
+        SharedSunTimes: The writable tables; the caller should close() them when done.
+
+    Raises:
+        SharedBlockError: If a block with the name exists and replace is False.
+    """
+    days = (end_date - start_date).days + 1
+    if days < 1:
+        raise ValueError("end_date must not be before start_date")
+    site_count = len(sites)
+
+    header = {
+        "version": BLOCK_VERSION,
+        "start": start_date.isoformat(),
+        "days": days,
+        "sites": [list(site.__reduce__()[1]) for site in sites],
+    }
+    # The offsets are part of the header, so size the header with placeholder offsets first
+    offsets, _ = _layout(site_count, days, 0)
+    header["arrays"] = offsets
+    provisional = len(json.dumps(header).encode("utf-8")) + 16 * len(offsets)
+    offsets, size = _layout(site_count, days, provisional)
+    header["arrays"] = offsets
+    encoded = json.dumps(header).encode("utf-8")
+
+    if replace:
+        unlink_sun_times(name)
+    try:
+        shm = shared_memory.SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+        raise SharedBlockError(f"A shared block named {name} already exists")
+    _untrack(shm)
+
+    block = None
+    try:
+        block = SharedSunTimes(shm, header, owner=True)
+        for row, site in enumerate(sites):
+            for column, (_, sun_times) in enumerate(site.range(start_date, end_date)):
+                block.rises[row, column] = _to_microseconds(sun_times.rises)
+                block.sets[row, column] = _to_microseconds(sun_times.sets)
+                block.noon[row, column] = _to_microseconds(sun_times.noon)
+                block.length[row, column] = (NO_VALUE if sun_times.length is None
+                                             else sun_times.length // datetime.timedelta(microseconds=1))
+                block.flags[row, column] = (POLAR_DAY if sun_times.polar_day else 0) | (POLAR_NIGHT if sun_times.polar_night else 0)
+    except BaseException:
+        # Nothing tracks the untracked block any more: remove it, or it stays in /dev/shm until reboot
+        if block is not None:
+            block.close()
+        else:
+            shm.close()
+        _unlink(shm)
+        raise
+
+    shm.buf[_PREFIX.size:_PREFIX.size + len(encoded)] = encoded
+    shm.buf[:_PREFIX.size] = _PREFIX.pack(MAGIC, len(encoded)) # Last, so readers never see a partial block
+    return block
+
+
+def attach_sun_times(name=DEFAULT_BLOCK_NAME):
+    """
+    Maps a published block read-only, without copying it.
+
+    Raises:
+        SharedBlockError: If no block has the name, or it is unfinished or of another version.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name)
+    except FileNotFoundError:
+        raise SharedBlockError(f"No shared block named {name}")
+    _untrack(shm)
+    try:
+        magic, header_size = _PREFIX.unpack_from(shm.buf)
+        if magic != MAGIC:
+            raise SharedBlockError(f"Shared block {name} is not a finished sun time table")
+        header = json.loads(bytes(shm.buf[_PREFIX.size:_PREFIX.size + header_size]))
+        if header.get("version") != BLOCK_VERSION:
+            raise SharedBlockError(f"Shared block {name} has version {header.get('version')}, expected {BLOCK_VERSION}")
+        return SharedSunTimes(shm, header)
+    except (SharedBlockError, ValueError, KeyError, struct.error) as e:
+        shm.close()
+        if isinstance(e, SharedBlockError):
+            raise
+        raise SharedBlockError(f"Shared block {name} is corrupt: {e}")
+
+
+def unlink_sun_times(name=DEFAULT_BLOCK_NAME):
+    """Removes a published block if it exists. Returns True if one was removed."""
+    try:
+        shm = shared_memory.SharedMemory(name)
+    except FileNotFoundError:
+        return False
+    _untrack(shm)
+    shm.close()
+    _unlink(shm)
+    return True
+
+
+if __name__ == '__main__':
+    # Example Usage
+    example_sites = [Site(37.5665, 126.978, "Asia/Seoul"), Site(69.6492, 18.9553, "Europe/Oslo")]
+    published = publish_sun_times(example_sites, datetime.date(2024, 12, 1), datetime.date(2024, 12, 31), replace=True)
+    with attach_sun_times() as attached:
+        print(attached)
+        print(attached.sun_times(0, datetime.date(2024, 12, 21)))
+        print(attached.sun_times(1, datetime.date(2024, 12, 21)))
+    published.close()
+    unlink_sun_times()
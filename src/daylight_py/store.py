@@ -0,0 +1,397 @@
+"""
+Persistent SQLite store of computed sun times, for long per-site histories.
+
+Reports over months of data read them back with one indexed range scan
+instead of recomputing every day. Rows are keyed by (site, day) in a
+WITHOUT ROWID table, so the primary key B-tree holds the whole row and
+serves as the covering index: a year for one site is a single contiguous
+scan that never touches a second structure. Writes are batched with
+executemany in one transaction each, and the database runs in WAL mode so
+readers in other processes are not blocked by a writer.
+
+Like the namespaces of the result cache, the store records the library
+versions its rows were computed with (the "store" entry of
+NAMESPACE_DEPENDENCIES) and empties itself when they change. It is listed,
+pruned and cleared by `daylight cache stats|prune|clear` alongside them.
+
+Enable it for the CLI with --store PATH or DAYLIGHT_STORE.
+"""
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from .cache import NamespaceStats, namespace_versions
+from .calculations import Site, SunTimes
+
+# Rows per executemany() call when writing
+BATCH_SIZE = 1000
+
+SCHEMA_VERSION = 1
+
+POLAR_DAY = 1
+POLAR_NIGHT = 2
+
+_UNIX_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sites (
+    id INTEGER PRIMARY KEY,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    timezone TEXT NOT NULL,
+    elevation REAL NOT NULL,
+    precision TEXT NOT NULL,
+    pressure_hpa REAL NOT NULL,
+    temperature_c REAL NOT NULL,
+    UNIQUE (latitude, longitude, timezone, elevation, precision, pressure_hpa, temperature_c)
+);
+CREATE TABLE IF NOT EXISTS sun_times (
+    site_id INTEGER NOT NULL REFERENCES sites (id),
+    day INTEGER NOT NULL, -- date.toordinal()
+    rises INTEGER, -- Microseconds since the Unix epoch, NULL if there is none
+    sets INTEGER,
+    noon INTEGER,
+    length INTEGER, -- Microseconds
+    flags INTEGER NOT NULL, -- Bit 0 polar day, bit 1 polar night
+    PRIMARY KEY (site_id, day)
+) WITHOUT ROWID;
+"""
+
+
+class StoreError(Exception):
+    """Custom exception for store errors."""
+    pass
+
+
+def default_store_path():
+    """Returns the store path from DAYLIGHT_STORE, or None (no store) if unset."""
+    return os.environ.get("DAYLIGHT_STORE") or None
+
+
+def _expected_meta(versions):
+    """The meta rows of a store that is current for the given versions."""
+    return {"schema": str(SCHEMA_VERSION), "versions": json.dumps(versions, sort_keys=True)}
+
+
+def _encode_time(dt_obj):
+    return None if dt_obj is None else (dt_obj - _UNIX_EPOCH) // _MICROSECOND
+
+
+def _decode_time(value, timezone_pytz):
+    return None if value is None else (_UNIX_EPOCH + datetime.timedelta(microseconds=value)).astimezone(timezone_pytz)
+
+
+def _encode_row(site_id, date_obj, sun_times):
+    return (
+        site_id,
+        date_obj.toordinal(),
+        _encode_time(sun_times.rises),
+        _encode_time(sun_times.sets),
+        _encode_time(sun_times.noon),
+        None if sun_times.length is None else sun_times.length // _MICROSECOND,
+        (POLAR_DAY if sun_times.polar_day else 0) | (POLAR_NIGHT if sun_times.polar_night else 0),
+    )
+
+
+def _decode_row(row, timezone_pytz):
+    day, rises, sets, noon, length, flags = row
+    return datetime.date.fromordinal(day), SunTimes(
+        rises=_decode_time(rises, timezone_pytz),
+        sets=_decode_time(sets, timezone_pytz),
+        noon=_decode_time(noon, timezone_pytz),
+        length=None if length is None else datetime.timedelta(microseconds=length),
+        polar_night=bool(flags & POLAR_NIGHT),
+        polar_day=bool(flags & POLAR_DAY),
+        timezone=timezone_pytz,
+    )
+
+
+class SunTimesStore:
+    """
+    SunTimes per site and date in an SQLite database.
+
+    Sites are identified by all their arguments (coordinates, zone, elevation,
+    precision tier and atmosphere), so results of different tiers never mix.
+
+    A store may be shared by threads: they use its one connection in turn,
+    under a lock, while the days missing from it are computed outside the lock.
+    """
+
+    def __init__(self, path, versions=None):
+        self.path = str(path)
+        self.versions = namespace_versions("store", versions)
+        self.hits = 0 # Stored days served, since the last flush()
+        self.misses = 0 # Days computed
+        self._site_ids = {}
+        self._lock = threading.RLock() # Guards the connection, _site_ids and the counters
+        try:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL") # Durable enough for recomputable data
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+            self._validate()
+        except sqlite3.Error as e:
+            raise StoreError(f"Cannot open sun times store {self.path}: {e}")
+
+    def __repr__(self):
+        return f"SunTimesStore(path={self.path}, hits={self.hits}, misses={self.misses})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _validate(self):
+        """Empties the store if it was filled by another schema or other library versions."""
+        recorded = dict(self._conn.execute("SELECT key, value FROM meta"))
+        expected = _expected_meta(self.versions)
+        if all(recorded.get(key) == value for key, value in expected.items()):
+            return
+        with self._conn:
+            self._conn.execute("DELETE FROM sun_times")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", expected.items())
+
+    def flush(self):
+        """Adds the hit/miss counts since the last flush to the meta table."""
+        with self._lock:
+            if not (self.hits or self.misses):
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO meta (key, value) VALUES (?, ?)"
+                        " ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value",
+                        [("hits", self.hits), ("misses", self.misses)])
+            except sqlite3.Error:
+                pass # Read-only, locked or damaged database: the counts are only statistics
+            self.hits = self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def clear(self):
+        """
+        Removes every site and row, and the hit/miss counts.
+
+        Returns:
+            int: The number of rows removed.
+        """
+        with self._lock:
+            removed = self.row_count()
+            with self._conn:
+                self._conn.execute("DELETE FROM sun_times")
+                self._conn.execute("DELETE FROM sites")
+                self._conn.execute("DELETE FROM meta WHERE key IN ('hits', 'misses')")
+            self._site_ids.clear()
+            self.hits = self.misses = 0
+            return removed
+
+    def site_id(self, site, create=True):
+        """Returns the row id of a Site, adding it on first use; None for an unknown site if create is False."""
+        key = site.__reduce__()[1]
+        with self._lock:
+            site_id = self._site_ids.get(key)
+            if site_id is not None:
+                return site_id
+            found = self._conn.execute(
+                "SELECT id FROM sites WHERE latitude = ? AND longitude = ? AND timezone = ? AND elevation = ?"
+                " AND precision = ? AND pressure_hpa = ? AND temperature_c = ?", key).fetchone()
+            if found is None:
+                if not create:
+                    return None
+                with self._conn:
+                    found = (self._conn.execute(
+                        "INSERT INTO sites (latitude, longitude, timezone, elevation, precision, pressure_hpa,"
+                        " temperature_c) VALUES (?, ?, ?, ?, ?, ?, ?)", key).lastrowid,)
+            self._site_ids[key] = found[0]
+            return found[0]
+
+    def sites(self):
+        """All Sites in the store."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT latitude, longitude, timezone, elevation, precision, pressure_hpa, temperature_c"
+                " FROM sites ORDER BY id").fetchall()
+        return [Site(*row) for row in rows]
+
+    def put(self, site, items):
+        """
+        Stores (date, SunTimes) pairs of a site, replacing existing rows.
+
+        Returns:
+            int: The number of rows written.
+        """
+        with self._lock:
+            site_id = self.site_id(site)
+            written = 0
+            batch = []
+            with self._conn:
+                for date_obj, sun_times in items:
+                    batch.append(_encode_row(site_id, date_obj, sun_times))
+                    if len(batch) >= BATCH_SIZE:
+                        self._write(batch)
+                        written += len(batch)
+                        batch = []
+                if batch:
+                    self._write(batch)
+                    written += len(batch)
+            return written
+
+    def _write(self, rows):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sun_times (site_id, day, rises, sets, noon, length, flags)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def range(self, site, start_date, end_date):
+        """
+        Returns the stored (date, SunTimes) pairs from start_date to end_date (inclusive), by date.
+        Reading never writes: a site that is not in the store has no rows.
+        """
+        with self._lock:
+            site_id = self.site_id(site, create=False)
+            if site_id is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT day, rises, sets, noon, length, flags FROM sun_times"
+                " WHERE site_id = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (site_id, start_date.toordinal(), end_date.toordinal())).fetchall()
+        return [_decode_row(row, site.timezone) for row in rows]
+
+    def get(self, site, date_obj):
+        """Returns the stored SunTimes of one date, or None."""
+        found = self.range(site, date_obj, date_obj)
+        return found[0][1] if found else None
+
+    def get_or_compute_range(self, site, start_date, end_date, batched=None):
+        """
+        Returns (date, SunTimes) for every date from start_date to end_date (inclusive),
+        reading stored rows and computing (and storing) only the missing dates.
+
+        The missing dates are computed in one Site.compute_range() call over the
+        span from the first to the last of them (see Site.batches for `batched`).
+
+        Raises:
+            StoreError: If the stored rows cannot be read (e.g. a damaged file).
+                Failing to store the computed rows is not an error.
+        """
+        try:
+            stored = dict(self.range(site, start_date, end_date))
+        except sqlite3.Error as e:
+            raise StoreError(f"Cannot read sun times store {self.path}: {e}")
+        days = [start_date + datetime.timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        missing = [day for day in days if day not in stored]
+        computed = []
+        if missing:
+            computed = [
+                (day, sun_times)
+                for day, sun_times in site.compute_range(missing[0], missing[-1], batched)
+                if day not in stored
+            ]
+        with self._lock:
+            self.hits += len(stored)
+            self.misses += len(computed)
+        if computed:
+            try:
+                self.put(site, computed)
+            except sqlite3.Error:
+                pass # Read-only, locked or damaged database: the computed values are still correct
+            stored.update(computed)
+        return [(day, stored[day]) for day in days]
+
+    def row_count(self):
+        """Number of stored site-days."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sun_times").fetchone()[0]
+
+
+def store_stats(path, versions=None):
+    """
+    Returns NamespaceStats of the store at path, as listed by `daylight cache stats`,
+    or None if there is no store there.
+
+    The database is opened read-only, so a stale store is reported, not emptied.
+    Rows carry no timestamps, so the ages are None.
+
+    Raises:
+        StoreError: If the file is not a readable store.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            recorded = dict(conn.execute("SELECT key, value FROM meta"))
+            (rows,) = conn.execute("SELECT COUNT(*) FROM sun_times").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        raise StoreError(f"Cannot read sun times store {path}: {e}")
+    expected = _expected_meta(namespace_versions("store", versions))
+    size_bytes = sum(p.stat().st_size for p in (path, Path(f"{path}-wal")) if p.exists())
+    return NamespaceStats(
+        "store",
+        rows,
+        size_bytes,
+        int(recorded.get("hits", 0)),
+        int(recorded.get("misses", 0)),
+        None,
+        None,
+        all(recorded.get(key) == value for key, value in expected.items()),
+    )
+
+
+def prune_store(path, versions=None):
+    """
+    Empties the store at path if it was filled by other library versions.
+
+    Current rows are kept whatever their age: they are the history the store is for.
+
+    Returns:
+        int: The number of rows removed.
+    """
+    stats = store_stats(path, versions)
+    if stats is None or stats.current:
+        return 0
+    with SunTimesStore(path, versions): # Opening a stale store empties it
+        pass
+    return stats.entries
+
+
+def clear_store(path):
+    """
+    Removes every row of the store at path, if there is one.
+
+    Returns:
+        int: The number of rows removed.
+    """
+    stats = store_stats(path)
+    if stats is None:
+        return 0
+    with SunTimesStore(path) as store:
+        store.clear()
+    return stats.entries # Counted first: opening a stale store already empties it
+
+
+if __name__ == '__main__':
+    # Example Usage
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with SunTimesStore(os.path.join(tmpdir, "sun_times.sqlite")) as example_store:
+            seoul = Site(37.5665, 126.978, "Asia/Seoul")
+            year = example_store.get_or_compute_range(seoul, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+            print(example_store, example_store.row_count(), "rows")
+            print(year[171])
@@ -0,0 +1,144 @@
+"""
+Lock-striped LRU caches shared between threads.
+
+The calculation and view modules keep a few process-wide caches (zone
+indexes, yearly indexes, timeline parts, grid corners). A multithreaded
+server calls into them from many threads at once. functools.lru_cache is
+thread-safe, but as one lock per cache (on free-threaded CPython 3.13t, one
+critical section), so every lookup contends with every other. Here keys are
+spread over independent LRU segments, each with its own lock, so threads
+only wait for each other when their keys land in the same stripe.
+
+Values are computed outside the lock. Two threads missing the same key at
+the same time may both compute it; the first result stored wins and both
+callers get that object, so a cached value is never replaced once shared.
+"""
+import collections
+import functools
+import threading
+
+# Independent segments per cache; a power of two a little above typical core counts
+DEFAULT_STRIPES = 16
+
+# Fewest entries a stripe may hold, so that small caches are not split into direct-mapped slots
+MIN_STRIPE_SIZE = 8
+
+
+class _Stripe:
+    __slots__ = ("lock", "entries", "hits", "misses")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+class StripedCache:
+    """
+    A thread-safe LRU mapping split into segments, each with its own lock.
+
+    The number of stripes is `stripes`, capped at maxsize // MIN_STRIPE_SIZE
+    (at least one): a cache of 8 to 15 entries is a single LRU, one of 64 has
+    at most 8 stripes. Each stripe holds up to ceil(maxsize / self.stripes)
+    entries and evicts its own least recently used entry, so the cache holds
+    at most about `maxsize` entries, but keys hashing to the same stripe
+    compete for that stripe's share only. Keys must be hashable.
+    """
+
+    def __init__(self, maxsize=128, stripes=DEFAULT_STRIPES):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.stripes = max(1, min(stripes, maxsize // MIN_STRIPE_SIZE))
+        self._stripe_size = -(-maxsize // self.stripes)
+        self._stripes = tuple(_Stripe() for _ in range(self.stripes))
+
+    def __repr__(self):
+        return (f"StripedCache(maxsize={self.maxsize}, stripes={self.stripes}, size={len(self)}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+    def __len__(self):
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def _stripe(self, key):
+        return self._stripes[hash(key) % self.stripes]
+
+    @property
+    def hits(self):
+        return sum(stripe.hits for stripe in self._stripes)
+
+    @property
+    def misses(self):
+        return sum(stripe.misses for stripe in self._stripes)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, calling compute() and storing its result on a miss.
+
+        compute() runs without any lock held; exceptions propagate and nothing is stored.
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            try:
+                value = stripe.entries[key]
+            except KeyError:
+                stripe.misses += 1
+            else:
+                stripe.hits += 1
+                stripe.entries.move_to_end(key)
+                return value
+
+        value = compute()
+
+        with stripe.lock:
+            if key in stripe.entries:
+                stripe.entries.move_to_end(key)
+                return stripe.entries[key] # Another thread stored it first
+            stripe.entries[key] = value
+            if len(stripe.entries) > self._stripe_size:
+                stripe.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drops every entry and resets the hit/miss counters."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.hits = 0
+                stripe.misses = 0
+
+
+def striped_lru_cache(maxsize=128, stripes=DEFAULT_STRIPES):
+    """
+    Decorator like functools.lru_cache(maxsize), backed by a StripedCache.
+
+    Arguments are the key, so they must be hashable; keyword arguments are part of
+    the key too. The wrapper exposes `cache` and `cache_clear()`.
+    """
+    def decorator(function):
+        cache = StripedCache(maxsize, stripes)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = args + tuple(sorted(kwargs.items())) if kwargs else args
+            return cache.get_or_compute(key, lambda: function(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+if __name__ == '__main__':
+    # Example Usage
+    from concurrent.futures import ThreadPoolExecutor
+
+    @striped_lru_cache(maxsize=64)
+    def square(n):
+        return n * n
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        total = sum(pool.map(square, [i % 100 for i in range(10_000)]))
+    print(total, square.cache)
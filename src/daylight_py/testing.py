@@ -0,0 +1,105 @@
+"""
+Test support: a local stand-in for ipinfo.io.
+
+Used by the test suite and benchmarks/load_test.py, and shipped with the
+package so the load test does not depend on the tests. Point
+ipinfo.IPINFO_URL (or DAYLIGHT_IPINFO_URL for subprocesses) at a running
+server's `url` to exercise fetch_ip_info over real HTTP. Standard library only.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Locations handed out by the fake server, round robin
+FAKE_LOCATIONS = [
+    ("51.5074,-0.1278", "Europe/London"),
+    ("37.5665,126.9780", "Asia/Seoul"),
+    ("40.7128,-74.0060", "America/New_York"),
+    ("-33.8688,151.2093", "Australia/Sydney"),
+    ("69.6492,18.9553", "Europe/Oslo"),
+]
+
+
+class FakeIPInfoServer:
+    """
+    Local HTTP server answering like ipinfo.io's /json endpoint.
+
+    Every response waits latency ± jitter seconds; a fraction error_rate of
+    them are HTTP 503 instead. Use as a context manager, then read `url`.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.served = 0
+        self.failed = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    def __repr__(self):
+        return (f"FakeIPInfoServer(url={self.url}, latency={self.latency}, jitter={self.jitter}, "
+                f"error_rate={self.error_rate}, served={self.served}, failed={self.failed})")
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/json?inc=ip,loc,timezone"
+
+    def _next_reply(self):
+        """Returns (delay, status, body) for the next request."""
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            failing = self._random.random() < self.error_rate
+            number = self.served + self.failed
+            if failing:
+                self.failed += 1
+            else:
+                self.served += 1
+        if failing:
+            return delay, 503, {"error": "injected failure"}
+        loc, timezone = FAKE_LOCATIONS[number % len(FAKE_LOCATIONS)]
+        return delay, 200, {"ip": f"203.0.113.{number % 254 + 1}", "loc": loc, "timezone": timezone}
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                delay, status, body = fake._next_reply()
+                time.sleep(delay)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass # Keep the report readable
+
+        return Handler
+
+
+if __name__ == '__main__':
+    # Example Usage
+    import urllib.request
+    with FakeIPInfoServer(latency=0.05) as example_server:
+        with urllib.request.urlopen(example_server.url) as response:
+            print(json.load(response))
+        print(example_server)
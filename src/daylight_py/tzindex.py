@@ -0,0 +1,112 @@
+"""
+Precomputed UTC offset tables for converting many UTC instants to local time.
+
+A ZoneIndex holds the offset transitions of one pytz zone for a span of years
+as NumPy arrays, so a whole array of UTC epoch seconds is localized with one
+searchsorted and an add. The lookup is the same one pytz's fromutc() does
+(last transition at or before the instant), and localized datetimes carry the
+very same pytz tzinfo instances, so results equal dt.astimezone(zone) -
+including DST flag and abbreviation inside overlaps.
+"""
+import datetime
+
+import numpy as np
+import pytz
+
+from .striped import striped_lru_cache
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _epoch_seconds(naive_utc):
+    return (naive_utc - _EPOCH) // datetime.timedelta(seconds=1)
+
+
+class ZoneIndex:
+    """UTC offset transitions of a pytz zone between start_year and end_year (inclusive)."""
+
+    def __init__(self, timezone_pytz, start_year, end_year):
+        self.timezone = timezone_pytz
+        self.start_year = start_year
+        self.end_year = end_year
+        # Instants covered by the table, as epoch seconds [start, end)
+        self.start = _epoch_seconds(datetime.datetime(start_year, 1, 1)) - 86400
+        self.end = _epoch_seconds(datetime.datetime(end_year + 1, 1, 1)) + 86400
+
+        transition_times = getattr(timezone_pytz, "_utc_transition_times", None)
+        if transition_times:
+            # DstTzInfo: keep the transition in force at `start` and every one after it up to `end`
+            epochs = [_epoch_seconds(t) if t.year > 1 else -(2**62) for t in transition_times]
+            first = max(0, int(np.searchsorted(epochs, self.start, side="right")) - 1)
+            last = int(np.searchsorted(epochs, self.end, side="right"))
+            infos = timezone_pytz._transition_info[first:last]
+            self.transitions = np.array(epochs[first:last], dtype=np.int64)
+            self.offsets = np.array([info[0] // datetime.timedelta(seconds=1) for info in infos], dtype=np.int64)
+            self.tzinfos = [timezone_pytz._tzinfos[info] for info in infos]
+        else:
+            # UTC and fixed-offset zones
+            offset = timezone_pytz.utcoffset(datetime.datetime(start_year, 1, 1))
+            self.transitions = np.array([-(2**62)], dtype=np.int64)
+            self.offsets = np.array([offset // datetime.timedelta(seconds=1)], dtype=np.int64)
+            self.tzinfos = [timezone_pytz]
+
+    def __repr__(self):
+        return f"ZoneIndex(timezone={self.timezone}, years={self.start_year}-{self.end_year}, transitions={len(self.transitions)})"
+
+    def segments(self, epochs):
+        """Returns, for each UTC epoch second, the index of the offset segment in force."""
+        epochs = np.asarray(epochs)
+        finite = epochs[np.isfinite(epochs)] if epochs.dtype.kind == "f" else epochs
+        if finite.size and (finite.min() < self.start or finite.max() >= self.end):
+            raise ValueError(
+                f"Instants outside the indexed years {self.start_year}-{self.end_year} for {self.timezone}"
+            )
+        return np.searchsorted(self.transitions, epochs, side="right") - 1
+
+    def utc_offsets(self, epochs):
+        """UTC offsets in seconds for an array of UTC epoch seconds."""
+        return self.offsets[self.segments(epochs)]
+
+    def local_seconds(self, epochs):
+        """Local wall-clock time, as seconds since 1970-01-01 00:00 local, for UTC epoch seconds."""
+        epochs = np.asarray(epochs)
+        return epochs + self.offsets[self.segments(epochs)]
+
+    def localize(self, epochs):
+        """
+        Converts UTC epoch seconds to aware local datetimes, equal to astimezone(zone).
+        NaN entries (missing events) become None.
+        """
+        epochs = np.asarray(epochs, dtype=np.float64)
+        missing = np.isnan(epochs)
+        safe = np.where(missing, self.start, epochs)
+        segments = self.segments(safe)
+        # Whole microseconds, so float epochs from datetime.timestamp() round-trip exactly
+        local_us = np.round(safe * 1_000_000).astype(np.int64) + self.offsets[segments] * 1_000_000
+        one_us = datetime.timedelta(microseconds=1)
+        tzinfos = self.tzinfos
+        return [
+            None if is_missing else (_EPOCH + int(us) * one_us).replace(tzinfo=tzinfos[segment])
+            for us, segment, is_missing in zip(local_us.tolist(), segments.tolist(), missing.tolist())
+        ]
+
+
+@striped_lru_cache(maxsize=128)
+def _get_zone_index(timezone_pytz, start_year, end_year):
+    return ZoneIndex(timezone_pytz, start_year, end_year)
+
+
+def get_zone_index(timezone_pytz, start_year, end_year=None):
+    """
+    Returns a cached ZoneIndex for a pytz zone covering start_year..end_year (safe to call from any thread).
+
+    The cache is keyed on the zone object, not its name: pytz hands out one
+    instance per zone name and per fixed offset, and pytz.FixedOffset zones
+    have no name (their .zone is None).
+    """
+    return _get_zone_index(timezone_pytz, start_year, end_year if end_year is not None else start_year)
+
+
+def to_epoch_seconds(dt_objs):
+    """Converts aware datetimes (or None) to a float64 array of UTC epoch seconds (NaN for None)."""
+    return np.array([dt.timestamp() if dt is not None else np.nan for dt in dt_objs], dtype=np.float64)
@@ -0,0 +1,209 @@
+"""
+Offline coordinate -> IANA timezone lookup from a local boundary dataset.
+
+The dataset is a GeoJSON FeatureCollection whose features carry a `tzid`
+property, such as the releases of timezone-boundary-builder
+(https://github.com/evansiroky/timezone-boundary-builder). It is looked up at
+DAYLIGHT_TZ_BOUNDARIES, or at daylight/timezones.geojson under
+$XDG_DATA_HOME (default ~/.local/share).
+
+Polygons are bucketed into a grid of 1 degree cells by bounding box, so a
+lookup only runs point-in-polygon tests on the few polygons overlapping the
+point's cell.
+
+Real datasets are over 100 MB of GeoJSON, far too slow to parse on every
+run. The compiled index (flat NumPy arrays of points, rings, polygons and
+buckets) is therefore kept in the "tzindex" cache namespace, keyed by the
+dataset's path, size and modification time. Only the first run after the
+dataset changes pays for the parse; later runs unpickle a few arrays.
+"""
+import json
+import math
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .cache import DiskCache
+
+BUCKET_DEGREES = 1.0
+
+# Bump when the compiled index layout changes
+INDEX_FORMAT = 1
+
+# Bucket (row, column) pairs are stored as row * _BUCKET_ROW + column
+_BUCKET_ROW = 1 << 32
+
+
+class TimezoneLookupError(Exception):
+    """Custom exception for boundary dataset errors."""
+    pass
+
+
+def default_dataset_path():
+    """Returns where the boundary dataset is expected, honouring DAYLIGHT_TZ_BOUNDARIES."""
+    configured = os.environ.get("DAYLIGHT_TZ_BOUNDARIES")
+    if configured:
+        return Path(configured)
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "daylight" / "timezones.geojson"
+
+
+def _point_in_ring(lon, lat, points):
+    """Even-odd ray casting test of a point against one closed ring, an (n, 2) array of lon, lat."""
+    x2, y2 = points[:, 0], points[:, 1]
+    x1, y1 = np.roll(x2, 1), np.roll(y2, 1) # Each vertex paired with the one before it
+    crossing = (y2 > lat) != (y1 > lat)
+    with np.errstate(divide="ignore", invalid="ignore"): # Horizontal edges never cross
+        edge_lon = (x1 - x2) * (lat - y2) / (y1 - y2) + x2
+    return np.count_nonzero(crossing & (lon < edge_lon)) % 2 == 1
+
+
+def _bucket_key(i, j):
+    return i * _BUCKET_ROW + j
+
+
+class TimezoneIndex:
+    """
+    Grid-bucketed polygons of a timezone boundary dataset, as flat arrays.
+
+    Polygon p belongs to zone tzids[polygon_zones[p]] and has rings
+    polygon_rings[p]:polygon_rings[p + 1] (the first is the outer boundary, the
+    rest are holes); ring r has points ring_points[r]:ring_points[r + 1].
+    """
+
+    def __init__(self, features):
+        tzids = {}
+        zones, bboxes, polygon_rings, ring_points, points = [], [], [0], [0], []
+        buckets = {}
+
+        for feature in features:
+            tzid = (feature.get("properties") or {}).get("tzid")
+            geometry = feature.get("geometry") or {}
+            if not tzid:
+                continue
+            if geometry.get("type") == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                continue
+            for rings in polygons:
+                if not rings or not rings[0]:
+                    continue
+                outer = np.asarray(rings[0], dtype=np.float64)[:, :2]
+                min_lon, min_lat = outer.min(axis=0)
+                max_lon, max_lat = outer.max(axis=0)
+                index = len(zones)
+                zones.append(tzids.setdefault(tzid, len(tzids)))
+                bboxes.append((min_lon, min_lat, max_lon, max_lat))
+                for ring in rings:
+                    ring = np.asarray(ring, dtype=np.float64)[:, :2]
+                    points.append(ring)
+                    ring_points.append(ring_points[-1] + len(ring))
+                polygon_rings.append(polygon_rings[-1] + len(rings))
+                for i in range(math.floor(min_lat / BUCKET_DEGREES), math.floor(max_lat / BUCKET_DEGREES) + 1):
+                    for j in range(math.floor(min_lon / BUCKET_DEGREES), math.floor(max_lon / BUCKET_DEGREES) + 1):
+                        buckets.setdefault(_bucket_key(i, j), []).append(index)
+
+        self.tzids = list(tzids)
+        self.polygon_zones = np.array(zones, dtype=np.int32)
+        self.bboxes = np.array(bboxes, dtype=np.float64).reshape(-1, 4)
+        self.polygon_rings = np.array(polygon_rings, dtype=np.int64)
+        self.ring_points = np.array(ring_points, dtype=np.int64)
+        self.points = np.concatenate(points) if points else np.empty((0, 2), dtype=np.float64)
+        keys = sorted(buckets)
+        self.bucket_keys = np.array(keys, dtype=np.int64)
+        self.bucket_offsets = np.cumsum([0] + [len(buckets[key]) for key in keys], dtype=np.int64)
+        self.bucket_polygons = np.array([index for key in keys for index in buckets[key]], dtype=np.int32)
+
+    def __repr__(self):
+        return f"TimezoneIndex(zones={len(self.tzids)}, polygons={len(self.polygon_zones)}, points={len(self.points)})"
+
+    @classmethod
+    def from_file(cls, path):
+        """Parses a GeoJSON boundary dataset."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise TimezoneLookupError(f"Could not load timezone boundaries from {path}: {e}")
+        return cls(data.get("features", []))
+
+    @classmethod
+    def load(cls, path, directory=None):
+        """
+        Returns the index of a dataset from the "tzindex" cache (under `directory`,
+        default the cache directory), parsing and caching it if it is not there.
+        Without a usable cache the dataset is parsed directly.
+        """
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError as e:
+            raise TimezoneLookupError(f"Could not load timezone boundaries from {path}: {e}")
+        parts = (INDEX_FORMAT, str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        try:
+            cache = DiskCache("tzindex", directory)
+            index = cache.get(*parts)
+        except OSError:
+            return cls.from_file(path)
+        if not isinstance(index, cls):
+            index = cls.from_file(path)
+            try:
+                cache.set(index, *parts)
+            except OSError:
+                pass
+        return index
+
+    def _contains(self, polygon, longitude, latitude):
+        first, last = self.polygon_rings[polygon], self.polygon_rings[polygon + 1]
+        for ring in range(first, last):
+            inside = _point_in_ring(longitude, latitude, self.points[self.ring_points[ring]:self.ring_points[ring + 1]])
+            if inside != (ring == first): # Outside the boundary, or inside a hole
+                return False
+        return True
+
+    def lookup(self, latitude, longitude):
+        """Returns the IANA zone name containing the point, or None if no polygon does."""
+        key = _bucket_key(math.floor(latitude / BUCKET_DEGREES), math.floor(longitude / BUCKET_DEGREES))
+        position = np.searchsorted(self.bucket_keys, key)
+        if position == len(self.bucket_keys) or self.bucket_keys[position] != key:
+            return None
+        for polygon in self.bucket_polygons[self.bucket_offsets[position]:self.bucket_offsets[position + 1]].tolist():
+            min_lon, min_lat, max_lon, max_lat = self.bboxes[polygon]
+            if min_lon <= longitude <= max_lon and min_lat <= latitude <= max_lat:
+                if self._contains(polygon, longitude, latitude):
+                    return self.tzids[self.polygon_zones[polygon]]
+        return None
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def find_timezone(latitude, longitude, path=None):
+    """
+    Returns the IANA timezone name for a coordinate using the local boundary dataset,
+    or None when no dataset is installed or the point is not covered by it.
+
+    The default dataset is loaded once per process, by whichever thread asks first,
+    through the compiled-index cache (see TimezoneIndex.load).
+
+    Raises:
+        TimezoneLookupError: If the dataset exists but cannot be read.
+    """
+    global _default_index
+    if path is not None:
+        return TimezoneIndex.from_file(path).lookup(latitude, longitude)
+    index = _default_index
+    if index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                dataset = default_dataset_path()
+                if not dataset.exists():
+                    return None
+                _default_index = TimezoneIndex.load(dataset)
+            index = _default_index
+    return index.lookup(latitude, longitude)
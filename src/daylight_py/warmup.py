@@ -0,0 +1,225 @@
+"""
+Registered sites and the warm-up job that precomputes them before midnight.
+
+At local midnight every cached "today" of a site turns into a miss at once.
+The warm-up job computes the next days of each registered site into the
+sun times store shortly before that happens, so requests after midnight are
+served from the store. Each job is one batched Site.range() call (one NOAA
+array kernel call per site), and only the days missing from the store are
+computed.
+
+The store is the only layer this fills. The on-disk DiskCache holds no sun
+times (only locations and the timezone index), and the rendered outputs of
+`daylight daemon` live in that process's memory, where another process
+cannot warm them; a daemon started with DAYLIGHT_STORE does not read the
+store either, so it pays for the first request of each day itself.
+
+Sites are registered in a CSV file (name,latitude,longitude,timezone[,elevation],
+as read by `daylight query --sites`) at DAYLIGHT_SITES, or daylight/sites.csv
+under $XDG_CONFIG_HOME (default ~/.config).
+
+Sites whose local midnight falls at the same instant (one zone, or zones
+with the same offset) are spread over the first part of the lead window
+instead of being computed together, and zones with different offsets reach
+midnight at different hours anyway, so the load is spread over the day.
+"""
+import datetime
+import heapq
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .clock import default_clock, next_local_midnight
+from .query import QueryError, read_sites
+
+# Days computed per site from the coming local date on
+DEFAULT_DAYS = 7
+
+# How long before local midnight a site's warm-up may start
+DEFAULT_LEAD = datetime.timedelta(minutes=30)
+
+# Sites sharing a midnight are spread over this fraction of the lead window,
+# leaving the rest as a margin for the computation itself
+STAGGER_FRACTION = 0.5
+
+# Never sleep longer than this in one go, so suspend/resume or clock changes
+# are noticed within a minute.
+MAX_SLEEP_SECONDS = 60
+
+REGISTRY_HEADER = "name,latitude,longitude,timezone,elevation"
+
+
+class WarmupError(Exception):
+    """Custom exception for registry and warm-up errors."""
+    pass
+
+
+def default_registry_path():
+    """Returns the site registry path, honouring DAYLIGHT_SITES and XDG_CONFIG_HOME."""
+    configured = os.environ.get("DAYLIGHT_SITES")
+    if configured:
+        return Path(configured)
+    config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(config_home) / "daylight" / "sites.csv"
+
+
+class SiteRegistry:
+    """Named sites kept in a CSV file."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else default_registry_path()
+        self.sites = [] # (name, Site) tuples
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.sites = read_sites(f)
+            except (OSError, QueryError) as e:
+                raise WarmupError(f"Cannot read site registry {self.path}: {e}")
+
+    def __repr__(self):
+        return f"SiteRegistry(path={self.path}, sites={len(self.sites)})"
+
+    def add(self, name, site):
+        """Registers a site, replacing one with the same name."""
+        if "," in name or not name.strip():
+            raise WarmupError(f"Invalid site name: {name!r}")
+        self.remove(name)
+        self.sites.append((name, site))
+
+    def remove(self, name):
+        """Unregisters a site. Returns True if it was registered."""
+        count = len(self.sites)
+        self.sites = [(existing, site) for existing, site in self.sites if existing != name]
+        return len(self.sites) != count
+
+    def save(self):
+        """Writes the registry (atomically)."""
+        lines = [REGISTRY_HEADER]
+        for name, site in self.sites:
+            lines.append(f"{name},{site.latitude},{site.longitude},{site.timezone.zone},{site.elevation}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+
+class WarmupJob:
+    """Computing `days` days of one site from start_date, due at `due` (before `midnight`)."""
+
+    def __init__(self, due, midnight, name, site, start_date, days):
+        self.due = due
+        self.midnight = midnight
+        self.name = name
+        self.site = site
+        self.start_date = start_date
+        self.days = days
+
+    def __repr__(self):
+        return (f"WarmupJob(due={self.due.isoformat()}, name={self.name}, start_date={self.start_date}, "
+                f"days={self.days})")
+
+    @property
+    def end_date(self):
+        return self.start_date + datetime.timedelta(days=self.days - 1)
+
+    def next(self):
+        """The same site's job for the following midnight, keeping its place in the stagger."""
+        midnight = next_local_midnight(self.midnight, self.site.timezone)
+        return WarmupJob(midnight - (self.midnight - self.due), midnight, self.name, self.site,
+                         midnight.astimezone(self.site.timezone).date(), self.days)
+
+
+def plan_warmup(sites, now, days=DEFAULT_DAYS, lead=DEFAULT_LEAD):
+    """
+    Returns one WarmupJob per (name, Site) for its next local midnight after `now`, sorted by due time.
+
+    Sites with the same midnight instant are spread evenly over the first
+    STAGGER_FRACTION of the lead window, in registry order.
+    """
+    by_midnight = {}
+    for name, site in sites:
+        by_midnight.setdefault(next_local_midnight(now, site.timezone), []).append((name, site))
+
+    jobs = []
+    for midnight, group in by_midnight.items():
+        step = lead * STAGGER_FRACTION / len(group)
+        for i, (name, site) in enumerate(group):
+            jobs.append(WarmupJob(midnight - lead + step * i, midnight, name, site,
+                                  midnight.astimezone(site.timezone).date(), days))
+    jobs.sort(key=lambda job: job.due)
+    return jobs
+
+
+class WarmupScheduler:
+    """
+    Runs warm-up jobs against a store.SunTimesStore at their due times.
+
+    `clock` defaults to the process-wide clock and `sleep` to time.sleep, so
+    tests can drive a FrozenClock with its advance() method.
+    """
+
+    def __init__(self, sites, store, days=DEFAULT_DAYS, lead=DEFAULT_LEAD, clock=None, sleep=time.sleep, out=None):
+        self.sites = sites
+        self.store = store
+        self.days = days
+        self.lead = lead
+        self.clock = clock if clock is not None else default_clock()
+        self.sleep = sleep
+        self.out = out if out is not None else sys.stderr
+
+    def __repr__(self):
+        return f"WarmupScheduler(sites={len(self.sites)}, store={self.store!r}, days={self.days}, lead={self.lead})"
+
+    def _warm(self, site, start_date, end_date):
+        before = self.store.row_count()
+        self.store.get_or_compute_range(site, start_date, end_date, batched=True)
+        return self.store.row_count() - before
+
+    def warm_now(self):
+        """Computes the current and following days of every site. Returns the number of new rows."""
+        added = 0
+        for _, site in self.sites:
+            today = self.clock.today(site.timezone)
+            added += self._warm(site, today, today + datetime.timedelta(days=self.days - 1))
+        return added
+
+    def wait_until(self, target):
+        while True:
+            remaining = (target - self.clock.now()).total_seconds()
+            if remaining <= 0:
+                return
+            self.sleep(min(remaining, MAX_SLEEP_SECONDS))
+
+    def run(self, max_jobs=None):
+        """Runs jobs in due order, scheduling each site again for its next midnight. Runs forever by default."""
+        queue = [(job.due, i, job) for i, job in enumerate(plan_warmup(self.sites, self.clock.now(), self.days, self.lead))]
+        heapq.heapify(queue)
+        sequence = len(queue)
+        done = 0
+        while queue and (max_jobs is None or done < max_jobs):
+            _, _, job = heapq.heappop(queue)
+            self.wait_until(job.due)
+            added = self._warm(job.site, job.start_date, job.end_date)
+            print(f"{self.clock.now().isoformat(timespec='seconds')} warmed {job.name}: "
+                  f"{job.start_date}..{job.end_date} ({added} new)", file=self.out, flush=True)
+            following = job.next()
+            heapq.heappush(queue, (following.due, sequence, following))
+            sequence += 1
+            done += 1
+        return done
+
+
+if __name__ == '__main__':
+    # Example Usage
+    from .calculations import Site
+    example_sites = [
+        ("seoul", Site(37.5665, 126.978, "Asia/Seoul")),
+        ("tokyo", Site(35.6762, 139.6503, "Asia/Tokyo")),
+        ("london", Site(51.5074, -0.1278, "Europe/London")),
+        ("lisbon", Site(38.7223, -9.1393, "Europe/Lisbon")),
+    ]
+    for example_job in plan_warmup(example_sites, default_clock().now()):
+        print(example_job)
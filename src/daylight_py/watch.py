@@ -0,0 +1,161 @@
+import bisect
+import datetime
+import sys
+import time
+
+import pytz
+
+from .calculations import Site, SunTimes
+from .clock import ClockError, default_clock, next_local_midnight
+
+# Never sleep longer than this in one go, so suspend/resume or clock changes
+# are noticed within a minute.
+MAX_SLEEP_SECONDS = 60
+
+# How far ahead, and in what steps, next_dst_change scans zones whose transitions it cannot read
+DST_SCAN_HORIZON = datetime.timedelta(days=366)
+DST_SCAN_STEP = datetime.timedelta(hours=6)
+
+
+def next_dst_change(now, timezone_pytz):
+    """
+    Returns the next UTC offset change of the zone after `now`, or None if there is none.
+
+    pytz's DstTzInfo zones keep their transitions in `_utc_transition_times`,
+    which is bisected when present. It is private to pytz, so zones without it
+    (static pytz zones, or any other tzinfo such as zoneinfo's) are scanned with
+    the public utcoffset() instead (see scan_offset_change).
+    """
+    transitions = getattr(timezone_pytz, "_utc_transition_times", None)
+    if not isinstance(transitions, list):
+        return scan_offset_change(now, timezone_pytz)
+    if not transitions:
+        return None
+    now_utc = now.astimezone(pytz.utc).replace(tzinfo=None)
+    i = bisect.bisect_right(transitions, now_utc)
+    if i >= len(transitions):
+        return None
+    return pytz.utc.localize(transitions[i])
+
+
+def scan_offset_change(now, timezone_pytz, horizon=DST_SCAN_HORIZON, step=DST_SCAN_STEP):
+    """
+    Finds the next UTC offset change after `now` by stepping through the zone,
+    then bisecting to the second. Returns None if the offset stays the same
+    within `horizon`; the watcher wakes at every midnight anyway, so a later
+    change is found on a later day. Changes less than `step` apart may be missed.
+    """
+    base = now.astimezone(pytz.utc).replace(microsecond=0)
+    offset = base.astimezone(timezone_pytz).utcoffset()
+    step_seconds = int(step.total_seconds())
+    for _ in range(int(horizon / step)):
+        if (base + step).astimezone(timezone_pytz).utcoffset() != offset:
+            low, high = 0, step_seconds
+            while high - low > 1:
+                middle = (low + high) // 2
+                if (base + datetime.timedelta(seconds=middle)).astimezone(timezone_pytz).utcoffset() == offset:
+                    low = middle
+                else:
+                    high = middle
+            return base + datetime.timedelta(seconds=high)
+        base += step
+    return None
+
+
+def next_transition(now, sun_times_today: SunTimes):
+    """
+    Returns the next moment after `now` at which the rendered output can change:
+    today's sunrise or sunset, local midnight, or a DST change.
+    """
+    timezone_pytz = sun_times_today.timezone
+    candidates = [next_local_midnight(now, timezone_pytz)]
+    dst_change = next_dst_change(now, timezone_pytz)
+    if dst_change is not None:
+        candidates.append(dst_change)
+    for event in (sun_times_today.rises, sun_times_today.sets):
+        if event is not None and event > now:
+            candidates.append(event)
+    return min(candidates)
+
+
+class Watcher:
+    """
+    Keeps today's and yesterday's SunTimes for one location and re-renders them
+    at every transition. Only the day that actually changed is recomputed.
+
+    `clock` defaults to the process-wide clock and `sleep` to time.sleep, so
+    tests can drive a FrozenClock with its advance() method.
+    """
+
+    def __init__(self, latitude, longitude, timezone_pytz, render, out=None, sleep=time.sleep, clock=None):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.timezone = timezone_pytz
+        self.site = Site(latitude, longitude, timezone_pytz)
+        self.render = render # Called as render(date, sun_times_today, sun_times_yesterday) -> str
+        self.out = out if out is not None else sys.stdout
+        self.clock = clock if clock is not None else default_clock()
+        self.sleep = sleep
+
+        self.date = None
+        self.sun_times_today = None
+        self.sun_times_yesterday = None
+        self.utcoffset = None
+
+    def _compute(self, date_obj):
+        return self.site.sun_times(date_obj)
+
+    def refresh(self, now):
+        """Brings the cached days up to date for `now`, recomputing as little as possible."""
+        local_now = now.astimezone(self.timezone)
+        today = local_now.date()
+        offset = local_now.utcoffset()
+        if today == self.date:
+            # Sunrise and sunset don't change the data; a DST change shifts today's local times
+            if offset != self.utcoffset:
+                self.sun_times_today = self._compute(today)
+        elif self.date is not None and today - self.date == datetime.timedelta(days=1):
+            # Ordinary midnight rollover: today becomes yesterday
+            self.sun_times_yesterday = self.sun_times_today
+            self.sun_times_today = self._compute(today)
+        else:
+            # First run, or the clock jumped (e.g. after a suspend)
+            series = self.site.day_length_series(today, today)
+            self.sun_times_yesterday = series.previous
+            self.sun_times_today = series.sun_times[0]
+        self.date = today
+        self.utcoffset = offset
+
+    def emit(self):
+        print(self.render(self.date, self.sun_times_today, self.sun_times_yesterday), file=self.out, flush=True)
+
+    def now(self):
+        return self.clock.now(self.timezone)
+
+    def wait_until(self, target):
+        """
+        Sleeps until the clock reaches target.
+
+        Raises:
+            ClockError: If the clock did not move while sleeping (e.g. pinned by DAYLIGHT_NOW),
+                so the target would never be reached.
+        """
+        while True:
+            before = self.now()
+            remaining = (target - before).total_seconds()
+            if remaining <= 0:
+                return
+            self.sleep(min(remaining, MAX_SLEEP_SECONDS))
+            if self.now() <= before:
+                raise ClockError(f"The clock is stopped at {before.isoformat()}; watching needs a running clock")
+
+    def run(self, max_updates=None):
+        """Emits the current output, then a new one at each transition. Runs forever by default."""
+        self.refresh(self.now())
+        self.emit()
+        updates = 0
+        while max_updates is None or updates < max_updates:
+            self.wait_until(next_transition(self.now(), self.sun_times_today))
+            self.refresh(self.now())
+            self.emit()
+            updates += 1
@@ -0,0 +1,270 @@
+"""
+Yearly daylight index: solstices, equinoxes and extreme days for a latitude.
+
+Every day of the year is evaluated with the low-precision solar coordinates
+from the Astronomical Almanac (declination good to ~1 arcminute), then each
+event is refined on the continuous function. It is plain `math`: a year is
+some 370 evaluations, less than importing NumPy would cost the views. Day length depends on
+latitude (not longitude), so results are cached per (latitude, year), in a
+lock-striped cache shared by all threads.
+"""
+import datetime
+import math
+
+import pytz
+
+from .constants import SUNRISE_ALTITUDE
+from .striped import striped_lru_cache
+
+# Latitude resolution of the cache key, in decimal places (0.01 degrees is ~1 km).
+LATITUDE_KEY_DECIMALS = 2
+
+_J2000 = datetime.datetime(2000, 1, 1, 12, 0)
+
+
+def _solar_coordinates(n):
+    """
+    Returns (declination in radians, equation of time in minutes) for the day
+    number `n` counted from J2000.0 (2000-01-01 12:00 UTC).
+    """
+    g = math.radians((357.529 + 0.98560028 * n) % 360) # Mean anomaly
+    q = (280.459 + 0.98564736 * n) % 360 # Mean longitude
+    ecliptic_longitude = math.radians(q + 1.915 * math.sin(g) + 0.020 * math.sin(2 * g))
+    obliquity = math.radians(23.439 - 0.00000036 * n)
+
+    declination = math.asin(math.sin(obliquity) * math.sin(ecliptic_longitude))
+    right_ascension = math.degrees(math.atan2(math.cos(obliquity) * math.sin(ecliptic_longitude), math.cos(ecliptic_longitude)))
+    equation_of_time = ((q - right_ascension + 180) % 360 - 180) * 4 # 4 minutes per degree
+    return declination, equation_of_time
+
+
+def _hour_angle(latitude, declination):
+    """Sunrise hour angle in degrees; 180 for polar day, 0 for polar night."""
+    phi = math.radians(latitude)
+    cos_h = (math.sin(math.radians(SUNRISE_ALTITUDE)) - math.sin(phi) * math.sin(declination)) / (
+        math.cos(phi) * math.cos(declination)
+    )
+    return math.degrees(math.acos(min(max(cos_h, -1.0), 1.0)))
+
+
+def _day_length_hours(latitude, n):
+    declination, _ = _solar_coordinates(n)
+    return 2 * _hour_angle(latitude, declination) / 15
+
+
+def _parabolic_vertex(f, x, step):
+    """Refines an extremum of f near x by fitting a parabola through x-step, x, x+step."""
+    y0, y1, y2 = f(x - step), f(x), f(x + step)
+    denominator = y0 - 2 * y1 + y2
+    if denominator == 0:
+        return x
+    return x + 0.5 * step * (y0 - y2) / denominator
+
+
+def _refine_extremum(f, x):
+    # A day-wide fit lands within an hour; a second, narrower fit within a minute or so.
+    x = _parabolic_vertex(f, x, 1.0)
+    return _parabolic_vertex(f, x, 1.0 / 24)
+
+
+def _refine_root(f, a, b, iterations=8):
+    """Secant-style (regula falsi) refinement of a sign change of f between a and b."""
+    fa, fb = f(a), f(b)
+    for _ in range(iterations):
+        if fb == fa:
+            break
+        c = b - fb * (b - a) / (fb - fa)
+        fc = f(c)
+        if (fc < 0) == (fa < 0):
+            a, fa = c, fc
+        else:
+            b, fb = c, fc
+    return b - fb * (b - a) / (fb - fa) if fb != fa else b
+
+
+def _argmax(values):
+    """Index of the first largest value, like numpy.argmax."""
+    return max(range(len(values)), key=values.__getitem__)
+
+
+def _argmin(values):
+    """Index of the first smallest value, like numpy.argmin."""
+    return min(range(len(values)), key=values.__getitem__)
+
+
+def _to_datetime(n):
+    """Converts a J2000 day number to a naive UTC datetime, rounded to the second."""
+    return _J2000 + datetime.timedelta(seconds=round(float(n) * 86400))
+
+
+class YearlyIndex:
+    """
+    Notable days of one year at one latitude.
+
+    Solstices and equinoxes are UTC datetimes. longest_day, shortest_day,
+    earliest_sunrise and latest_sunset are dates; the last two are by local
+    mean solar time, so they ignore time zone offsets and DST. Each of these
+    is None when it does not exist at the latitude (e.g. no sunrise at all
+    during polar night, or equal day lengths at the equator).
+    """
+
+    def __init__(self, latitude, year, march_equinox, june_solstice, september_equinox, december_solstice,
+                 longest_day, longest_day_hours, shortest_day, shortest_day_hours, earliest_sunrise, latest_sunset):
+        self.latitude = latitude
+        self.year = year
+        self.march_equinox = march_equinox
+        self.june_solstice = june_solstice
+        self.september_equinox = september_equinox
+        self.december_solstice = december_solstice
+        self.longest_day = longest_day
+        self.longest_day_hours = longest_day_hours
+        self.shortest_day = shortest_day
+        self.shortest_day_hours = shortest_day_hours
+        self.earliest_sunrise = earliest_sunrise
+        self.latest_sunset = latest_sunset
+
+    def __repr__(self):
+        return (f"YearlyIndex(latitude={self.latitude}, year={self.year}, longest_day={self.longest_day}, "
+                f"shortest_day={self.shortest_day}, june_solstice={self.june_solstice}, "
+                f"december_solstice={self.december_solstice})")
+
+    @property
+    def solstices(self):
+        return [self.june_solstice, self.december_solstice]
+
+    @property
+    def equinoxes(self):
+        return [self.march_equinox, self.september_equinox]
+
+
+def _year_days(year):
+    """J2000 day numbers at noon UTC of every day of a year, with one day of margin on each side."""
+    first = datetime.datetime(year, 1, 1, 12, 0)
+    days_in_year = (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days
+    start_n = (first - _J2000).days
+    # The margin lets events on Jan 1 / Dec 31 be bracketed
+    return [float(i) for i in range(start_n - 1, start_n + days_in_year + 1)], slice(1, days_in_year + 1)
+
+
+@striped_lru_cache(maxsize=64)
+def _seasons(year):
+    """
+    J2000 day numbers of the March equinox, June solstice, September equinox and
+    December solstice of a year. They do not depend on the observer, so every
+    latitude (and last_solstice/next_solstice) shares them.
+    """
+    n, inner = _year_days(year)
+    declination = [_solar_coordinates(x)[0] for x in n]
+
+    def declination_at(x):
+        return _solar_coordinates(x)[0]
+
+    # Equinoxes: sign changes of the declination
+    rising = next(i for i in range(len(n) - 1) if declination[i] <= 0 < declination[i + 1])
+    falling = next(i for i in range(len(n) - 1) if declination[i] > 0 >= declination[i + 1])
+    march_n = _refine_root(declination_at, n[rising], n[rising + 1])
+    september_n = _refine_root(declination_at, n[falling], n[falling + 1])
+
+    # Solstices: extrema of the declination
+    june_n = _refine_extremum(declination_at, n[inner][_argmax(declination[inner])])
+    december_n = _refine_extremum(declination_at, n[inner][_argmin(declination[inner])])
+    return march_n, june_n, september_n, december_n
+
+
+@striped_lru_cache(maxsize=256)
+def _build_yearly_index(latitude, year):
+    n, inner = _year_days(year)
+    declination, equation_of_time = zip(*(_solar_coordinates(x) for x in n))
+    hour_angle = [_hour_angle(latitude, d) for d in declination]
+    length_hours = [2 * h / 15 for h in hour_angle]
+    inner_lengths = length_hours[inner]
+
+    def day_of(x):
+        return _to_datetime(x).date()
+
+    march_n, june_n, september_n, december_n = _seasons(year)
+    march_equinox = _to_datetime(march_n)
+    september_equinox = _to_datetime(september_n)
+    june_solstice = _to_datetime(june_n)
+    december_solstice = _to_datetime(december_n)
+
+    # Longest/shortest day. On a plateau (polar day/night, or the equator) the solstice decides.
+    longest_day = shortest_day = None
+    longest_day_hours = max(inner_lengths)
+    shortest_day_hours = min(inner_lengths)
+    if longest_day_hours - shortest_day_hours > 1.0 / 60:
+        north = latitude >= 0
+        summer_n, winter_n = (june_n, december_n) if north else (december_n, june_n)
+        longest_n = _refine_extremum(lambda x: _day_length_hours(latitude, x), n[inner][_argmax(inner_lengths)])
+        shortest_n = _refine_extremum(lambda x: _day_length_hours(latitude, x), n[inner][_argmin(inner_lengths)])
+        if longest_day_hours >= 24:
+            longest_n = summer_n
+        if shortest_day_hours <= 0:
+            shortest_n = winter_n
+        longest_day = day_of(longest_n)
+        shortest_day = day_of(shortest_n)
+
+    # Earliest sunrise / latest sunset by local mean solar time, on days the sun rises and sets
+    has_events = [0 < h < 180 for h in hour_angle]
+    earliest_sunrise = latest_sunset = None
+    if any(has_events[inner]):
+        sunrise_minutes = [720 - 4 * h - eot if events else math.inf
+                           for h, eot, events in zip(hour_angle, equation_of_time, has_events)]
+        sunset_minutes = [720 + 4 * h - eot if events else -math.inf
+                          for h, eot, events in zip(hour_angle, equation_of_time, has_events)]
+        earliest_sunrise = day_of(n[inner][_argmin(sunrise_minutes[inner])])
+        latest_sunset = day_of(n[inner][_argmax(sunset_minutes[inner])])
+
+    return YearlyIndex(
+        latitude, year, march_equinox, june_solstice, september_equinox, december_solstice,
+        longest_day, longest_day_hours, shortest_day, shortest_day_hours, earliest_sunrise, latest_sunset,
+    )
+
+
+def get_yearly_index(latitude, year):
+    """
+    Returns the (cached) YearlyIndex for a latitude and year.
+    Latitudes are rounded to LATITUDE_KEY_DECIMALS for the cache key.
+    """
+    return _build_yearly_index(round(latitude, LATITUDE_KEY_DECIMALS), year)
+
+
+def local_date(utc_naive, timezone_pytz):
+    """Returns the local date of one of the naive UTC datetimes in a YearlyIndex."""
+    return pytz.utc.localize(utc_naive).astimezone(timezone_pytz).date()
+
+
+def solstices(year):
+    """Returns the June and December solstices of a year as naive UTC datetimes."""
+    _, june_n, _, december_n = _seasons(year)
+    return [_to_datetime(june_n), _to_datetime(december_n)]
+
+
+def equinoxes(year):
+    """Returns the March and September equinoxes of a year as naive UTC datetimes."""
+    march_n, _, september_n, _ = _seasons(year)
+    return [_to_datetime(march_n), _to_datetime(september_n)]
+
+
+def next_solstice(date_obj, timezone_pytz=pytz.utc):
+    """Returns the UTC datetime of the first solstice falling on or after date_obj in timezone_pytz."""
+    for year in (date_obj.year - 1, date_obj.year, date_obj.year + 1):
+        for solstice in solstices(year):
+            if local_date(solstice, timezone_pytz) >= date_obj:
+                return solstice
+
+
+def last_solstice(date_obj, timezone_pytz=pytz.utc):
+    """Returns the UTC datetime of the last solstice falling on or before date_obj in timezone_pytz."""
+    for year in (date_obj.year + 1, date_obj.year, date_obj.year - 1):
+        for solstice in reversed(solstices(year)):
+            if local_date(solstice, timezone_pytz) <= date_obj:
+                return solstice
+
+
+def next_equinox(date_obj, timezone_pytz=pytz.utc):
+    """Returns the UTC datetime of the first equinox falling on or after date_obj in timezone_pytz."""
+    for year in (date_obj.year - 1, date_obj.year, date_obj.year + 1):
+        for equinox in equinoxes(year):
+            if local_date(equinox, timezone_pytz) >= date_obj:
+                return equinox
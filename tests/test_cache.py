@@ -0,0 +1,95 @@
+import unittest
+import datetime
+import io
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.app import main
+from daylight_py.cache import CacheError, DiskCache, cache_stats, clear_cache, library_versions, prune_cache
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_hit_rate(self):
+        with DiskCache("tzindex", self.directory) as cache:
+            self.assertIsNone(cache.get(51.5, "2024-06-21"))
+            cache.set({"rises": "04:43"}, 51.5, "2024-06-21")
+            self.assertEqual(cache.get(51.5, "2024-06-21"), {"rises": "04:43"})
+            self.assertEqual(cache.get_or_compute(lambda: 1 / 0, 51.5, "2024-06-21"), {"rises": "04:43"})
+
+        [stats] = cache_stats(self.directory)
+        self.assertEqual((stats.namespace, stats.entries, stats.hits, stats.misses), ("tzindex", 1, 2, 1))
+        self.assertAlmostEqual(stats.hit_rate, 2 / 3)
+        self.assertTrue(stats.current)
+
+    def test_version_change_invalidates_dependent_namespaces_only(self):
+        versions = library_versions()
+        DiskCache("tzindex", self.directory, versions).set("old", "key")
+        DiskCache("location", self.directory, versions).set("home", "key")
+
+        new_tzdata = dict(versions, tzdata="2099a") # Neither namespace depends on it
+        self.assertTrue(all(stats.current for stats in cache_stats(self.directory, new_tzdata)))
+        self.assertEqual(DiskCache("location", self.directory, new_tzdata).get("key"), "home")
+
+        upgraded = dict(versions, daylight_py="99.0")
+        self.assertFalse(cache_stats(self.directory, upgraded)[1].current)
+        self.assertIsNone(DiskCache("tzindex", self.directory, upgraded).get("key"))
+        with self.assertRaises(CacheError):
+            DiskCache("sun", self.directory) # Sun times live in the SQLite store
+
+    def test_concurrent_flushes_keep_every_count(self):
+        from concurrent.futures import ThreadPoolExecutor
+        DiskCache("location", self.directory).set("home", "key")
+
+        def look_up(_):
+            for _ in range(10):
+                with DiskCache("location", self.directory) as cache:
+                    cache.get("key")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(look_up, range(8)))
+        [stats] = cache_stats(self.directory)
+        self.assertEqual((stats.hits, stats.misses), (80, 0))
+
+    def test_prune_and_clear(self):
+        cache = DiskCache("tzindex", self.directory)
+        cache.set("old", "a")
+        cache.set("new", "b")
+        old_entry = next(p for p in cache.path.iterdir() if p.read_bytes().find(b"old") >= 0)
+        month_ago = time.time() - 31 * 86400
+        os.utime(old_entry, (month_ago, month_ago))
+        (self.directory / "obsolete").mkdir()
+        (self.directory / "obsolete" / "x.pickle").write_bytes(b"")
+
+        self.assertEqual(prune_cache(datetime.timedelta(days=30), self.directory), 2)
+        self.assertEqual([s.namespace for s in cache_stats(self.directory)], ["tzindex"])
+        self.assertEqual(cache.get("b"), "new")
+        self.assertEqual(clear_cache(self.directory), 1)
+        self.assertEqual(cache_stats(self.directory), [])
+
+    def test_cache_subcommand(self):
+        DiskCache("tzindex", self.directory).set("value", "key")
+        out = io.StringIO()
+        with patch.dict(os.environ, {"DAYLIGHT_CACHE_DIR": str(self.directory)}), redirect_stdout(out):
+            main(["cache", "stats"])
+            main(["cache", "clear"])
+        self.assertIn("tzindex: 1 entries", out.getvalue())
+        self.assertIn("Removed 1 entries", out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,8 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from daylight_py.calculations import get_sun_times, SunTimes
+from daylight_py.calculations import get_day_length_series, get_sun_times, iter_sun_times, last_solstice, Site, SunTimes, SunTimesGrid
+from daylight_py.yearly import local_date, next_solstice
 
 class TestCalculations(unittest.TestCase):
 
@@ -107,5 +108,168 @@ class TestCalculations(unittest.TestCase):
         # Day length should be very close to 12 hours
         self.assertAlmostEqual(times.length, datetime.timedelta(hours=12), delta=datetime.timedelta(minutes=10))
 
+    def test_get_sun_times_far_from_utc_uses_local_date(self):
+        # Los Angeles: the local sunset falls on the next UTC day
+        tz = pytz.timezone("America/Los_Angeles")
+        times = get_sun_times(34.05, -118.24, datetime.date(2024, 7, 15), tz)
+        self.assertEqual(times.rises.date(), datetime.date(2024, 7, 15))
+        self.assertEqual(times.sets.date(), datetime.date(2024, 7, 15))
+        self.assertGreater(times.length, datetime.timedelta(hours=14))
+
+    def test_get_sun_times_white_night(self):
+        # No civil dawn/dusk, but the sun still rises and sets
+        times = get_sun_times(62.0, 10.0, datetime.date(2024, 6, 21), pytz.timezone("Europe/Oslo"))
+        self.assertFalse(times.polar_night)
+        self.assertIsNotNone(times.rises)
+        self.assertIsNotNone(times.sets)
+
+    def test_day_length_series(self):
+        lat, lon = 51.5074, -0.1278
+        tz = pytz.timezone("Europe/London")
+        start, end = datetime.date(2024, 7, 15), datetime.date(2024, 7, 20)
+
+        series = get_day_length_series(lat, lon, start, end, tz, since_solstice=True)
+
+        self.assertEqual(len(series), 6)
+        self.assertEqual(series.dates[0], start)
+        self.assertEqual(series.dates[-1], end)
+        yesterday = get_sun_times(lat, lon, start - datetime.timedelta(days=1), tz)
+        self.assertEqual(series.previous.length, yesterday.length)
+
+        prev_length = yesterday.length
+        for day, sun_times, length, change, since_solstice in series:
+            self.assertEqual(sun_times.rises.date(), day)
+            self.assertEqual(length, int(sun_times.length.total_seconds()))
+            self.assertEqual(change, int((sun_times.length - prev_length).total_seconds())) # Exact difference, truncated
+            self.assertLess(change, 0) # Days get shorter after the June solstice
+            self.assertLess(since_solstice, 0)
+            prev_length = sun_times.length
+
+        solstice_length = get_sun_times(lat, lon, datetime.date(2024, 6, 20), tz).length
+        self.assertEqual(series[0][4], int((series.sun_times[0].length - solstice_length).total_seconds()))
+        self.assertIsNone(get_day_length_series(lat, lon, start, start, tz)[0][4])
+
+    def test_last_solstice(self):
+        self.assertEqual(last_solstice(datetime.date(2024, 7, 15)), datetime.date(2024, 6, 20))
+        self.assertEqual(last_solstice(datetime.date(2024, 12, 21)), datetime.date(2024, 12, 21))
+        self.assertEqual(last_solstice(datetime.date(2025, 3, 1)), datetime.date(2024, 12, 21))
+        # The June 2024 solstice (20:51 UTC) falls on June 21 in Seoul, as the views report it
+        seoul = pytz.timezone("Asia/Seoul")
+        self.assertEqual(last_solstice(datetime.date(2024, 6, 20), seoul), datetime.date(2023, 12, 22))
+        self.assertEqual(last_solstice(datetime.date(2024, 6, 21), seoul), datetime.date(2024, 6, 21))
+        self.assertEqual(local_date(next_solstice(datetime.date(2024, 6, 1), seoul), seoul), datetime.date(2024, 6, 21))
+
+    def test_grid_interpolation_close_to_exact(self):
+        grid = SunTimesGrid(resolution=0.1)
+        tz = pytz.timezone("Europe/London")
+        date_obj = datetime.date(2024, 3, 1)
+        for lat, lon in ((51.5074, -0.1278), (51.5123, -0.1411), (53.4808, -2.2426)):
+            exact = get_sun_times(lat, lon, date_obj, tz)
+            approx = get_sun_times(lat, lon, date_obj, tz, grid=grid)
+            self.assertEqual(approx.rises.tzinfo.zone, "Europe/London")
+            for name in ("rises", "sets", "noon"):
+                self.assertAlmostEqual(getattr(approx, name), getattr(exact, name), delta=datetime.timedelta(seconds=2))
+        # The first two points share a cell
+        self.assertEqual(grid.misses, 8)
+        self.assertEqual(grid.hits, 4)
+
+    def test_grid_falls_back_near_poles(self):
+        grid = SunTimesGrid()
+        tz = pytz.timezone("Europe/Oslo")
+        times = get_sun_times(69.6492, 18.9553, datetime.date(2024, 6, 21), tz, grid=grid)
+        self.assertTrue(times.polar_day)
+        self.assertEqual(grid.fallbacks, 1)
+        self.assertEqual(grid.misses, 0)
+
+    def test_site_matches_get_sun_times(self):
+        tz = pytz.timezone("Europe/London")
+        site = Site(51.5074, -0.1278, tz)
+        start = datetime.date(2024, 3, 29)
+        days = site.range(start, start + datetime.timedelta(days=3)) # Across the DST change
+        self.assertEqual([day for day, _ in days], [start + datetime.timedelta(days=i) for i in range(4)])
+        for day, times in days:
+            expected = get_sun_times(51.5074, -0.1278, day, tz)
+            self.assertEqual((times.rises, times.sets, times.noon, times.length), (expected.rises, expected.sets, expected.noon, expected.length))
+        self.assertEqual(site.sun_times(start).length, days[0][1].length)
+
+    def test_batched_range_matches_day_by_day(self):
+        start, end = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+        sites = (
+            Site(51.5074, -0.1278, "Europe/London"),
+            Site(69.6492, 18.9553, "Europe/Oslo"), # Polar night and polar day
+            Site(-33.8688, 151.2093, "Australia/Sydney", elevation=50, precision="precise"),
+        )
+        for site in sites:
+            self.assertTrue(site.batches(start, end))
+            batched = site.compute_range(start, end)
+            self.assertEqual(len(batched), 366)
+            for day, times in batched:
+                self.assertEqual(repr(times), repr(site.sun_times(day)), f"{site} on {day}")
+        self.assertFalse(Site(51.5074, -0.1278, "Europe/London", precision="fast").batches(start, end))
+
+    def test_site_pickles_compactly(self):
+        import pickle
+        site = Site(69.6492, 18.9553, "Europe/Oslo")
+        restored = pickle.loads(pickle.dumps(site))
+        self.assertEqual((restored.latitude, restored.longitude, restored.timezone), (site.latitude, site.longitude, site.timezone))
+        self.assertTrue(restored.sun_times(datetime.date(2024, 6, 21)).polar_day)
+        self.assertLess(len(pickle.dumps(site)), 200)
+
+    def test_precision_tiers(self):
+        tz = pytz.timezone("Europe/London")
+        date_obj = datetime.date(2024, 3, 20)
+        standard = get_sun_times(51.5074, -0.1278, date_obj, tz)
+        fast = get_sun_times(51.5074, -0.1278, date_obj, tz, precision="fast")
+        precise = get_sun_times(51.5074, -0.1278, date_obj, tz, precision="precise")
+        for tier in (fast, precise):
+            self.assertAlmostEqual(tier.rises, standard.rises, delta=datetime.timedelta(seconds=90))
+            self.assertAlmostEqual(tier.sets, standard.sets, delta=datetime.timedelta(seconds=90))
+            self.assertEqual(tier.length, tier.sets - tier.rises)
+        self.assertTrue(get_sun_times(69.6492, 18.9553, datetime.date(2024, 6, 21), pytz.timezone("Europe/Oslo"), precision="fast").polar_day)
+        with self.assertRaises(ValueError):
+            get_sun_times(51.5074, -0.1278, date_obj, tz, precision="exact")
+
+    def test_precise_tier_elevation_and_atmosphere(self):
+        date_obj = datetime.date(2024, 3, 20)
+        sea_level = Site(51.5074, -0.1278, "Europe/London", precision="precise").sun_times(date_obj)
+        hill = Site(51.5074, -0.1278, "Europe/London", elevation=300, precision="precise").sun_times(date_obj)
+        cold = Site(51.5074, -0.1278, "Europe/London", precision="precise", temperature_c=-20).sun_times(date_obj)
+        # A dipped horizon and denser air both make the day longer
+        self.assertLess(hill.rises, sea_level.rises)
+        self.assertGreater(hill.sets, sea_level.sets)
+        self.assertGreater(cold.length, sea_level.length)
+
+    def test_iter_sun_times_is_lazy_and_matches_range(self):
+        import itertools
+        from unittest.mock import patch
+        tz = pytz.timezone("Europe/Oslo")
+        start = datetime.date(2024, 1, 1)
+        walked = list(itertools.islice(iter_sun_times(69.6492, 18.9553, tz, start), 400))
+        expected = [st for _, st in Site(69.6492, 18.9553, tz).range(start, start + datetime.timedelta(days=399))]
+        self.assertEqual([repr(st) for st in walked], [repr(st) for st in expected])
+
+        with patch.object(Site, "compute_range", autospec=True, side_effect=Site.compute_range) as computed:
+            days = Site(51.5074, -0.1278, "Europe/London").iter_sun_times(start, chunk_days=10)
+            self.assertEqual(computed.call_count, 0)
+            next(days)
+            self.assertEqual(computed.call_count, 1) # One chunk at a time
+            for _ in range(10):
+                next(days)
+            self.assertEqual(computed.call_count, 2)
+
+    def test_iter_sun_times_chunks_go_through_the_array_kernel(self):
+        import itertools
+        from unittest.mock import patch
+        from daylight_py import calculations, noaa
+        start = datetime.date(2024, 3, 1)
+        site = Site(51.5074, -0.1278, "Europe/London")
+        with patch.object(noaa, "sun_events", side_effect=noaa.sun_events) as kernel, \
+                patch.object(calculations, "sunrise", side_effect=calculations.sunrise) as per_day:
+            walked = list(itertools.islice(site.iter_sun_times(start, chunk_days=5), 10))
+        self.assertEqual(kernel.call_count, 2) # One kernel call per chunk, even for chunks this small
+        self.assertEqual(per_day.call_count, 0)
+        expected = [site.sun_times(start + datetime.timedelta(days=i)) for i in range(10)]
+        self.assertEqual([repr(st) for st in walked], [repr(st) for st in expected])
+
 if __name__ == '__main__':
     unittest.main()
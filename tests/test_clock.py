@@ -0,0 +1,65 @@
+import unittest
+import datetime
+import io
+import json
+import os
+from contextlib import redirect_stdout
+from unittest.mock import patch
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.app import main
+from daylight_py.calculations import Site
+from daylight_py.clock import Clock, ClockError, FrozenClock, SystemClock, default_clock, parse_moment, set_default_clock
+
+class TestClock(unittest.TestCase):
+
+    def tearDown(self):
+        set_default_clock(None)
+
+    def test_today_is_per_zone(self):
+        clock = FrozenClock(datetime.datetime(2024, 6, 21, 11, 30, tzinfo=pytz.utc))
+        # The same instant is three different dates around the date line
+        self.assertEqual(clock.today(pytz.timezone("Pacific/Kiritimati")), datetime.date(2024, 6, 22))
+        self.assertEqual(clock.today(pytz.timezone("Europe/London")), datetime.date(2024, 6, 21))
+        self.assertEqual(clock.today(pytz.timezone("Pacific/Pago_Pago")), datetime.date(2024, 6, 21))
+        self.assertEqual(clock.now(pytz.timezone("Pacific/Pago_Pago")).hour, 0)
+        self.assertEqual(Site(51.5, -0.13, "Europe/London").today(clock), datetime.date(2024, 6, 21))
+
+    def test_today_cache_expires_at_local_midnight(self):
+        london = pytz.timezone("Europe/London")
+        clock = FrozenClock(london.localize(datetime.datetime(2024, 3, 30, 23, 59)))
+        self.assertEqual(clock.today(london), datetime.date(2024, 3, 30))
+        clock.advance(60)
+        self.assertEqual(clock.today(london), datetime.date(2024, 3, 31))
+        clock.advance(datetime.timedelta(hours=23, minutes=1)) # Clocks go forward on 31 March 2024: a 23-hour day in London
+        self.assertEqual(clock.today(london), datetime.date(2024, 4, 1))
+
+    def test_snapshot_is_frozen(self):
+        snapshot = SystemClock().snapshot()
+        self.assertEqual(snapshot.now(), snapshot.now())
+        with self.assertRaises(TypeError): # Clock is abstract
+            Clock()
+        with self.assertRaises(ClockError):
+            parse_moment("yesterday")
+        self.assertEqual(parse_moment("2024-06-21T12:00:00").tzinfo, datetime.timezone.utc)
+
+    def test_default_clock_from_environment(self):
+        set_default_clock(None)
+        with patch.dict(os.environ, {"DAYLIGHT_NOW": "2024-06-21T11:30:00+00:00"}):
+            self.assertEqual(default_clock().today(), datetime.date(2024, 6, 21))
+
+    def test_cli_uses_date_of_target_zone(self):
+        set_default_clock(FrozenClock(datetime.datetime(2024, 6, 21, 11, 30, tzinfo=pytz.utc)))
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(["--latitude", "1.87", "--longitude", "-157.4", "--timezone", "Pacific/Kiritimati", "--json"])
+        self.assertEqual(json.loads(out.getvalue())["date"], "2024-06-22")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import datetime
+import numpy as np
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import Site
+from daylight_py.compact import ESCAPE, CompactFormatError, CompactSunTimes, encode_arrays, encode_sun_times
+
+SITES = [
+    Site(51.5074, -0.1278, "Europe/London"), # DST changes
+    Site(69.6492, 18.9553, "Europe/Oslo"), # Polar day and night, with large jumps around them
+    Site(-77.85, 166.67, "Antarctica/McMurdo"),
+    Site(-33.87, 151.2, "Australia/Sydney", precision="fast"),
+]
+START, END = datetime.date(2024, 1, 1), datetime.date(2025, 12, 31)
+
+class TestCompactSunTimes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = encode_sun_times(SITES, START, END)
+
+    def test_round_trip_within_resolution(self):
+        table = CompactSunTimes.from_bytes(self.table.to_bytes())
+        self.assertEqual([repr(site) for site in table.sites], [repr(site) for site in SITES])
+        for i, site in enumerate(SITES):
+            for day, expected in site.range(START, END):
+                actual = table.sun_times(i, day)
+                self.assertEqual((actual.polar_day, actual.polar_night), (expected.polar_day, expected.polar_night))
+                for name in ("rises", "sets", "noon"):
+                    a, b = getattr(actual, name), getattr(expected, name)
+                    self.assertEqual(a is None, b is None, (site, day, name))
+                    if a is not None:
+                        self.assertLessEqual(abs((a - b).total_seconds()), 0.5)
+                        self.assertEqual(a.utcoffset(), b.utcoffset())
+                self.assertEqual(actual.length is None, expected.length is None)
+                if actual.length is not None:
+                    self.assertLessEqual(abs((actual.length - expected.length).total_seconds()), 1.0)
+        with self.assertRaises(KeyError):
+            table.sun_times(0, END + datetime.timedelta(days=1))
+
+    def test_vectorized_decode(self):
+        rises = self.table.decode("rises")
+        lengths = self.table.day_length()
+        polar_day, polar_night = self.table.polar_flags()
+        self.assertEqual(rises.shape, (len(SITES), (END - START).days + 1))
+        solstice = (datetime.date(2024, 6, 21) - START).days
+        self.assertTrue(polar_day[1, solstice] and polar_night[2, solstice])
+        self.assertTrue(np.isnan(rises[1, solstice]))
+        self.assertEqual((lengths[1, solstice], lengths[2, solstice]), (86400.0, 0.0))
+        expected = SITES[0].sun_times(datetime.date(2024, 6, 21))
+        self.assertAlmostEqual(rises[0, solstice], expected.rises.timestamp(), delta=0.5)
+        self.assertAlmostEqual(lengths[0, solstice], expected.length.total_seconds(), delta=1.0)
+
+    def test_compact_size_and_escapes(self):
+        days = (END - START).days + 1
+        self.assertLess(self.table.nbytes, len(SITES) * days * 3 * 8 / 3) # Under a third of int64 epochs
+        # Jumps that do not fit in an int16 are escaped and still decode exactly
+        epochs = np.array([[0.0, 40000.0, 40001.0, np.nan, 40003.0]]) + 1704067200 # From 2024-01-01 00:00 UTC
+        midnights = np.arange(5) * 86400.0
+        table = encode_arrays(SITES[:1], START, epochs + midnights, epochs + midnights, epochs + midnights,
+                              np.zeros((1, 5), bool), np.zeros((1, 5), bool))
+        self.assertEqual(table.arrays["rises_deltas"].tolist(), [[ESCAPE, ESCAPE, 1, 0, 2]])
+        decoded = table.decode("rises")
+        self.assertTrue(np.isnan(decoded[0, 3]))
+        np.testing.assert_array_equal(np.delete(decoded, 3, axis=1), np.delete(epochs + midnights, 3, axis=1))
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(CompactFormatError):
+            CompactSunTimes.from_bytes(b"not a table at all")
+        data = bytearray(self.table.to_bytes())
+        with self.assertRaises(CompactFormatError):
+            CompactSunTimes.from_bytes(bytes(data[:-100]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import datetime
+import io
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from unittest.mock import patch
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import get_sun_times
+from daylight_py.client import DaemonUnavailable, main as client_main, send_request
+from daylight_py.clock import FrozenClock
+from daylight_py.condensed_view import create_condensed_output
+from daylight_py.daemon import DaemonError, DaylightServer, DaylightState
+from daylight_py.ipinfo import IPInfoError
+
+SEOUL = {"latitude": 37.5665, "longitude": 126.978, "timezone": "Asia/Seoul"}
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "daylight.sock")
+        self.fetches = 0
+
+        def fetch_location():
+            self.fetches += 1
+            return {"ip": "1.2.3.4", "latitude": 51.5074, "longitude": -0.1278, "timezone": pytz.timezone("Europe/London")}
+
+        clock = FrozenClock(datetime.datetime(2024, 6, 21, 3, 0, tzinfo=pytz.utc))
+        self.server = DaylightServer(self.socket_path, DaylightState(clock, fetch_location))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmpdir.cleanup()
+
+    def run_client(self, argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            client_main(argv + ["--socket", self.socket_path])
+        return out.getvalue().rstrip("\n")
+
+    def test_client_prints_condensed_output(self):
+        seoul = pytz.timezone("Asia/Seoul")
+        expected = create_condensed_output(
+            get_sun_times(SEOUL["latitude"], SEOUL["longitude"], datetime.date(2024, 6, 21), seoul),
+            get_sun_times(SEOUL["latitude"], SEOUL["longitude"], datetime.date(2024, 6, 20), seoul),
+        )
+        argv = ["--latitude=37.5665", "--longitude=126.978", "--timezone=Asia/Seoul"]
+        self.assertEqual(self.run_client(argv), expected)
+        self.assertEqual(self.run_client(argv), expected) # Served from the rendered-output cache
+        self.assertEqual(self.fetches, 0)
+
+    def test_ip_location_fetched_once(self):
+        first = send_request({"view": "json"}, self.socket_path)
+        second = send_request({"view": "json"}, self.socket_path)
+        self.assertTrue(first["ok"])
+        self.assertEqual(first, second)
+        data = json.loads(first["output"])
+        self.assertEqual(data["date"], "2024-06-21")
+        self.assertEqual(data["ip_address"], "1.2.3.4")
+        self.assertEqual(self.fetches, 1)
+
+    def test_errors_are_replied(self):
+        reply = send_request(dict(SEOUL, timezone="Mars/Olympus"), self.socket_path)
+        self.assertFalse(reply["ok"])
+        self.assertIn("Unknown timezone", reply["error"])
+        reply = send_request(dict(SEOUL, view="full"), self.socket_path)
+        self.assertFalse(reply["ok"])
+
+    def test_live_socket_is_not_replaced(self):
+        with self.assertRaises(DaemonError):
+            DaylightServer(self.socket_path)
+
+    def test_stale_location_served_when_offline(self):
+        state = DaylightState(FrozenClock(datetime.datetime(2024, 6, 21, tzinfo=pytz.utc)), lambda: {
+            "ip": "1.2.3.4", "latitude": 51.5074, "longitude": -0.1278, "timezone": pytz.timezone("Europe/London")})
+        state.render({})
+        state._location = (state._location[0], state._location[1] - 7200)
+
+        def offline():
+            raise IPInfoError("no network")
+
+        state.fetch_location = offline
+        self.assertIn("Rises:", state.render({}))
+
+class TestClientFallback(unittest.TestCase):
+
+    def test_no_daemon_computes_in_process(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            socket_path = os.path.join(tmpdir, "missing.sock")
+            with self.assertRaises(DaemonUnavailable):
+                send_request({}, socket_path)
+            out = io.StringIO()
+            env = dict(os.environ, DAYLIGHT_NOW="2024-06-21T03:00:00+00:00")
+            with redirect_stdout(out):
+                with patch.dict(os.environ, env):
+                    from daylight_py import clock
+                    clock.set_default_clock(None)
+                    try:
+                        client_main(["--latitude=37.5665", "--longitude=126.978", "--timezone=Asia/Seoul",
+                                     "--socket", socket_path])
+                    finally:
+                        clock.set_default_clock(None)
+        seoul = pytz.timezone("Asia/Seoul")
+        expected = create_condensed_output(
+            get_sun_times(SEOUL["latitude"], SEOUL["longitude"], datetime.date(2024, 6, 21), seoul),
+            get_sun_times(SEOUL["latitude"], SEOUL["longitude"], datetime.date(2024, 6, 20), seoul),
+        )
+        self.assertEqual(out.getvalue().rstrip("\n"), expected)
+
+    def test_client_imports_only_stdlib(self):
+        code = (
+            "import sys; import daylight_py.client; "
+            "print(sorted(m for m in ('pytz', 'astral', 'requests', 'numpy', 'daylight_py.app') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONPATH=str(project_root / "src")),
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import datetime
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.formatting import (
+    format_change,
+    format_change_batch,
+    format_clock,
+    format_clock_batch,
+    format_duration,
+    format_duration_batch,
+)
+
+class TestFormatting(unittest.TestCase):
+
+    def test_clock_matches_strftime_for_every_minute(self):
+        midnight = datetime.datetime(2024, 1, 1)
+        for minute in range(24 * 60):
+            dt_obj = midnight + datetime.timedelta(minutes=minute, seconds=59)
+            self.assertEqual(format_clock(dt_obj), dt_obj.strftime("%H:%M"))
+        self.assertIsNone(format_clock(None))
+        self.assertEqual(format_clock(None, "--:--"), "--:--")
+
+    def test_duration(self):
+        self.assertEqual(format_duration(datetime.timedelta(hours=16, minutes=8, seconds=59)), "16 hrs, 8 mins")
+        self.assertEqual(format_duration(datetime.timedelta(days=1)), "24 hrs, 0 mins")
+        self.assertEqual(format_duration(datetime.timedelta(minutes=42), drop_zero_hours=True), "42 mins")
+        # The full view has always ignored whole days
+        self.assertEqual(format_duration(datetime.timedelta(days=1), drop_zero_hours=True, within_day=True), "0 mins")
+        self.assertEqual(format_duration(None, "N/A"), "N/A")
+
+    def test_change(self):
+        self.assertEqual(format_change(datetime.timedelta(seconds=131.6)), "+2m 11s")
+        self.assertEqual(format_change(datetime.timedelta(seconds=-131.6)), "-2m 11s")
+        self.assertEqual(format_change(datetime.timedelta(0)), "+0m 0s")
+        self.assertEqual(format_change(datetime.timedelta(hours=-2, seconds=-5)), "-120m 5s")
+
+    def test_batch(self):
+        self.assertEqual(format_clock_batch([0, 3599, None, 86399], "N/A"), ["00:00", "00:59", "N/A", "23:59"])
+        self.assertEqual(format_duration_batch([58080, None], "N/A"), ["16 hrs, 8 mins", "N/A"])
+        self.assertEqual(format_change_batch([-131, 5]), ["-2m 11s", "+0m 5s"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,13 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import redirect_stderr, redirect_stdout
 import pytz
 
 # Add project root to sys.path to allow importing daylight_py
@@ -8,7 +16,10 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from daylight_py.ipinfo import fetch_ip_info, IPInfoError
+from daylight_py import ipinfo
+from daylight_py.app import main
+from daylight_py.ipinfo import fetch_ip_info, IPInfoError, LocationRefresh, load_last_location, save_last_location
+from daylight_py.testing import FakeIPInfoServer
 
 class TestIPInfo(unittest.TestCase):
 
@@ -106,6 +117,94 @@ class TestIPInfo(unittest.TestCase):
         with self.assertRaisesRegex(IPInfoError, "Error decoding JSON response.*JSON Decode Error"):
             fetch_ip_info()
 
+    def test_fetch_ip_info_against_fake_server(self):
+        with FakeIPInfoServer(error_rate=0.0) as server:
+            with patch.object(ipinfo, "IPINFO_URL", server.url):
+                info = fetch_ip_info()
+        self.assertEqual(info["timezone"], pytz.timezone("Europe/London"))
+        self.assertEqual(server.served, 1)
+
+        with FakeIPInfoServer(error_rate=1.0) as server:
+            with patch.object(ipinfo, "IPINFO_URL", server.url):
+                with self.assertRaisesRegex(IPInfoError, "503"):
+                    fetch_ip_info()
+
+class TestLastLocation(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.london = {"ip": "1.2.3.4", "latitude": 51.5074, "longitude": -0.1278, "timezone": pytz.timezone("Europe/London")}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        self.assertIsNone(load_last_location(self.directory))
+        self.assertTrue(save_last_location(self.london, self.directory))
+        loaded = load_last_location(self.directory)
+        self.assertEqual(loaded["timezone"], self.london["timezone"])
+        self.assertEqual({key: loaded[key] for key in self.london}, self.london)
+        self.assertIn("fetched", loaded)
+
+    def test_refresh_in_background(self):
+        release = threading.Event()
+
+        def slow_fetch():
+            release.wait()
+            return self.london
+
+        refresh = LocationRefresh(slow_fetch, self.directory)
+        self.assertIsNone(refresh.wait(timeout=0.01)) # Still waiting on the network
+        release.set()
+        self.assertEqual(refresh.wait(), self.london)
+        self.assertEqual(load_last_location(self.directory)["ip"], "1.2.3.4")
+
+        def failing_fetch():
+            raise IPInfoError("offline")
+
+        refresh = LocationRefresh(failing_fetch, self.directory)
+        self.assertIsNone(refresh.wait())
+        self.assertEqual(str(refresh.error), "offline")
+        self.assertEqual(load_last_location(self.directory)["ip"], "1.2.3.4") # Last location kept
+
+    def test_cached_location_cli(self):
+        def run():
+            out, err = io.StringIO(), io.StringIO()
+            with redirect_stdout(out), redirect_stderr(err):
+                main(["--short", "--cached-location"])
+            return out.getvalue(), err.getvalue()
+
+        environment = {"DAYLIGHT_CACHE_DIR": self.directory, "DAYLIGHT_NOW": "2024-06-21T12:00:00+00:00"}
+        with FakeIPInfoServer() as server, patch.dict(os.environ, environment), patch.object(ipinfo, "IPINFO_URL", server.url):
+            first, err = run() # Nothing saved yet: fetched in the foreground (London)
+            self.assertIn("Fetching IP information", err)
+            self.assertEqual(server.served, 1)
+
+            second, err = run() # Answered from London while Seoul is fetched
+            self.assertEqual(second, first)
+            self.assertNotIn("Fetching IP information", err)
+            self.assertIn("Location changed to Lat=37.57, Lon=126.98, TZ=Asia/Seoul; the next run will use it", err)
+            self.assertEqual(server.served, 2)
+
+            third, _ = run()
+            self.assertNotEqual(third, first)
+        self.assertEqual(load_last_location(self.directory)["timezone"].zone, "America/New_York")
+
+    def test_cached_location_cli_does_not_wait_for_slow_refresh(self):
+        save_last_location(self.london, self.directory)
+        with FakeIPInfoServer(latency=5.0) as server:
+            environment = dict(os.environ, DAYLIGHT_CACHE_DIR=self.directory, DAYLIGHT_IPINFO_URL=server.url,
+                               DAYLIGHT_NOW="2024-06-21T12:00:00+00:00", PYTHONPATH=str(project_root / "src"))
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-m", "daylight_py.app", "--short", "--cached-location"],
+                                    capture_output=True, text=True, env=environment, timeout=30)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("TZ=Europe/London", result.stderr)
+        self.assertNotIn("Location changed", result.stderr)
+        self.assertLess(elapsed, 3.0) # Start-up, output and REFRESH_WAIT_SECONDS, not the 5 s lookup
+        self.assertEqual(load_last_location(self.directory)["ip"], "1.2.3.4") # Abandoned refresh saved nothing
+
 # This is needed to import requests for the side_effect
 import requests
 
@@ -0,0 +1,63 @@
+import unittest
+import datetime
+import numpy as np
+import pytz
+from astral import Observer
+from astral.sun import sun, sunrise
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.noaa import julian_days, minutes_to_datetime, sun_events, sun_events_for_dates
+
+class TestNoaaKernel(unittest.TestCase):
+
+    def test_matches_astral_over_latitude_and_day_grid(self):
+        latitudes = np.arange(-60.0, 61.0, 10.0)
+        dates = [datetime.date(2024, 1, 1) + datetime.timedelta(days=d) for d in range(0, 366, 7)]
+        lat_grid, date_index = np.meshgrid(latitudes, np.arange(len(dates)), indexing="ij")
+        jd = julian_days(dates)[date_index]
+
+        events = sun_events(lat_grid, 0.0, jd)
+
+        compared = 0
+        for i, latitude in enumerate(latitudes):
+            for j, date_obj in enumerate(dates):
+                try:
+                    expected = sun(Observer(latitude, 0.0), date_obj, tzinfo=pytz.utc)
+                except ValueError: # astral fails whenever twilight is missing, e.g. white nights
+                    continue
+                for key, minutes in (("sunrise", events.sunrise), ("sunset", events.sunset), ("noon", events.noon)):
+                    actual = minutes_to_datetime(date_obj, minutes[i, j])
+                    self.assertAlmostEqual(actual, expected[key], delta=datetime.timedelta(seconds=1),
+                                           msg=f"{key} at {latitude} on {date_obj}")
+                compared += 1
+        self.assertGreater(compared, 250)
+
+    def test_polar_day_and_night(self):
+        dates = [datetime.date(2024, 6, 21), datetime.date(2024, 12, 21)]
+        events = sun_events_for_dates(78.22, 15.65, dates) # Longyearbyen
+        self.assertTrue(np.isnan(events.sunrise).all())
+        self.assertEqual(events.polar_day.tolist(), [True, False])
+        self.assertEqual(events.polar_night.tolist(), [False, True])
+        self.assertEqual(events.day_length.tolist(), [1440.0, 0.0])
+        with self.assertRaises(ValueError):
+            sunrise(Observer(78.22, 15.65), dates[0], tzinfo=pytz.utc)
+
+    def test_longitude_and_elevation(self):
+        date_obj = datetime.date(2024, 3, 1)
+        observer = Observer(37.5665, 126.9780, 500.0)
+        events = sun_events_for_dates(37.5665, 126.9780, [date_obj], elevation=500.0)
+        # Like astral, the event is the one on the UTC date: Seoul's sunrise of the next local morning
+        expected = sunrise(observer, date_obj, tzinfo=pytz.utc)
+        self.assertEqual(expected.date(), date_obj)
+        actual = minutes_to_datetime(date_obj, events.sunrise[0])
+        self.assertAlmostEqual(actual, expected, delta=datetime.timedelta(seconds=1))
+        epoch = events.epoch_seconds(events.sunrise)[0]
+        self.assertAlmostEqual(epoch, expected.timestamp(), delta=1.0)
+
+if __name__ == '__main__':
+    unittest.main()
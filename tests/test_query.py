@@ -0,0 +1,100 @@
+import unittest
+import datetime
+import io
+import types
+from contextlib import redirect_stdout
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.app import main
+from daylight_py.calculations import Site
+from daylight_py.query import Query, QueryError, find_matches, parse_predicate, read_sites
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.sites = [
+            Site(51.5074, -0.1278, "Europe/London"),
+            Site(59.9139, 10.7522, "Europe/Oslo"),
+            Site(-33.8688, 151.2093, "Australia/Sydney"),
+            Site(1.3521, 103.8198, "Asia/Singapore"),
+            Site(69.6492, 18.9553, "Europe/Oslo"),
+        ]
+
+    def test_parse_predicate(self):
+        self.assertEqual(parse_predicate("day_length>16h").value, 960)
+        self.assertEqual(parse_predicate("day_length <= 16:30").value, 990)
+        self.assertEqual(parse_predicate("sunset>=21:00").value, 1260)
+        for text in ("sunset>21", "altitude>3", "sunrise>25:00", "day_length=16h"):
+            with self.assertRaises(QueryError):
+                parse_predicate(text)
+
+    def test_matches_agree_with_sun_times(self):
+        start, end = datetime.date(2027, 1, 1), datetime.date(2027, 12, 31)
+        matches = list(find_matches(self.sites, start, end, ["sunset>=21:00", "day_length<24h"]))
+        found = {(m.site_index, m.date) for m in matches}
+        self.assertEqual(matches, sorted(matches, key=lambda m: (m.date, m.site_index)))
+
+        for index, site in enumerate(self.sites):
+            for offset in range(0, 365, 4):
+                day = start + datetime.timedelta(days=offset)
+                times = site.sun_times(day)
+                expected = (
+                    times.sets is not None and times.length is not None
+                    and times.length < datetime.timedelta(hours=24)
+                    and (times.sets.hour, times.sets.minute) >= (21, 0)
+                )
+                self.assertEqual((index, day) in found, expected, f"{site} on {day}")
+        match = next(m for m in matches if m.site_index == 0)
+        reference = self.sites[0].sun_times(match.date)
+        self.assertAlmostEqual(match.sets, reference.sets, delta=datetime.timedelta(seconds=1))
+        self.assertEqual(match.sets.utcoffset(), reference.sets.utcoffset())
+
+    def test_fixed_offset_zones_are_not_merged(self):
+        import pytz
+        sites = [Site(28.6139, 77.2090, pytz.FixedOffset(330)), Site(40.7128, -74.0060, pytz.FixedOffset(-300))]
+        day = datetime.date(2027, 6, 21)
+        matches = list(find_matches(sites, day, day, ["day_length>1h"]))
+        self.assertEqual([m.site_index for m in matches], [0, 1])
+        for match, site in zip(matches, sites):
+            reference = site.sun_times(day)
+            self.assertEqual(match.sets.utcoffset(), reference.sets.utcoffset())
+            self.assertAlmostEqual(match.sets, reference.sets, delta=datetime.timedelta(seconds=1))
+
+    def test_polar_day_and_pruning(self):
+        query = Query(self.sites, ["day_length>=24h"])
+        matches = list(query.run(datetime.date(2027, 1, 1), datetime.date(2027, 12, 31)))
+        self.assertTrue(matches)
+        self.assertEqual({m.site_index for m in matches}, {4}) # Only Tromsø has the midnight sun
+        self.assertTrue(all(m.rises is None and m.sets is None for m in matches))
+        # Outside summer, and outside the polar band, nothing needs computing
+        self.assertGreater(query.pruned_cells, 4 * query.evaluated_cells)
+
+    def test_results_stream(self):
+        result = find_matches(self.sites, datetime.date(2027, 1, 1), datetime.date(2036, 12, 31), ["sunrise<4:00"])
+        self.assertIsInstance(result, types.GeneratorType)
+        first = next(result)
+        self.assertEqual((first.site_index, first.date.year), (4, 2027))
+
+    def test_read_sites_and_cli(self):
+        sites = read_sites(["name,latitude,longitude,timezone", "# comment", "London,51.5074,-0.1278,Europe/London"])
+        self.assertEqual([name for name, _ in sites], ["London"])
+        with self.assertRaisesRegex(QueryError, "Line 1: unknown timezone Mars/Olympus"):
+            read_sites(["London,51.5074,-0.1278,Mars/Olympus"])
+        with self.assertRaisesRegex(QueryError, "Line 2: could not convert"):
+            read_sites(["# sites", "London,north,-0.1278,Europe/London"])
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(["query", "--latitude", "51.5074", "--longitude", "-0.1278", "--timezone", "Europe/London",
+                  "--from", "2027-06-20", "--to", "2027-06-22", "--where", "sunset>=21:20"])
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("2027-06-20  51.5074,-0.1278  rises 04:43  sets 21:20"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import datetime
+import io
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import Site
+from daylight_py.report import ReportError, compute_site, render_site_report, run_report
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        self.query_date = datetime.date(2024, 7, 15)
+        self.sites = [
+            Site(51.5074 + i * 0.5, -0.1278 + i, "Europe/London") for i in range(6)
+        ] + [Site(69.6492, 18.9553, "Europe/Oslo")]
+        self.expected = "".join(
+            render_site_report(site, self.query_date, compute_site(site, self.query_date)) + "\n"
+            for site in self.sites
+        )
+
+    def test_threads_keep_input_order(self):
+        out = io.StringIO()
+        run_report(self.sites, self.query_date, out, compute_workers=4, render_workers=3, queue_size=2)
+        self.assertEqual(out.getvalue(), self.expected)
+
+    def test_process_pool_stage(self):
+        out = io.StringIO()
+        run_report(self.sites, self.query_date, out, compute_workers=2, render_workers=1, compute_processes=True)
+        self.assertEqual(out.getvalue(), self.expected)
+
+    def test_failures_are_reported_after_the_rest(self):
+        out = io.StringIO()
+        with self.assertRaisesRegex(ReportError, "position 1"):
+            run_report([self.sites[0], None, self.sites[1]], self.query_date, out)
+        self.assertEqual(out.getvalue().count("Today's daylight"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import datetime
+import multiprocessing
+import os
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import Site
+from daylight_py.shared import SharedBlockError, attach_sun_times, publish_sun_times, unlink_sun_times
+
+BLOCK_NAME = f"daylight_test_{os.getpid()}"
+SITES = [
+    Site(51.5074, -0.1278, "Europe/London"), # DST change in the range
+    Site(69.6492, 18.9553, "Europe/Oslo"), # Polar night
+    Site(-77.85, 166.67, "Antarctica/McMurdo"), # Polar day
+    Site(37.5665, 126.978, "Asia/Seoul", precision="fast"),
+]
+START = datetime.date(2024, 10, 20)
+END = datetime.date(2024, 12, 31)
+
+def _read_in_child(name, queue):
+    with attach_sun_times(name) as block:
+        queue.put([(i, day, repr(block.sun_times(i, day))) for i in range(len(block.sites)) for day in block.dates])
+
+class TestSharedSunTimes(unittest.TestCase):
+
+    def setUp(self):
+        self.published = publish_sun_times(SITES, START, END, name=BLOCK_NAME)
+
+    def tearDown(self):
+        self.published.close()
+        unlink_sun_times(BLOCK_NAME)
+
+    def test_attach_matches_site_sun_times(self):
+        with attach_sun_times(BLOCK_NAME) as block:
+            self.assertEqual(block.days, (END - START).days + 1)
+            self.assertFalse(block.rises.flags.writeable)
+            self.assertEqual(block.site_index(Site(69.6492, 18.9553, "Europe/Oslo")), 1)
+            self.assertIsNone(block.site_index(Site(0, 0, "UTC")))
+            for i, site in enumerate(SITES):
+                for day, expected in site.range(START, END):
+                    actual = block.sun_times(i, day)
+                    self.assertEqual(repr(actual), repr(expected))
+                    if actual.rises is not None:
+                        self.assertEqual(actual.rises.utcoffset(), expected.rises.utcoffset())
+            self.assertTrue(block.sun_times(1, datetime.date(2024, 12, 21)).polar_night)
+            self.assertTrue(block.sun_times(2, datetime.date(2024, 12, 21)).polar_day)
+            with self.assertRaises(KeyError):
+                block.sun_times(0, END + datetime.timedelta(days=1))
+
+    def test_other_process_reads_without_recomputing(self):
+        queue = multiprocessing.get_context("spawn").Queue()
+        child = multiprocessing.get_context("spawn").Process(target=_read_in_child, args=(BLOCK_NAME, queue))
+        child.start()
+        rows = queue.get(timeout=60)
+        child.join(timeout=60)
+        self.assertEqual(child.exitcode, 0)
+        expected = [(i, day, repr(st)) for i, site in enumerate(SITES) for day, st in site.range(START, END)]
+        self.assertEqual(rows, expected)
+
+    def test_block_survives_publisher_close(self):
+        self.published.close()
+        with attach_sun_times(BLOCK_NAME) as block:
+            self.assertEqual(len(block.sites), len(SITES))
+
+    def test_name_conflicts_and_missing_blocks(self):
+        with self.assertRaises(SharedBlockError):
+            publish_sun_times(SITES[:1], START, START, name=BLOCK_NAME)
+        replaced = publish_sun_times(SITES[:1], START, START, name=BLOCK_NAME, replace=True)
+        try:
+            with attach_sun_times(BLOCK_NAME) as block:
+                self.assertEqual((len(block.sites), block.days), (1, 1))
+        finally:
+            replaced.close()
+        self.assertTrue(unlink_sun_times(BLOCK_NAME))
+        with self.assertRaises(SharedBlockError):
+            attach_sun_times(BLOCK_NAME)
+
+    def test_failed_publish_leaves_no_block(self):
+        class BrokenSite(Site):
+            def range(self, start_date, end_date, store=None):
+                raise RuntimeError("no ephemeris")
+
+        name = BLOCK_NAME + "_failed"
+        with self.assertRaisesRegex(RuntimeError, "no ephemeris"):
+            publish_sun_times(SITES[:1] + [BrokenSite(0.0, 0.0, "UTC")], START, END, name=name)
+        self.assertFalse(unlink_sun_times(name))
+        # The name is free again
+        publish_sun_times(SITES[:1], START, START, name=name).close()
+        self.assertTrue(unlink_sun_times(name))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+import datetime
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.app import main
+from daylight_py.cache import library_versions
+from daylight_py.calculations import Site, get_day_length_series
+from daylight_py.store import StoreError, SunTimesStore, prune_store, store_stats
+
+SITES = [
+    Site(51.5074, -0.1278, "Europe/London"), # DST changes
+    Site(69.6492, 18.9553, "Europe/Oslo"), # Polar day and night
+    Site(37.5665, 126.978, "Asia/Seoul", precision="fast"),
+]
+
+class TestSunTimesStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "sun_times.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_matches_computed(self):
+        start, end = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+        with SunTimesStore(self.path) as store:
+            for site in SITES:
+                self.assertEqual(store.put(site, site.range(start, end)), 366) # Spans several executemany batches
+        with SunTimesStore(self.path) as store:
+            self.assertEqual(store.row_count(), 3 * 366)
+            self.assertEqual([repr(s) for s in store.sites()], [repr(s) for s in SITES])
+            for site in SITES:
+                self.assertEqual(repr(store.range(site, start, end)), repr(site.range(start, end)))
+            self.assertIsNone(store.get(SITES[0], datetime.date(2025, 1, 1)))
+            self.assertIsNone(store.get(Site(0, 0, "UTC"), start))
+
+    def test_year_is_one_primary_key_scan(self):
+        with SunTimesStore(self.path) as store:
+            self.assertEqual(store._conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            plan = store._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT day, rises, sets, noon, length, flags FROM sun_times"
+                " WHERE site_id = ? AND day BETWEEN ? AND ? ORDER BY day", (1, 738886, 739251)).fetchall()
+        self.assertEqual(len(plan), 1)
+        self.assertIn("USING PRIMARY KEY (site_id=? AND day>? AND day<?)", plan[0][3])
+
+    def test_only_missing_dates_are_computed(self):
+        site = SITES[0]
+        with SunTimesStore(self.path) as store:
+            store.put(site, site.range(datetime.date(2024, 6, 1), datetime.date(2024, 6, 10)))
+            with patch.object(Site, "compute_range", autospec=True, side_effect=Site.compute_range) as computed:
+                days = store.get_or_compute_range(site, datetime.date(2024, 6, 5), datetime.date(2024, 6, 14))
+            self.assertEqual([call.args[1:3] for call in computed.call_args_list],
+                             [(datetime.date(2024, 6, 11), datetime.date(2024, 6, 14))]) # The missing span, in one call
+            self.assertEqual(repr(days), repr(site.range(datetime.date(2024, 6, 5), datetime.date(2024, 6, 14))))
+            self.assertEqual(store.row_count(), 14)
+
+            series = get_day_length_series(51.5074, -0.1278, datetime.date(2024, 6, 2), datetime.date(2024, 6, 3),
+                                           site.timezone, store=store)
+            self.assertEqual(repr(series.rows), repr(get_day_length_series(
+                51.5074, -0.1278, datetime.date(2024, 6, 2), datetime.date(2024, 6, 3), site.timezone).rows))
+
+    def test_iter_sun_times_through_store(self):
+        import itertools
+        site = SITES[0]
+        start = datetime.date(2024, 3, 1)
+        with SunTimesStore(self.path) as store:
+            walked = list(itertools.islice(site.iter_sun_times(start, store, chunk_days=5), 12))
+            self.assertEqual(store.row_count(), 15) # Three whole chunks
+            self.assertEqual(repr(walked), repr([st for _, st in site.range(start, start + datetime.timedelta(days=11))]))
+
+    def test_version_change_empties_store(self):
+        versions = library_versions()
+        with SunTimesStore(self.path, versions) as store:
+            store.put(SITES[0], SITES[0].range(datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)))
+        with SunTimesStore(self.path, dict(versions, tzdata="2099a")) as store:
+            self.assertEqual(store.row_count(), 0)
+
+    def test_unusable_path(self):
+        with self.assertRaises(StoreError):
+            SunTimesStore(os.path.join(self.tmpdir.name, "missing", "sun_times.sqlite"))
+
+    def test_reads_do_not_add_sites(self):
+        with SunTimesStore(self.path) as store:
+            self.assertEqual(store.range(SITES[0], datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)), [])
+            self.assertIsNone(store.get(SITES[1], datetime.date(2024, 1, 1)))
+            self.assertEqual(store.sites(), [])
+            store.put(SITES[0], SITES[0].range(datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)))
+            self.assertEqual([repr(s) for s in store.sites()], [repr(SITES[0])])
+
+    def test_shared_between_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        start = datetime.date(2024, 1, 1)
+        jobs = [(site, start + datetime.timedelta(days=offset)) for offset in range(0, 60, 5) for site in SITES]
+        with SunTimesStore(self.path) as store:
+            def read(job):
+                site, first = job
+                return store.get_or_compute_range(site, first, first + datetime.timedelta(days=9), batched=False)
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(read, jobs))
+            for (site, first), days in zip(jobs, results):
+                self.assertEqual(repr(days), repr(site.range(first, first + datetime.timedelta(days=9))))
+            self.assertEqual(store.row_count(), 3 * 65)
+            self.assertEqual(len(store.sites()), 3)
+            self.assertEqual(store.hits + store.misses, len(jobs) * 10)
+
+    def test_app_computes_without_unreadable_store(self):
+        import sqlite3
+        from contextlib import redirect_stderr
+        argv = ["--latitude=51.5074", "--longitude=-0.1278", "--timezone=Europe/London", "--date=2024-06-21"]
+        expected = io.StringIO()
+        with redirect_stdout(expected):
+            main(argv + ["--store="])
+        out, err = io.StringIO(), io.StringIO()
+        with patch.object(SunTimesStore, "range", side_effect=sqlite3.DatabaseError("database disk image is malformed")):
+            with redirect_stdout(out), redirect_stderr(err):
+                main(argv + [f"--store={self.path}"])
+        self.assertEqual(out.getvalue(), expected.getvalue())
+        self.assertIn("Error reading sun times store, computing without it: Cannot read sun times store", err.getvalue())
+
+    def test_app_reads_and_fills_store(self):
+        argv = ["--latitude=51.5074", "--longitude=-0.1278", "--timezone=Europe/London", "--date=2024-06-21"]
+        outputs = []
+        for extra in ([], [f"--store={self.path}"], [f"--store={self.path}"]):
+            for view in (["--json"], []):
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    main(argv + view + extra)
+                outputs.append(out.getvalue())
+        self.assertEqual(outputs[0:2], outputs[2:4])
+        self.assertEqual(outputs[0:2], outputs[4:6])
+        with SunTimesStore(self.path) as store:
+            self.assertEqual(store.row_count(), 12) # Yesterday, today and ten days of projection
+
+    def test_stats_and_prune(self):
+        self.assertIsNone(store_stats(self.path))
+        versions = library_versions()
+        with SunTimesStore(self.path, versions) as store:
+            store.get_or_compute_range(SITES[0], datetime.date(2024, 1, 1), datetime.date(2024, 1, 10))
+            store.get_or_compute_range(SITES[0], datetime.date(2024, 1, 6), datetime.date(2024, 1, 12))
+        stats = store_stats(self.path, versions)
+        self.assertEqual((stats.namespace, stats.entries, stats.hits, stats.misses, stats.current), ("store", 12, 5, 12, True))
+        self.assertEqual(prune_store(self.path, versions), 0)
+        upgraded = dict(versions, tzdata="2099a")
+        self.assertFalse(store_stats(self.path, upgraded).current) # Reported, not emptied
+        self.assertEqual(store_stats(self.path, versions).entries, 12)
+        self.assertEqual(prune_store(self.path, upgraded), 12)
+        self.assertEqual((store_stats(self.path, upgraded).entries, store_stats(self.path, upgraded).hits), (0, 0))
+
+    def test_cache_subcommand_covers_store(self):
+        with SunTimesStore(self.path) as store:
+            store.get_or_compute_range(SITES[1], datetime.date(2024, 6, 1), datetime.date(2024, 6, 30))
+        out = io.StringIO()
+        environ = {"DAYLIGHT_CACHE_DIR": os.path.join(self.tmpdir.name, "cache"), "DAYLIGHT_STORE": self.path}
+        with patch.dict(os.environ, environ), redirect_stdout(out):
+            main(["cache", "stats"])
+            main(["cache", "prune"])
+            main(["cache", "clear"])
+        self.assertIn(f"Sun times store: {self.path}", out.getvalue())
+        self.assertIn("store: 30 entries", out.getvalue())
+        self.assertIn("Removed 0 entries", out.getvalue()) # Current rows do not age out
+        self.assertIn("Removed 30 entries", out.getvalue())
+        with SunTimesStore(self.path) as store:
+            self.assertEqual((store.row_count(), store.sites()), (0, []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import get_sun_times, SunTimesGrid
+from daylight_py.condensed_view import create_condensed_output
+from daylight_py.full_view import create_full_output
+from daylight_py.json_view import create_json_output
+from daylight_py.striped import StripedCache, striped_lru_cache
+from daylight_py.yearly import get_yearly_index
+
+THREADS = 8
+
+def run_together(function, arguments):
+    """Runs function over arguments from THREADS threads released at the same moment."""
+    barrier = threading.Barrier(THREADS)
+
+    def start(argument):
+        if threading.current_thread().name not in started:
+            started.add(threading.current_thread().name)
+            barrier.wait()
+        return function(argument)
+
+    started = set()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(start, arguments))
+
+class TestStripedCache(unittest.TestCase):
+
+    def test_lru_per_stripe(self):
+        cache = StripedCache(maxsize=2, stripes=1)
+        self.assertEqual(cache.get_or_compute("a", lambda: 1), 1)
+        cache.get_or_compute("b", lambda: 2)
+        self.assertEqual(cache.get_or_compute("a", lambda: -1), 1) # "a" is now the most recent
+        cache.get_or_compute("c", lambda: 3) # Evicts "b"
+        self.assertEqual(cache.get_or_compute("b", lambda: 4), 4)
+        self.assertEqual((len(cache), cache.hits, cache.misses), (2, 1, 4))
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_small_caches_are_not_direct_mapped(self):
+        cache = StripedCache(maxsize=8) # Like the timeline parts of the full view
+        self.assertEqual(cache.stripes, 1)
+        for key in range(8):
+            cache.get_or_compute(key, lambda: key)
+        for key in range(8):
+            cache.get_or_compute(key, lambda: None)
+        self.assertEqual((len(cache), cache.hits), (8, 8))
+        self.assertEqual((StripedCache(maxsize=64).stripes, StripedCache(maxsize=256).stripes), (8, 16))
+
+    def test_failed_compute_is_not_stored(self):
+        cache = StripedCache(maxsize=4)
+        with self.assertRaises(ZeroDivisionError):
+            cache.get_or_compute("key", lambda: 1 / 0)
+        self.assertEqual(cache.get_or_compute("key", lambda: None), None)
+        self.assertEqual(cache.get_or_compute("key", lambda: 1), None) # None is a value like any other
+
+    def test_concurrent_callers_share_one_value(self):
+        calls = []
+
+        @striped_lru_cache(maxsize=64, stripes=4)
+        def build(n):
+            calls.append(n)
+            return [n]
+
+        results = run_together(build, [i % 20 for i in range(4000)])
+        # Every caller of a key gets the very same object, whoever computed it
+        for i, result in enumerate(results):
+            self.assertIs(result, build(i % 20))
+        self.assertEqual(build.cache.hits + build.cache.misses, 4000 + 4000)
+        self.assertGreaterEqual(len(calls), 20)
+        self.assertEqual(len(build.cache), 20)
+
+    def test_decorator_keys_include_keywords(self):
+        @striped_lru_cache(maxsize=8)
+        def power(base, exponent=2):
+            return base ** exponent
+
+        self.assertEqual((power(3), power(3, exponent=3), power(3)), (9, 27, 9))
+        self.assertEqual(power.cache.misses, 2)
+        self.assertEqual(power.__name__, "power")
+
+class TestThreadSafety(unittest.TestCase):
+
+    def render(self, case):
+        """All three views for one (latitude, longitude, zone, date) case."""
+        latitude, longitude, zone, day = case
+        tz = pytz.timezone(zone)
+        today = get_sun_times(latitude, longitude, day, tz)
+        yesterday = get_sun_times(latitude, longitude, day - datetime.timedelta(days=1), tz)
+        year_index = get_yearly_index(latitude, day.year)
+        now = tz.localize(datetime.datetime.combine(day, datetime.time(12, 0)))
+        return (
+            create_full_output(day, today, yesterday, [], now=now, year_index=year_index),
+            create_condensed_output(today, yesterday),
+            create_json_output(day, today, yesterday, year_index=year_index, now=now),
+        )
+
+    def test_views_match_serial_results(self):
+        places = [(51.5074, -0.1278, "Europe/London"), (37.5665, 126.978, "Asia/Seoul"),
+                  (69.6492, 18.9553, "Europe/Oslo"), (-33.8688, 151.2093, "Australia/Sydney")]
+        cases = [place + (datetime.date(2031, 1, 1) + datetime.timedelta(days=37 * i),)
+                 for i in range(12) for place in places]
+        threaded = run_together(self.render, cases * 2)
+        self.assertEqual(threaded, [self.render(case) for case in cases * 2])
+
+    def test_shared_grid(self):
+        tz = pytz.timezone("Europe/London")
+        day = datetime.date(2024, 3, 1)
+        points = [(51.4 + 0.013 * (i % 20), -0.3 + 0.017 * (i // 20)) for i in range(400)]
+        grid = SunTimesGrid(resolution=0.1)
+        threaded = run_together(lambda point: repr(get_sun_times(*point, day, tz, grid=grid)), points)
+        serial_grid = SunTimesGrid(resolution=0.1)
+        self.assertEqual(threaded, [repr(get_sun_times(*point, day, tz, grid=serial_grid)) for point in points])
+        self.assertEqual(grid.hits + grid.misses, 4 * len(points))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import datetime
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.tzindex import get_zone_index, to_epoch_seconds
+
+ZONES = [
+    "Europe/London",
+    "Europe/Dublin", # Negative DST in the tz database
+    "America/New_York",
+    "Australia/Lord_Howe", # 30 minute DST
+    "Pacific/Apia", # Skipped 2011-12-30 entirely
+    "Asia/Kolkata",
+    "Etc/GMT+5",
+    "UTC",
+]
+
+class TestZoneIndex(unittest.TestCase):
+
+    def test_localize_matches_astimezone(self):
+        for zone in ZONES:
+            tz = pytz.timezone(zone)
+            index = get_zone_index(tz, 2010, 2025)
+            # Both sides of every transition, plus a coarse grid with sub-second offsets
+            epoch = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)
+            start = datetime.datetime(2010, 1, 1, tzinfo=pytz.utc)
+            instants = [start + i * datetime.timedelta(hours=19, minutes=13, seconds=13.25) for i in range(16 * 365 * 24 // 20)]
+            for transition in index.transitions[1:]:
+                for delta in (-1, -0.5, 0, 0.5, 1):
+                    instants.append(epoch + datetime.timedelta(seconds=int(transition) + delta))
+            localized = index.localize(to_epoch_seconds(instants))
+            for instant, local in zip(instants, localized):
+                expected = instant.astimezone(tz)
+                self.assertEqual(local.replace(tzinfo=None), expected.replace(tzinfo=None), zone)
+                self.assertIs(local.tzinfo, expected.tzinfo, zone)
+
+    def test_dst_overlap_keeps_both_sides(self):
+        tz = pytz.timezone("Europe/London")
+        index = get_zone_index(tz, 2024)
+        # 00:30 and 01:30 UTC on 2024-10-27 are both 01:30 local, first BST then GMT
+        first, second = index.localize([1729989000, 1729992600])
+        self.assertEqual(first.replace(tzinfo=None), second.replace(tzinfo=None))
+        self.assertEqual(first.tzname(), "BST")
+        self.assertEqual(second.tzname(), "GMT")
+        self.assertEqual(list(index.utc_offsets([1729989000, 1729992600])), [3600, 0])
+
+    def test_missing_and_out_of_range(self):
+        index = get_zone_index(pytz.timezone("Europe/Oslo"), 2024)
+        self.assertEqual(index.localize([float("nan")]), [None])
+        with self.assertRaises(ValueError):
+            index.localize([0])
+
+    def test_cached(self):
+        tz = pytz.timezone("Europe/Oslo")
+        self.assertIs(get_zone_index(tz, 2024, 2025), get_zone_index(tz, 2024, 2025))
+
+    def test_fixed_offsets_get_their_own_index(self):
+        india, eastern = pytz.FixedOffset(330), pytz.FixedOffset(-300)
+        self.assertIsNone(india.zone)
+        self.assertIsNot(get_zone_index(india, 2024), get_zone_index(eastern, 2024))
+        self.assertEqual(list(get_zone_index(india, 2024).utc_offsets([1718971200])), [19800])
+        self.assertEqual(list(get_zone_index(eastern, 2024).utc_offsets([1718971200])), [-18000])
+        [local] = get_zone_index(india, 2024).localize([1718971200])
+        self.assertEqual(local, datetime.datetime(2024, 6, 21, 12, 0, tzinfo=pytz.utc).astimezone(india))
+
+
+if __name__ == '__main__':
+    unittest.main()
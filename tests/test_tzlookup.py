@@ -0,0 +1,89 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.app import main
+from daylight_py.tzlookup import TimezoneIndex, TimezoneLookupError, find_timezone
+
+def square(min_lon, min_lat, max_lon, max_lat):
+    return [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+
+FEATURES = [
+    {
+        "type": "Feature",
+        "properties": {"tzid": "Europe/London"},
+        # With a hole that belongs to another zone
+        "geometry": {"type": "Polygon", "coordinates": [square(-6.0, 50.0, 2.0, 56.0), square(-1.0, 52.0, 0.0, 53.0)]},
+    },
+    {
+        "type": "Feature",
+        "properties": {"tzid": "Europe/Paris"},
+        "geometry": {"type": "MultiPolygon", "coordinates": [[square(2.0, 43.0, 7.5, 50.0)], [square(-1.0, 52.0, 0.0, 53.0)]]},
+    },
+]
+
+class TestTimezoneLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TimezoneIndex(FEATURES)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup(51.5074, -0.1278), "Europe/London")
+        self.assertEqual(self.index.lookup(48.8566, 2.3522), "Europe/Paris")
+        self.assertEqual(self.index.lookup(52.5, -0.5), "Europe/Paris") # Inside the hole
+        self.assertIsNone(self.index.lookup(0.0, 0.0))
+
+    def test_find_timezone_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "timezones.geojson")
+            with open(path, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": FEATURES}, f)
+            self.assertEqual(find_timezone(51.5, -0.12, path=path), "Europe/London")
+
+            with open(path, "w") as f:
+                f.write("not json")
+            with self.assertRaises(TimezoneLookupError):
+                find_timezone(51.5, -0.12, path=path)
+
+    def test_compiled_index_is_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "timezones.geojson")
+            cache_dir = os.path.join(tmp, "cache")
+            with open(path, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": FEATURES}, f)
+            first = TimezoneIndex.load(path, cache_dir)
+            with patch.object(TimezoneIndex, "from_file", side_effect=AssertionError("parsed again")):
+                cached = TimezoneIndex.load(path, cache_dir)
+            self.assertEqual(cached.lookup(52.5, -0.5), "Europe/Paris")
+            self.assertEqual(repr(cached), repr(first))
+
+            # A changed dataset is parsed again
+            with open(path, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": FEATURES[1:]}, f)
+            os.utime(path, ns=(0, 0))
+            self.assertIsNone(TimezoneIndex.load(path, cache_dir).lookup(51.5074, -0.1278))
+
+    def test_zone_unknown_to_pytz_falls_back_to_ip(self):
+        london = {"ip": "1.2.3.4", "latitude": 51.5, "longitude": -0.12, "timezone": pytz.timezone("Europe/London")}
+        out, err = io.StringIO(), io.StringIO()
+        with patch("daylight_py.tzlookup.find_timezone", return_value="Mars/Olympus_Mons"), \
+                patch("daylight_py.app.fetch_ip_info", return_value=london), \
+                redirect_stdout(out), redirect_stderr(err):
+            main(["--latitude=51.5", "--longitude=-0.12", "--json", "--date=2024-06-21"])
+        self.assertIn("unknown to pytz: Mars/Olympus_Mons", err.getvalue())
+        self.assertEqual(json.loads(out.getvalue())["ip_address"], "1.2.3.4")
+
+
+if __name__ == '__main__':
+    unittest.main()
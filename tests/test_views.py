@@ -1,5 +1,9 @@
 import unittest
 import datetime
+import io
+import os
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
 import pytz
 
 # Add project root to sys.path to allow importing daylight_py
@@ -8,10 +12,13 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from daylight_py.calculations import SunTimes, get_sun_times
+from daylight_py.app import main
+from daylight_py.calculations import Site, SunTimes, get_sun_times
 from daylight_py.json_view import create_json_output
 from daylight_py.condensed_view import create_condensed_output
-from daylight_py.full_view import create_full_output
+from daylight_py.full_view import create_full_output, day_offsets, render_progress_bar
+from daylight_py.formatting import format_change_seconds
+from daylight_py.yearly import get_yearly_index
 
 class TestViews(unittest.TestCase):
 
@@ -115,6 +122,130 @@ class TestViews(unittest.TestCase):
         self.assertIn("Offline Mode", full_str)
         self.assertIn(f"{self.lat_tromso:.2f}", full_str)
 
+    def test_progress_bar_places_rise_and_set(self):
+        rise_minute, set_minute = day_offsets(self.sun_times_today)
+        bar = render_progress_bar(rise_minute, set_minute, bar_width=60)
+        self.assertEqual(len(bar), 60)
+        # Each column covers 24 minutes of the day
+        self.assertEqual(bar.index("R"), rise_minute // 24)
+        self.assertEqual(bar.index("S"), set_minute // 24)
+        self.assertTrue(bar.startswith("."))
+        self.assertTrue(bar.endswith("."))
+
+    def test_progress_bar_wraps_past_midnight(self):
+        bar = render_progress_bar(6 * 60, 30, bar_width=24)
+        self.assertEqual(bar, "S.....R" + "-" * 17)
+
+    def test_progress_bar_polar_conditions(self):
+        self.assertEqual(render_progress_bar(None, None, polar_day=True, bar_width=10), "-" * 10)
+        self.assertEqual(render_progress_bar(None, None, bar_width=10), "." * 10)
+
+    def test_full_output_marks_current_time(self):
+        now = self.tz_london.localize(datetime.datetime.combine(self.test_date, datetime.time(12, 0)))
+        full_str = create_full_output(
+            query_date=self.test_date,
+            sun_times_today=self.sun_times_today,
+            sun_times_yesterday=self.sun_times_yesterday,
+            ten_day_projection=[],
+            now=now
+        )
+        marker_line = next(line for line in full_str.splitlines() if line.strip() == "^")
+        bar_line = full_str.splitlines()[full_str.splitlines().index(marker_line) - 1]
+        self.assertEqual(bar_line[marker_line.index("^")], "-")
+
+    def test_year_section(self):
+        year_index = get_yearly_index(self.lat_london, self.test_date.year)
+        full_str = create_full_output(
+            query_date=self.test_date,
+            sun_times_today=self.sun_times_today,
+            sun_times_yesterday=self.sun_times_yesterday,
+            ten_day_projection=[],
+            year_index=year_index
+        )
+        self.assertIn("This year", full_str)
+        self.assertIn("Next solstice  Sat Dec 21 (in 159 days)", full_str)
+
+        import json
+        data = json.loads(create_json_output(self.test_date, self.sun_times_today, self.sun_times_yesterday, year_index=year_index))
+        self.assertEqual(data["year"]["longest_day"], "2024-06-20")
+        self.assertEqual(data["year"]["next_solstice"], "2024-12-21")
+        self.assertEqual(data["year"]["days_until_solstice"], 159)
+
+    def test_json_validity_and_content_hash(self):
+        import json
+        def output(now, indent=2, ip_address=None):
+            return json.loads(create_json_output(self.test_date, self.sun_times_today, self.sun_times_yesterday,
+                                                 ip_address=ip_address, indent=indent, now=now))
+
+        morning = self.tz_london.localize(datetime.datetime(2024, 7, 15, 6, 0))
+        evening = self.tz_london.localize(datetime.datetime(2024, 7, 15, 23, 59))
+        data = output(morning)
+        # Nothing in the output depends on the time of day: valid until local midnight
+        self.assertEqual(data["valid_until"], "2024-07-16T00:00:00+01:00")
+        self.assertEqual(output(evening), data)
+        self.assertEqual(output(morning.astimezone(pytz.utc), indent=None), data)
+        # Another date's output never expires
+        self.assertIsNone(output(morning + datetime.timedelta(days=1))["valid_until"])
+        self.assertEqual(output(morning + datetime.timedelta(days=1))["content_hash"], data["content_hash"])
+
+        self.assertTrue(data["content_hash"].startswith("sha256:"))
+        self.assertNotEqual(output(morning, ip_address="1.2.3.4")["content_hash"], data["content_hash"])
+
+    def test_full_output_draws_bar_with_only_a_sunrise(self):
+        london = pytz.timezone("Europe/London")
+        rises = london.localize(datetime.datetime(2024, 6, 21, 23, 30))
+        rise_only = SunTimes(rises=rises, sets=None, noon=None, length=None, timezone=london)
+        full_str = create_full_output(datetime.date(2024, 6, 21), rise_only, rise_only, [], offline_mode=True)
+        self.assertNotIn("?" * 60, full_str)
+        self.assertIn(render_progress_bar(*day_offsets(rise_only)), full_str)
+        self.assertIn("R", render_progress_bar(*day_offsets(rise_only)))
+
+    def test_full_output_is_one_series_with_changes(self):
+        argv = ["--latitude=51.5074", "--longitude=-0.1278", "--timezone=Europe/London", "--date=2024-07-15"]
+        out = io.StringIO()
+        with patch.object(Site, "range", autospec=True, side_effect=Site.range) as computed, \
+                patch.dict(os.environ, {"DAYLIGHT_STORE": ""}), redirect_stdout(out), redirect_stderr(io.StringIO()):
+            main(argv)
+        computed.assert_called_once()
+        self.assertEqual(computed.call_args.args[1:3], (datetime.date(2024, 7, 14), datetime.date(2024, 7, 25)))
+        series = Site(51.5074, -0.1278, "Europe/London").day_length_series(datetime.date(2024, 7, 15), datetime.date(2024, 7, 25))
+        lines = out.getvalue().splitlines()
+        self.assertIn("CHANGE", next(line for line in lines if "SUNRISE" in line))
+        self.assertIn(f"versus yesterday: {format_change_seconds(series.changes[0])}", out.getvalue())
+        self.assertIn(format_change_seconds(series.changes[-1]), next(line for line in lines if "Jul 25" in line))
+
+    def test_full_output_leaves_out_failing_projection(self):
+        day_length_series = Site.day_length_series
+
+        def short_series(site, start_date, end_date, store=None):
+            if end_date != start_date:
+                raise ValueError("no data")
+            return day_length_series(site, start_date, end_date, store=store)
+
+        out, err = io.StringIO(), io.StringIO()
+        with patch.object(Site, "day_length_series", short_series), patch.dict(os.environ, {"DAYLIGHT_STORE": ""}):
+            with redirect_stdout(out), redirect_stderr(err):
+                main(["--latitude=51.5074", "--longitude=-0.1278", "--timezone=Europe/London", "--date=2024-07-15"])
+        self.assertIn("Warning: Could not calculate the 10 day projection: no data", err.getvalue())
+        self.assertIn("Ten day projection", out.getvalue())
+        self.assertNotIn("Jul 16", out.getvalue())
+        self.assertIn("versus yesterday", out.getvalue())
+
+    def test_plain_run_does_not_import_subcommands_or_numpy(self):
+        import subprocess
+        script = (
+            "import sys, io, contextlib\n"
+            "from daylight_py.app import main\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    main(['--latitude=51.5074', '--longitude=-0.1278', '--timezone=Europe/London', '--date=2024-07-15'])\n"
+            "print(' '.join(m for m in ('numpy', 'sqlite3', 'daylight_py.daemon', 'daylight_py.query', 'daylight_py.store',\n"
+            "               'daylight_py.warmup', 'daylight_py.tzlookup', 'daylight_py.watch') if m in sys.modules))\n"
+        )
+        environment = dict(os.environ, DAYLIGHT_STORE="", PYTHONPATH=str(project_root / "src"))
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=environment, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
 
 if __name__ == '__main__':
     unittest.main()
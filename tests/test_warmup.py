@@ -0,0 +1,101 @@
+import unittest
+import datetime
+import io
+import os
+import tempfile
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import Site
+from daylight_py.clock import FrozenClock
+from daylight_py.store import SunTimesStore
+from daylight_py.warmup import SiteRegistry, WarmupError, WarmupScheduler, plan_warmup
+
+SITES = [
+    ("seoul", Site(37.5665, 126.978, "Asia/Seoul")),
+    ("busan", Site(35.1796, 129.0756, "Asia/Seoul")),
+    ("tokyo", Site(35.6762, 139.6503, "Asia/Tokyo")), # Same midnight as Seoul
+    ("london", Site(51.5074, -0.1278, "Europe/London")),
+]
+NOW = datetime.datetime(2024, 6, 21, 12, 0, tzinfo=pytz.utc)
+LEAD = datetime.timedelta(minutes=30)
+
+class TestWarmup(unittest.TestCase):
+
+    def test_plan_staggers_sites_sharing_a_midnight(self):
+        jobs = plan_warmup(SITES, NOW, days=3, lead=LEAD)
+        self.assertEqual([job.name for job in jobs], ["seoul", "busan", "tokyo", "london"])
+        seoul_midnight = datetime.datetime(2024, 6, 21, 15, 0, tzinfo=pytz.utc)
+        self.assertEqual([job.due for job in jobs[:3]], [
+            seoul_midnight - datetime.timedelta(minutes=30),
+            seoul_midnight - datetime.timedelta(minutes=25),
+            seoul_midnight - datetime.timedelta(minutes=20),
+        ])
+        self.assertEqual(jobs[3].due, datetime.datetime(2024, 6, 21, 22, 30, tzinfo=pytz.utc)) # 23:30 BST
+        self.assertEqual((jobs[0].start_date, jobs[0].end_date), (datetime.date(2024, 6, 22), datetime.date(2024, 6, 24)))
+        self.assertEqual(jobs[3].start_date, datetime.date(2024, 6, 22))
+
+        following = jobs[1].next()
+        self.assertEqual(following.due, jobs[1].due + datetime.timedelta(days=1))
+        self.assertEqual(following.start_date, datetime.date(2024, 6, 23))
+
+    def test_scheduler_fills_store_before_midnight(self):
+        clock = FrozenClock(NOW)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SunTimesStore(os.path.join(tmpdir, "sun_times.sqlite")) as store:
+                log = io.StringIO()
+                scheduler = WarmupScheduler(SITES, store, days=2, lead=LEAD, clock=clock, sleep=clock.advance, out=log)
+                self.assertEqual(scheduler.run(max_jobs=4), 4)
+                self.assertEqual(clock.moment, datetime.datetime(2024, 6, 21, 22, 30, tzinfo=pytz.utc))
+                self.assertEqual(store.row_count(), 8)
+                for name, site in SITES:
+                    self.assertIsNotNone(store.get(site, datetime.date(2024, 6, 23)), name)
+                self.assertIn("warmed tokyo: 2024-06-22..2024-06-23 (2 new)", log.getvalue())
+
+                # A restart inside London's lead window warms it again at once, finding it done
+                self.assertEqual(scheduler.run(max_jobs=1), 1)
+                self.assertEqual(clock.moment, datetime.datetime(2024, 6, 21, 22, 30, tzinfo=pytz.utc))
+                self.assertIn("warmed london: 2024-06-22..2024-06-23 (0 new)", log.getvalue())
+
+                # Only London's today (still June 21 there) is missing
+                self.assertEqual(scheduler.warm_now(), 1)
+
+    def test_warm_now_computes_each_site_in_one_kernel_call(self):
+        from unittest.mock import patch
+        from daylight_py import noaa
+        clock = FrozenClock(NOW)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SunTimesStore(os.path.join(tmpdir, "sun_times.sqlite")) as store:
+                scheduler = WarmupScheduler(SITES, store, days=7, lead=LEAD, clock=clock)
+                with patch.object(noaa, "sun_events", side_effect=noaa.sun_events) as kernel:
+                    self.assertEqual(scheduler.warm_now(), 28)
+                self.assertEqual(kernel.call_count, len(SITES))
+                seoul = SITES[0][1]
+                stored = store.range(seoul, datetime.date(2024, 6, 21), datetime.date(2024, 6, 27))
+                self.assertEqual(repr(stored), repr(seoul.range(datetime.date(2024, 6, 21), datetime.date(2024, 6, 27), batched=False)))
+
+    def test_registry_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "daylight", "sites.csv")
+            registry = SiteRegistry(path)
+            self.assertEqual(registry.sites, [])
+            for name, site in SITES:
+                registry.add(name, site)
+            registry.add("seoul", Site(37.0, 127.0, "Asia/Seoul", elevation=38.0))
+            self.assertTrue(registry.remove("busan"))
+            self.assertFalse(registry.remove("busan"))
+            registry.save()
+
+            loaded = SiteRegistry(path)
+            self.assertEqual([name for name, _ in loaded.sites], ["tokyo", "london", "seoul"])
+            self.assertEqual(repr(loaded.sites[2][1]), repr(Site(37.0, 127.0, "Asia/Seoul", elevation=38.0)))
+            with self.assertRaises(WarmupError):
+                loaded.add("a,b", SITES[0][1])
+
+if __name__ == '__main__':
+    unittest.main()
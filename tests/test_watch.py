@@ -0,0 +1,84 @@
+import unittest
+import datetime
+import io
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.app import main
+from daylight_py.calculations import get_sun_times
+from daylight_py.clock import ClockError, FrozenClock, set_default_clock
+from daylight_py.watch import Watcher, next_dst_change, next_local_midnight, next_transition, scan_offset_change
+
+class TestWatch(unittest.TestCase):
+
+    def setUp(self):
+        self.lat, self.lon = 51.5074, -0.1278
+        self.tz = pytz.timezone("Europe/London")
+
+    def test_next_local_midnight(self):
+        now = self.tz.localize(datetime.datetime(2024, 7, 15, 22, 30))
+        self.assertEqual(next_local_midnight(now, self.tz), self.tz.localize(datetime.datetime(2024, 7, 16, 0, 0)))
+
+    def test_next_dst_change(self):
+        now = self.tz.localize(datetime.datetime(2024, 7, 15, 12, 0))
+        # BST ends at 01:00 UTC on the last Sunday of October
+        self.assertEqual(next_dst_change(now, self.tz), datetime.datetime(2024, 10, 27, 1, 0, tzinfo=pytz.utc))
+        self.assertIsNone(next_dst_change(now, pytz.utc))
+
+    def test_next_dst_change_without_pytz_transitions(self):
+        import zoneinfo
+        now = self.tz.localize(datetime.datetime(2024, 7, 15, 12, 0))
+        # zoneinfo zones have no _utc_transition_times, so the public utcoffset() is scanned
+        for name in ("Europe/London", "America/New_York", "Australia/Sydney", "Asia/Tehran"):
+            self.assertEqual(next_dst_change(now, zoneinfo.ZoneInfo(name)), next_dst_change(now, pytz.timezone(name)), name)
+        self.assertEqual(scan_offset_change(now, self.tz), next_dst_change(now, self.tz))
+        self.assertIsNone(next_dst_change(now, zoneinfo.ZoneInfo("Asia/Seoul")))
+
+    def test_next_transition_order(self):
+        st = get_sun_times(self.lat, self.lon, datetime.date(2024, 7, 15), self.tz)
+        early = self.tz.localize(datetime.datetime(2024, 7, 15, 3, 0))
+        self.assertEqual(next_transition(early, st), st.rises)
+        self.assertEqual(next_transition(st.rises, st), st.sets)
+        self.assertEqual(next_transition(st.sets, st), self.tz.localize(datetime.datetime(2024, 7, 16, 0, 0)))
+
+    def test_watcher_emits_at_each_transition_and_rolls_days(self):
+        clock = FrozenClock(self.tz.localize(datetime.datetime(2024, 7, 15, 3, 0)))
+        out = io.StringIO()
+        rendered = []
+
+        def render(date_obj, today, yesterday):
+            rendered.append((date_obj, today, yesterday))
+            return date_obj.isoformat()
+
+        watcher = Watcher(self.lat, self.lon, self.tz, render, out=out, sleep=clock.advance, clock=clock)
+        watcher.run(max_updates=3) # sunrise, sunset, midnight
+
+        self.assertEqual(out.getvalue().splitlines(), ["2024-07-15"] * 3 + ["2024-07-16"])
+        # The day after midnight reuses the previous "today" as "yesterday"
+        self.assertIs(rendered[3][2], rendered[2][1])
+        self.assertEqual(rendered[3][1].rises.date(), datetime.date(2024, 7, 16))
+
+    def test_watcher_stops_on_a_frozen_clock(self):
+        clock = FrozenClock(self.tz.localize(datetime.datetime(2024, 7, 15, 3, 0)))
+        watcher = Watcher(self.lat, self.lon, self.tz, lambda *days: "", out=io.StringIO(), sleep=lambda seconds: None, clock=clock)
+        with self.assertRaises(ClockError):
+            watcher.run(max_updates=1)
+
+    def test_watch_refuses_a_pinned_clock(self):
+        from contextlib import redirect_stderr
+        set_default_clock(FrozenClock(datetime.datetime(2024, 7, 15, 3, 0, tzinfo=pytz.utc)))
+        try:
+            with redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit):
+                main(["--latitude=51.5074", "--longitude=-0.1278", "--timezone=Europe/London", "--watch"])
+        finally:
+            set_default_clock(None)
+        self.assertIn("cannot be used while the clock is frozen", err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
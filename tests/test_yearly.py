@@ -0,0 +1,63 @@
+import unittest
+import datetime
+import pytz
+
+# Add project root to sys.path to allow importing daylight_py
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from daylight_py.calculations import get_sun_times_range
+from daylight_py.yearly import get_yearly_index, next_solstice
+
+class TestYearlyIndex(unittest.TestCase):
+
+    def test_solstices_and_equinoxes_2024(self):
+        index = get_yearly_index(51.5, 2024)
+        # Published times: Mar 20 03:06, Jun 20 20:51, Sep 22 12:44, Dec 21 09:21 (UTC)
+        tolerance = datetime.timedelta(minutes=10)
+        self.assertAlmostEqual(index.march_equinox, datetime.datetime(2024, 3, 20, 3, 6), delta=tolerance)
+        self.assertAlmostEqual(index.june_solstice, datetime.datetime(2024, 6, 20, 20, 51), delta=tolerance)
+        self.assertAlmostEqual(index.september_equinox, datetime.datetime(2024, 9, 22, 12, 44), delta=tolerance)
+        self.assertAlmostEqual(index.december_solstice, datetime.datetime(2024, 12, 21, 9, 21), delta=tolerance)
+
+    def test_extremes_match_astral(self):
+        # On the prime meridian local mean solar time is UTC, so astral's UTC times are comparable
+        days = get_sun_times_range(51.5, 0.0, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), pytz.utc)
+        index = get_yearly_index(51.5, 2024)
+
+        longest = max(days, key=lambda d: d[1].length)[0]
+        shortest = min(days, key=lambda d: d[1].length)[0]
+        earliest = min(days, key=lambda d: d[1].rises.time())[0]
+        latest = max(days, key=lambda d: d[1].sets.time())[0]
+        one_day = datetime.timedelta(days=1)
+        self.assertAlmostEqual(index.longest_day, longest, delta=one_day)
+        self.assertAlmostEqual(index.shortest_day, shortest, delta=one_day)
+        self.assertAlmostEqual(index.earliest_sunrise, earliest, delta=2 * one_day)
+        self.assertAlmostEqual(index.latest_sunset, latest, delta=2 * one_day)
+
+    def test_southern_hemisphere_and_polar(self):
+        sydney = get_yearly_index(-33.87, 2024)
+        self.assertEqual(sydney.longest_day.month, 12)
+        self.assertEqual(sydney.shortest_day.month, 6)
+
+        tromso = get_yearly_index(69.65, 2024)
+        self.assertEqual(tromso.longest_day, tromso.june_solstice.date())
+        self.assertEqual(tromso.shortest_day, tromso.december_solstice.date())
+        self.assertEqual(tromso.longest_day_hours, 24)
+        self.assertEqual(tromso.shortest_day_hours, 0)
+
+    def test_cached_per_latitude_and_year(self):
+        self.assertIs(get_yearly_index(51.501, 2024), get_yearly_index(51.5, 2024))
+        self.assertIsNot(get_yearly_index(51.5, 2024), get_yearly_index(51.5, 2025))
+
+    def test_next_solstice(self):
+        self.assertEqual(next_solstice(datetime.date(2024, 7, 1)).date(), datetime.date(2024, 12, 21))
+        self.assertEqual(next_solstice(datetime.date(2024, 12, 22)).date(), datetime.date(2025, 6, 21))
+        # The same solstices as the index, whatever the latitude
+        self.assertEqual(next_solstice(datetime.date(2024, 6, 1)), get_yearly_index(-33.87, 2024).june_solstice)
+
+
+if __name__ == '__main__':
+    unittest.main()